@@ -19,7 +19,7 @@ from emulator.commands.sacct import (
     _NODE_CPUS,
     _NODE_GPUS,
     _NODE_MEM_GB,
-    SacctEmulator,
+    _tres_rates,
 )
 from emulator.core.database import QOS, Account, Association, Job, UsageRecord, User
 
@@ -239,19 +239,17 @@ def qos_to_dict(qos: QOS, qos_id: int) -> dict[str, Any]:
 def dbd_job_to_dict(record: UsageRecord) -> dict[str, Any]:
     """One slurmdb JOB per usage record — agrees with sacct output.
 
-    Same math as SacctEmulator._row: Elapsed = node_hours in seconds,
+    Same math as sacct's cell renderers: Elapsed = node_hours in seconds,
     End = record timestamp, per-hour TRES rates from raw_tres.
     """
-    rate = SacctEmulator._rate
     elapsed = int(record.node_hours * 3600)
     end = int(record.timestamp.timestamp())
     start = end - elapsed
     state = record.state or "COMPLETED"
     failed = state.startswith(_FAILED_STATES)
 
-    cpus = rate(record, "CPU", _NODE_CPUS)
-    mem_mb = rate(record, "Mem", _NODE_MEM_GB) * 1024
-    gpus = rate(record, "GRES/gpu", _NODE_GPUS)
+    cpus, mem_gb, gpus = _tres_rates(record)
+    mem_mb = mem_gb * 1024
     tres_values = {"cpu": cpus, "mem": mem_mb, "node": 1, "billing": cpus}
     if gpus:
         tres_values["gres/gpu"] = gpus
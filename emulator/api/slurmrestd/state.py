@@ -3,7 +3,7 @@
 Mirrors the CLI commands' persistence model (dispatcher.py): every
 request reloads the JSON state files, mutating handlers call
 ``commit()`` at the end. Concurrency is whole-file last-writer-wins —
-``save_state``/``load_state`` hold an flock so writes are never torn,
+``save_state`` replaces the file atomically so reads are never torn,
 but a REST write racing a CLI write can lose the other side's changes.
 That matches the existing CLI-vs-control-API behavior and is fine for
 a single-tester emulator.
@@ -13,13 +13,20 @@ from typing import Any, Optional
 
 from emulator.commands.dispatcher import SlurmEmulator
 from emulator.core.database import SlurmDatabase
-from emulator.core.slurm_config import SlurmConfigParser
 from emulator.core.time_engine import TimeEngine
 from emulator.core.usage_simulator import UsageSimulator
 from emulator.periodic_limits.calculator import PeriodicLimitsCalculator
 from emulator.periodic_limits.qos_manager import QoSManager
 from emulator.scenarios.scenario_registry import ActionType, ScenarioRegistry, ScenarioType
-from emulator.scenarios.sequence_scenario import SequenceScenario
+
+# Accounts each built-in scenario creates, removed by scenario cleanup
+_SCENARIO_ACCOUNTS: dict[str, tuple[str, ...]] = {
+    "qos_thresholds": ("qos_test",),
+    "carryover_test": ("carryover_light", "carryover_heavy"),
+    "decay_comparison": ("decay_test_15", "decay_test_7"),
+    "config_comparison": ("config_standard", "config_custom"),
+    "sequence": ("slurm_account_123",),
+}
 
 
 class SlurmEmulatorCmd(cmd.Cmd):
@@ -46,6 +53,8 @@ Type 'help <command>' for detailed help on specific commands.
         self.slurm_config = None
         if self._config_path:
             try:
+                from emulator.core.slurm_config import SlurmConfigParser  # noqa: PLC0415
+
                 self.slurm_config = SlurmConfigParser(self._config_path)
                 self.slurm_config.print_config_summary()
 
@@ -137,7 +146,8 @@ Type 'help <command>' for detailed help on specific commands.
         """Override to add debug for completion issues."""
         if os.getenv("SLURM_EMULATOR_DEBUG"):
             print(f"DEBUG: Command line: '{line}'")
-        return super().onecmd(line)
+        with self.limits_calculator.request_cache():
+            return super().onecmd(line)
 
     def completedefault(self, text, line, begidx, endidx):
         """Default completion fallback."""
@@ -573,6 +583,8 @@ Type 'help <command>' for detailed help on specific commands.
 
         if scenario_name == "sequence":
             # Use legacy sequence scenario
+            from emulator.scenarios.sequence_scenario import SequenceScenario  # noqa: PLC0415
+
             scenario = SequenceScenario(self.time_engine, self.database)
             result = scenario.run_complete_scenario(interactive or step_by_step)
 
@@ -867,6 +879,8 @@ Type 'help <command>' for detailed help on specific commands.
 
         config_path = arg.strip()
         try:
+            from emulator.core.slurm_config import SlurmConfigParser  # noqa: PLC0415
+
             new_config = SlurmConfigParser(config_path)
             self.slurm_config = new_config
 
@@ -1474,6 +1488,8 @@ Type 'help <command>' for detailed help on specific commands.
         elif action.type == ActionType.CONFIG_RELOAD:
             config_path = action.parameters["config_path"]
             try:
+                from emulator.core.slurm_config import SlurmConfigParser  # noqa: PLC0415
+
                 new_config = SlurmConfigParser(config_path)
                 self.slurm_config = new_config
                 self.usage_simulator.billing_weights = new_config.get_tres_billing_weights()
@@ -1501,18 +1517,9 @@ Type 'help <command>' for detailed help on specific commands.
         self.database.save_state()
         print(f"✅ Cleaned {len(scenario_accounts)} scenario accounts")
 
-    def _get_scenario_accounts(self, scenario_name: str) -> list[str]:
-        """Get list of accounts used by a specific scenario."""
-        scenario_accounts = {
-            "qos_thresholds": ["qos_test"],
-            "carryover_test": ["carryover_light", "carryover_heavy"],
-            "decay_comparison": ["decay_test_15", "decay_test_7"],
-            "config_comparison": ["config_standard", "config_custom"],
-            "sequence": ["slurm_account_123"],
-        }
-
-        # Return accounts for this scenario, or empty list for unknown scenarios
-        return scenario_accounts.get(scenario_name, [])
+    def _get_scenario_accounts(self, scenario_name: str) -> tuple[str, ...]:
+        """Get the accounts used by a specific scenario (empty if unknown)."""
+        return _SCENARIO_ACCOUNTS.get(scenario_name, ())
 
     def _clean_account_completely(self, account_name: str) -> None:
         """Completely clean an account and all its cluster-scoped data."""
@@ -1523,55 +1530,24 @@ Type 'help <command>' for detailed help on specific commands.
             self.database.delete_account(account_name)
 
         # Remove usage records for this account in current cluster
-        self.database.usage_records = [
-            record
-            for record in self.database.usage_records
-            if not (record.account == account_name and record.cluster == cl)
-        ]
+        self.database.delete_account_usage(account_name, cl)
 
         # Remove associations for this account in current cluster
-        keys_to_remove = [
-            key
-            for key, assoc in self.database.associations.items()
-            if assoc.account == account_name and assoc.cluster == cl
-        ]
-        for key in keys_to_remove:
-            del self.database.associations[key]
+        self.database.delete_account_associations(account_name, cl)
 
         # Remove jobs for this account in current cluster
-        job_ids_to_remove = [
-            job_id
-            for job_id, job in self.database.jobs.items()
-            if job.account == account_name and job.cluster == cl
-        ]
-        for job_id in job_ids_to_remove:
-            del self.database.jobs[job_id]
+        self.database.delete_account_jobs(account_name, cl)
 
     def _clean_orphaned_data(self) -> None:
         """Clean up any orphaned data from deleted accounts."""
-        # Build set of account names that exist (accounts are global)
-        existing = {acc.name for acc in self.database.accounts.values()}
-
         # Clean usage records for non-existent accounts
-        self.database.usage_records = [
-            record for record in self.database.usage_records if record.account in existing
-        ]
+        self.database.delete_orphaned_usage()
 
         # Clean associations for non-existent accounts
-        keys_to_remove = [
-            key
-            for key, assoc in self.database.associations.items()
-            if assoc.account not in existing
-        ]
-        for key in keys_to_remove:
-            del self.database.associations[key]
+        self.database.delete_orphaned_associations()
 
         # Clean jobs for non-existent accounts
-        job_ids_to_remove = [
-            job_id for job_id, job in self.database.jobs.items() if job.account not in existing
-        ]
-        for job_id in job_ids_to_remove:
-            del self.database.jobs[job_id]
+        self.database.delete_orphaned_jobs()
 
 
 def main():
@@ -1606,6 +1582,8 @@ CMD Interface Features:
     if args.validate_only and args.config:
         # Just validate configuration and exit
         try:
+            from emulator.core.slurm_config import SlurmConfigParser  # noqa: PLC0415
+
             config = SlurmConfigParser(args.config)
             config.print_config_summary()
             warnings = config.validate_configuration()
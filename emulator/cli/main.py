@@ -1,28 +1,234 @@
 """Main CLI interface for SLURM emulator with time manipulation."""
 
 import atexit
+import bisect
 import contextlib
+import functools
+import itertools
 import os
 import readline
 import sys
+from collections.abc import Iterable
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, ClassVar, Optional
 
 from emulator.commands.dispatcher import SlurmEmulator
 from emulator.core.database import SlurmDatabase
-from emulator.core.slurm_config import SlurmConfigParser
 from emulator.core.time_engine import TimeEngine
 from emulator.core.usage_simulator import UsageSimulator
 from emulator.periodic_limits.calculator import PeriodicLimitsCalculator
 from emulator.periodic_limits.qos_manager import QoSManager
 from emulator.scenarios.scenario_registry import ActionType, ScenarioRegistry, ScenarioType
-from emulator.scenarios.sequence_scenario import SequenceScenario
+
+_COMPLEXITY_EMOJI = {"basic": "🟢", "intermediate": "🟡", "advanced": "🔴"}
+
+_SCENARIO_TYPES = {t.value: t for t in ScenarioType}
+_SCENARIO_TYPES_HELP = ", ".join(_SCENARIO_TYPES)
+
+# Accounts each built-in scenario creates, removed by scenario cleanup
+_SCENARIO_ACCOUNTS: dict[str, tuple[str, ...]] = {
+    "qos_thresholds": ("qos_test",),
+    "carryover_test": ("carryover_light", "carryover_heavy"),
+    "decay_comparison": ("decay_test_15", "decay_test_7"),
+    "config_comparison": ("config_standard", "config_custom"),
+    "sequence": ("slurm_account_123",),
+}
+
+_HELP_TEXT = """
+📖 SLURM Emulator Commands:
+
+⏰ Time Management:
+  time                          - Show current time and period
+  time advance <N> days/months/quarters - Advance time by amount
+  time set YYYY-MM-DD [HH:MM:SS]       - Set specific date/time
+
+💾 Usage Simulation:
+  usage inject <user> <amount> [account] - Inject node-hour usage
+  usage show [account] [period]          - Show usage summary
+
+🎬 Scenarios:
+  scenario list [type]                  - List scenarios (optionally by type)
+  scenario describe <name>              - Show detailed scenario description
+  scenario steps <name>                 - Show step-by-step breakdown
+  scenario run <name> [--interactive]   - Run scenario
+  scenario run <name> --step-by-step    - Run with detailed step output
+  scenario validate <name>              - Validate scenario definition
+  scenario search <query>               - Search scenarios by keyword
+
+💾 Checkpoints:
+  checkpoint create <name>              - Save current state
+  checkpoint restore <name>             - Restore saved state
+  checkpoint list                       - List all checkpoints
+
+📊 Limits & QoS:
+  limits calculate [account]            - Calculate periodic limits
+  limits show [account]                 - Show current limits
+  limits apply [account]                - Apply period transition
+  qos show [account]                    - Show QoS status
+  qos set <account> <qos>               - Set QoS level
+  qos check [account]                   - Check usage thresholds
+
+🏢 Account Management:
+  account create <name> [desc] [alloc]  - Create account
+  account list                          - List all accounts
+  account show <name>                   - Show account details
+  account delete <name>                 - Delete account
+
+🌐 Cluster Management:
+  cluster list                          - List all clusters (* = active)
+  cluster add <name>                    - Add a new cluster
+  cluster use <name>                    - Switch active cluster context
+  cluster show                          - Show current cluster details
+
+⚙️  Configuration:
+  config show                           - Show current configuration
+  config validate                       - Validate loaded configuration
+  config reload <path>                  - Reload configuration from file
+
+🔧 SLURM Commands:
+  sacctmgr <args>                       - Run sacctmgr command
+  sacct <args>                          - Run sacct command
+  sinfo <args>                          - Run sinfo command
+
+📊 General:
+  status                                - Show emulator status
+  cleanup all                           - Clean all accounts and reset state
+  cleanup scenario <name>               - Clean specific scenario accounts
+  cleanup account <name>                - Clean specific account completely
+  help                                  - Show this help
+  exit                                  - Quit emulator
+  complete <partial_command>            - Manual completion (if TAB not working)
+
+⌨️  Auto-Completion:
+  [TAB]                                 - Complete commands and parameters
+  [TAB][TAB]                            - Show all available options
+  [↑][↓]                                - Navigate command history
+  [Ctrl+R]                              - Search command history
+  complete <cmd>                        - Manual completion fallback
+
+💡 Example Session:
+  time set 2024-01-01
+  account create test-account "Test" 1000
+  usage inject user1 200 test-account
+  time advance 2 months
+  usage inject user1 400 test-account
+  limits calculate test-account
+  scenario run sequence --interactive
+
+💡 Auto-Completion Examples:
+  scenario [TAB]                        # Shows: run, list, describe, steps
+  scenario describe [TAB]               # Shows scenario names
+  sacctmgr modify account [TAB]         # Shows account names
+  sacctmgr modify account test set [TAB] # Shows: fairshare=, qos=, etc.
+  qos set test [TAB]                    # Shows QoS levels
+  time advance 2 [TAB]                  # Shows: days, months, quarters
+
+"""
+
+_DEFAULT_CONFIG_SUMMARY = """\
+📊 Using Default Configuration:
+   No slurm.conf file loaded
+   Decay Half-Life: 15.0 days
+   Usage Reset: Manual
+   QoS Weight: 500000
+   Fairshare Weight: 259200
+   TRES Billing Weights:
+      CPU: 0.015625
+      Mem: 0.001953125
+      GRES/gpu: 0.25"""
+
+
+def _parse_args(args: Iterable[str]) -> tuple[list[str], set[str], dict[str, str]]:
+    """Split arguments into positionals, ``--flag`` names and ``--key=value`` options."""
+    positional: list[str] = []
+    flags: set[str] = set()
+    kwargs: dict[str, str] = {}
+    for arg in args:
+        if arg.startswith("--"):
+            key, sep, value = arg[2:].partition("=")
+            if sep:
+                kwargs[key] = value
+            else:
+                flags.add(key)
+        else:
+            positional.append(arg)
+    return positional, flags, kwargs
+
+
+def _prefix_matches(words: tuple[str, ...], prefix: str) -> list[str]:
+    """Return the entries of the sorted tuple ``words`` that start with ``prefix``."""
+    matches = []
+    for word in itertools.islice(words, bisect.bisect_left(words, prefix), None):
+        if not word.startswith(prefix):
+            break
+        matches.append(word)
+    return matches
+
+
+class _Out:
+    """Collect a handler's output lines and emit them in one stdout write."""
+
+    def __init__(self) -> None:
+        self._lines: list[str] = []
+
+    def append(self, line: str) -> None:
+        """Queue ``line`` for the next :meth:`flush`."""
+        self._lines.append(line)
+
+    def flush(self) -> None:
+        """Write the queued lines and start over."""
+        if self._lines:
+            self._lines.append("")
+            sys.stdout.write("\n".join(self._lines))
+            self._lines.clear()
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_iso(value: str) -> datetime:
+    """Parse an ISO timestamp; scenarios reuse a handful of time points."""
+    return datetime.fromisoformat(value)
 
 
 class EmulatorCLI:
     """Interactive CLI for SLURM emulator."""
 
+    # Static completion tables
+    _MAIN_COMMANDS: ClassVar[tuple[str, ...]] = (
+        "time",
+        "usage",
+        "scenario",
+        "checkpoint",
+        "status",
+        "limits",
+        "qos",
+        "account",
+        "cluster",
+        "config",
+        "cleanup",
+        "complete",
+        "sacctmgr",
+        "sacct",
+        "sinfo",
+        "help",
+        "exit",
+    )
+    _MAIN_COMMANDS_SORTED: ClassVar[tuple[str, ...]] = tuple(sorted(_MAIN_COMMANDS))
+    _SUBCOMMANDS: ClassVar[dict[str, tuple[str, ...]]] = {
+        "time": ("advance", "set"),
+        "usage": ("inject", "show", "pattern"),
+        "scenario": ("run", "list", "describe", "steps", "validate"),
+        "checkpoint": ("create", "restore", "list"),
+        "limits": ("calculate", "show", "apply"),
+        "qos": ("show", "set", "check"),
+        "account": ("create", "list", "show", "delete"),
+        "cluster": ("list", "add", "use", "show"),
+        "config": ("show", "validate", "reload"),
+        "cleanup": ("all", "scenario", "account"),
+        "sacctmgr": ("add", "modify", "remove", "list", "show"),
+        "sacct": ("--accounts", "--users", "--format", "--starttime", "--endtime"),
+    }
+
     def __init__(self, slurm_config_path: Optional[str] = None):
         self.time_engine = TimeEngine()
         self.database = SlurmDatabase()
@@ -31,6 +237,8 @@ class EmulatorCLI:
         self.slurm_config = None
         if slurm_config_path:
             try:
+                from emulator.core.slurm_config import SlurmConfigParser  # noqa: PLC0415
+
                 self.slurm_config = SlurmConfigParser(slurm_config_path)
                 self.slurm_config.print_config_summary()
 
@@ -69,11 +277,52 @@ class EmulatorCLI:
 
         # State management
         self.checkpoints: dict[str, Any] = {}
+        # scenario name -> (cluster, database state token) after its last cleanup
+        self._last_cleaned: dict[str, tuple] = {}
+        # scenario name -> (definition, step count, header lines, detail lines)
+        self._scenario_summaries: dict[str, tuple[Any, int, str, str]] = {}
+
+        # Subcommand dispatch tables (subcommand -> bound handler)
+        self._scenario_ops: dict[str, Callable[[list[str]], None]] = {
+            "list": self._scenario_list,
+            "describe": self._scenario_describe,
+            "steps": self._scenario_steps,
+            "run": self._scenario_run,
+            "validate": self._scenario_validate,
+            "search": self._scenario_search,
+        }
+        self._checkpoint_ops: dict[str, Callable[[list[str]], None]] = {
+            "create": self._checkpoint_create,
+            "restore": self._checkpoint_restore,
+            "list": self._checkpoint_list,
+        }
+        self._limits_ops: dict[str, Callable[[str], None]] = {
+            "calculate": self._limits_calculate,
+            "show": self._limits_show,
+            "apply": self._limits_apply,
+        }
+        self._qos_ops: dict[str, Callable[[list[str]], None]] = {
+            "show": self._qos_show,
+            "set": self._qos_set,
+            "check": self._qos_check,
+        }
+        self._account_ops: dict[str, Callable[[list[str]], None]] = {
+            "create": self._account_create,
+            "list": self._account_list,
+            "show": self._account_show,
+            "delete": self._account_delete,
+        }
+        self._config_ops: dict[str, Callable[[list[str]], None]] = {
+            "show": self._config_show,
+            "validate": self._config_validate,
+            "reload": self._config_reload,
+        }
 
         # Auto-completion setup
         self.autocomplete_enabled = False
         self._completion_cache: list[str] = []
         self._last_completion_line = ""
+        self._history_len_at_load = 0
         self._setup_autocomplete()
 
     def run(self) -> None:
@@ -145,16 +394,25 @@ class EmulatorCLI:
             with contextlib.suppress(FileNotFoundError, PermissionError, OSError):
                 readline.read_history_file(history_file)
 
-            # Save history on exit (with error handling)
+            # Limit history size
+            history_limit = 1000
+            readline.set_history_length(history_limit)
+            self._history_len_at_load = readline.get_current_history_length()
+
+            # Save history on exit (with error handling). Only the entries
+            # added this session are appended; the file is rewritten (and
+            # thereby truncated) once the history has reached the limit.
             def safe_write_history():
+                current_len = readline.get_current_history_length()
+                new_entries = current_len - self._history_len_at_load
                 with contextlib.suppress(PermissionError, OSError):
-                    readline.write_history_file(history_file)
+                    if not history_file.exists() or current_len >= history_limit:
+                        readline.write_history_file(history_file)
+                    elif new_entries > 0:
+                        readline.append_history_file(new_entries, history_file)
 
             atexit.register(safe_write_history)
 
-            # Limit history size
-            readline.set_history_length(1000)
-
             # Enable auto-completion feedback
             self.autocomplete_enabled = True
             print("⌨️  Auto-completion enabled (use TAB for completion)")
@@ -178,8 +436,7 @@ class EmulatorCLI:
                 # Determine what we're completing
                 if not parts or (len(parts) == 1 and not line.endswith(" ")):
                     # Completing main command
-                    commands = self._get_main_commands()
-                    self._completion_cache = [cmd for cmd in commands if cmd.startswith(text)]
+                    self._completion_cache = _prefix_matches(self._MAIN_COMMANDS_SORTED, text)
                 else:
                     # Completing subcommand or parameter
                     main_cmd = parts[0]
@@ -208,45 +465,13 @@ class EmulatorCLI:
                 print(f"   State: {state}")
             return None
 
-    def _get_main_commands(self) -> list[str]:
+    def _get_main_commands(self) -> tuple[str, ...]:
         """Get list of main commands."""
-        return [
-            "time",
-            "usage",
-            "scenario",
-            "checkpoint",
-            "status",
-            "limits",
-            "qos",
-            "account",
-            "cluster",
-            "config",
-            "cleanup",
-            "complete",
-            "sacctmgr",
-            "sacct",
-            "sinfo",
-            "help",
-            "exit",
-        ]
+        return self._MAIN_COMMANDS
 
-    def _get_subcommands(self, main_cmd: str) -> list[str]:
+    def _get_subcommands(self, main_cmd: str) -> tuple[str, ...]:
         """Get subcommands for a main command."""
-        subcommands = {
-            "time": ["advance", "set"],
-            "usage": ["inject", "show", "pattern"],
-            "scenario": ["run", "list", "describe", "steps", "validate"],
-            "checkpoint": ["create", "restore", "list"],
-            "limits": ["calculate", "show", "apply"],
-            "qos": ["show", "set", "check"],
-            "account": ["create", "list", "show", "delete"],
-            "cluster": ["list", "add", "use", "show"],
-            "config": ["show", "validate", "reload"],
-            "cleanup": ["all", "scenario", "account"],
-            "sacctmgr": ["add", "modify", "remove", "list", "show"],
-            "sacct": ["--accounts", "--users", "--format", "--starttime", "--endtime"],
-        }
-        return subcommands.get(main_cmd, [])
+        return self._SUBCOMMANDS.get(main_cmd, ())
 
     def _get_parameters(self, main_cmd: str, parts: list[str], text: str) -> list[str]:
         """Get parameter completions."""
@@ -535,9 +760,11 @@ class EmulatorCLI:
         if not parts:
             return
 
-        cmd = parts[0].lower()
-        args = parts[1:]
+        with self.limits_calculator.request_cache():
+            self._dispatch_command(parts[0].lower(), parts[1:])
 
+    def _dispatch_command(self, cmd: str, args: list[str]) -> None:
+        """Route a parsed command to its handler."""
         if cmd == "time":
             self._handle_time_commands(args)
         elif cmd == "usage":
@@ -666,10 +893,10 @@ class EmulatorCLI:
             try:
                 if len(args) == 2:
                     # Date only
-                    target_time = datetime.fromisoformat(args[1])
+                    target_time = _parse_iso(args[1])
                 else:
                     # Date and time
-                    target_time = datetime.fromisoformat(f"{args[1]} {args[2]}")
+                    target_time = _parse_iso(f"{args[1]} {args[2]}")
 
                 old_period = self.time_engine.get_current_quarter()
                 self.time_engine.set_time(target_time)
@@ -748,61 +975,71 @@ class EmulatorCLI:
             print("Scenario commands: run, list, describe, steps, validate, search")
             return
 
-        subcommand = args[0].lower()
+        handler = self._scenario_ops.get(args[0].lower())
+        if handler is None:
+            print("❌ Unknown scenario subcommand")
+            print("Available: run, list, describe, steps, validate, search")
+            return
+        handler(args)
 
-        if subcommand == "list":
-            self._list_scenarios(args[1:])
+    def _scenario_list(self, args: list[str]) -> None:
+        """Handle ``scenario list``."""
+        self._list_scenarios(args[1] if len(args) > 1 else None)
 
-        elif subcommand == "describe":
-            if len(args) < 2:
-                print("Usage: scenario describe <scenario_name>")
-                return
-            self._describe_scenario(args[1])
+    def _scenario_describe(self, args: list[str]) -> None:
+        """Handle ``scenario describe``."""
+        if len(args) < 2:
+            print("Usage: scenario describe <scenario_name>")
+            return
+        self._describe_scenario(args[1])
 
-        elif subcommand == "steps":
-            if len(args) < 2:
-                print("Usage: scenario steps <scenario_name>")
-                return
-            self._show_scenario_steps(args[1])
+    def _scenario_steps(self, args: list[str]) -> None:
+        """Handle ``scenario steps``."""
+        if len(args) < 2:
+            print("Usage: scenario steps <scenario_name>")
+            return
+        self._show_scenario_steps(args[1])
 
-        elif subcommand == "run":
-            if len(args) < 2:
-                print("Usage: scenario run <scenario_name> [--interactive] [--step-by-step]")
-                return
-            scenario_name = args[1]
-            interactive = "--interactive" in args
-            step_by_step = "--step-by-step" in args
+    def _scenario_run(self, args: list[str]) -> None:
+        """Handle ``scenario run``."""
+        positional, flags, _ = _parse_args(itertools.islice(args, 1, None))
+        if not positional:
+            print("Usage: scenario run <scenario_name> [--interactive] [--step-by-step]")
+            return
+        scenario_name = positional[0]
+        interactive = "interactive" in flags
+        step_by_step = "step-by-step" in flags
 
-            if scenario_name == "sequence":
-                # Use legacy sequence scenario
-                scenario = SequenceScenario(self.time_engine, self.database)
-                result = scenario.run_complete_scenario(interactive or step_by_step)
+        if scenario_name == "sequence":
+            # Use legacy sequence scenario
+            from emulator.scenarios.sequence_scenario import SequenceScenario  # noqa: PLC0415
 
-                if result["status"] == "completed":
-                    print(f"\n✅ Scenario '{scenario_name}' completed successfully!")
-                    print(f"📊 Summary: {result['summary']}")
-                else:
-                    print(
-                        f"\n❌ Scenario '{scenario_name}' failed: {result.get('error', 'Unknown error')}"
-                    )
-            else:
-                self._run_registry_scenario(scenario_name, interactive, step_by_step)
+            scenario = SequenceScenario(self.time_engine, self.database)
+            result = scenario.run_complete_scenario(interactive or step_by_step)
 
-        elif subcommand == "validate":
-            if len(args) < 2:
-                print("Usage: scenario validate <scenario_name>")
-                return
-            self._validate_scenario(args[1])
+            if result["status"] == "completed":
+                print(f"\n✅ Scenario '{scenario_name}' completed successfully!")
+                print(f"📊 Summary: {result['summary']}")
+            else:
+                print(
+                    f"\n❌ Scenario '{scenario_name}' failed: {result.get('error', 'Unknown error')}"
+                )
+        else:
+            self._run_registry_scenario(scenario_name, interactive, step_by_step)
 
-        elif subcommand == "search":
-            if len(args) < 2:
-                print("Usage: scenario search <query>")
-                return
-            self._search_scenarios(" ".join(args[1:]))
+    def _scenario_validate(self, args: list[str]) -> None:
+        """Handle ``scenario validate``."""
+        if len(args) < 2:
+            print("Usage: scenario validate <scenario_name>")
+            return
+        self._validate_scenario(args[1])
 
-        else:
-            print("❌ Unknown scenario subcommand")
-            print("Available: run, list, describe, steps, validate, search")
+    def _scenario_search(self, args: list[str]) -> None:
+        """Handle ``scenario search``."""
+        if len(args) < 2:
+            print("Usage: scenario search <query>")
+            return
+        self._search_scenarios(" ".join(itertools.islice(args, 1, None)))
 
     def _handle_checkpoint_commands(self, args: list[str]) -> None:
         """Handle checkpoint management commands."""
@@ -810,54 +1047,60 @@ class EmulatorCLI:
             print("Checkpoint commands: create, restore, list")
             return
 
-        subcommand = args[0].lower()
+        handler = self._checkpoint_ops.get(args[0].lower())
+        if handler is None:
+            print("❌ Unknown checkpoint subcommand")
+            print("Available: create, restore, list")
+            return
+        handler(args)
 
-        if subcommand == "create":
-            if len(args) < 2:
-                print("Usage: checkpoint create <name>")
-                return
+    def _checkpoint_create(self, args: list[str]) -> None:
+        """Handle ``checkpoint create``."""
+        if len(args) < 2:
+            print("Usage: checkpoint create <name>")
+            return
 
-            name = args[1]
-            self.checkpoints[name] = {
-                "time": self.time_engine.get_current_time(),
-                "created_at": datetime.now(),
-                "period": self.time_engine.get_current_quarter(),
-            }
+        name = args[1]
+        self.checkpoints[name] = {
+            "time": self.time_engine.get_current_time(),
+            "created_at": datetime.now(),
+            "period": self.time_engine.get_current_quarter(),
+        }
 
-            # Save database state
-            self.database.save_state()
+        # Save database state (no rewrite if nothing changed since the last save)
+        self.database.save_state(skip_unchanged=True)
 
-            print(f"💾 Checkpoint '{name}' created")
+        print(f"💾 Checkpoint '{name}' created")
 
-        elif subcommand == "restore":
-            if len(args) < 2:
-                print("Usage: checkpoint restore <name>")
-                return
+    def _checkpoint_restore(self, args: list[str]) -> None:
+        """Handle ``checkpoint restore``."""
+        if len(args) < 2:
+            print("Usage: checkpoint restore <name>")
+            return
 
-            name = args[1]
-            if name not in self.checkpoints:
-                print(f"❌ Checkpoint '{name}' not found")
-                return
+        name = args[1]
+        if name not in self.checkpoints:
+            print(f"❌ Checkpoint '{name}' not found")
+            return
 
-            checkpoint = self.checkpoints[name]
+        checkpoint = self.checkpoints[name]
+        # Checkpoints live in memory; only touch (and persist) the clock if it moved
+        if self.time_engine.get_current_time() != checkpoint["time"]:
             self.time_engine.set_time(checkpoint["time"])
 
-            print(f"🔄 Restored to checkpoint '{name}'")
-            print(f"⏰ Time: {checkpoint['time']}")
-            print(f"📅 Period: {checkpoint['period']}")
+        print(f"🔄 Restored to checkpoint '{name}'")
+        print(f"⏰ Time: {checkpoint['time']}")
+        print(f"📅 Period: {checkpoint['period']}")
 
-        elif subcommand == "list":
-            if not self.checkpoints:
-                print("📋 No checkpoints created yet")
-                return
+    def _checkpoint_list(self, args: list[str]) -> None:
+        """Handle ``checkpoint list``."""
+        if not self.checkpoints:
+            print("📋 No checkpoints created yet")
+            return
 
-            print("📋 Available Checkpoints:")
-            for i, (name, info) in enumerate(self.checkpoints.items()):
-                print(f"  {i + 1}. {name} - {info['time']} ({info['period']})")
-
-        else:
-            print("❌ Unknown checkpoint subcommand")
-            print("Available: create, restore, list")
+        print("📋 Available Checkpoints:")
+        for i, (name, info) in enumerate(self.checkpoints.items()):
+            print(f"  {i + 1}. {name} - {info['time']} ({info['period']})")
 
     def _handle_limits_commands(self, args: list[str]) -> None:
         """Handle limits calculation commands."""
@@ -865,56 +1108,69 @@ class EmulatorCLI:
             print("Limits commands: calculate, show, apply")
             return
 
-        subcommand = args[0].lower()
-        account = args[1] if len(args) > 1 else "default_account"
+        handler = self._limits_ops.get(args[0].lower())
+        if handler is None:
+            print("❌ Unknown limits subcommand")
+            print("Available: calculate, show, apply")
+            return
+        handler(args[1] if len(args) > 1 else "default_account")
 
-        if subcommand == "calculate":
-            try:
-                settings = self.limits_calculator.calculate_periodic_settings(account)
-
-                print(f"📊 Periodic Limits for {account}:")
-                print(f"   Period: {settings['period']}")
-                print(f"   Base allocation: {settings['base_allocation']}Nh")
-                print(f"   Total allocation: {settings['total_allocation']:.1f}Nh")
-                print(f"   Fairshare: {settings['fairshare']}")
-                print(f"   QoS threshold: {settings['qos_threshold']:.1f}Nh")
-                print(f"   Grace limit: {settings['grace_limit']:.1f}Nh")
-                print(f"   Billing minutes: {settings['billing_minutes']}")
-
-                # Show carryover details if applicable
-                carryover = settings["carryover_details"]
-                if carryover["unused_allocation"] > 0:
-                    print("\n🎁 Carryover Details:")
-                    print(f"   Previous usage: {carryover['previous_usage']}Nh")
-                    print(f"   Decay factor: {carryover['decay_factor']:.4f}")
-                    print(f"   Carryover amount: {carryover['unused_allocation']:.1f}Nh")
+    def _limits_calculate(self, account: str) -> None:
+        """Handle ``limits calculate``."""
+        try:
+            settings = self.limits_calculator.calculate_periodic_settings(account)
+
+            lines = [
+                f"📊 Periodic Limits for {account}:",
+                f"   Period: {settings['period']}",
+                f"   Base allocation: {settings['base_allocation']}Nh",
+                f"   Total allocation: {settings['total_allocation']:.1f}Nh",
+                f"   Fairshare: {settings['fairshare']}",
+                f"   QoS threshold: {settings['qos_threshold']:.1f}Nh",
+                f"   Grace limit: {settings['grace_limit']:.1f}Nh",
+                f"   Billing minutes: {settings['billing_minutes']}",
+            ]
 
-            except ValueError as e:
-                print(f"❌ {e}")
+            # Show carryover details if applicable
+            carryover = settings["carryover_details"]
+            if carryover["unused_allocation"] > 0:
+                lines.extend(
+                    [
+                        "\n🎁 Carryover Details:",
+                        f"   Previous usage: {carryover['previous_usage']}Nh",
+                        f"   Decay factor: {carryover['decay_factor']:.4f}",
+                        f"   Carryover amount: {carryover['unused_allocation']:.1f}Nh",
+                    ]
+                )
+            print("\n".join(lines))
 
-        elif subcommand == "show":
-            # Show current limits from account
-            account_obj = self.database.get_account(account)
-            if not account_obj:
-                print(f"❌ Account {account} not found")
-                return
+        except ValueError as e:
+            print(f"❌ {e}")
 
-            print(f"📊 Current Limits for {account}:")
-            print(f"   Fairshare: {account_obj.fairshare}")
-            print(f"   QoS: {account_obj.qos}")
-            print(f"   Limits: {account_obj.limits}")
+    def _limits_show(self, account: str) -> None:
+        """Handle ``limits show``."""
+        # Show current limits from account
+        account_obj = self.database.get_account(account)
+        if not account_obj:
+            print(f"❌ Account {account} not found")
+            return
 
-        elif subcommand == "apply":
-            try:
-                result = self.limits_calculator.apply_period_transition(account)
-                print(f"✅ Applied periodic settings to {account}")
-                print(f"📊 Settings: {result['settings_applied']}")
-            except ValueError as e:
-                print(f"❌ {e}")
+        lines = [
+            f"📊 Current Limits for {account}:",
+            f"   Fairshare: {account_obj.fairshare}",
+            f"   QoS: {account_obj.qos}",
+            f"   Limits: {account_obj.limits}",
+        ]
+        print("\n".join(lines))
 
-        else:
-            print("❌ Unknown limits subcommand")
-            print("Available: calculate, show, apply")
+    def _limits_apply(self, account: str) -> None:
+        """Handle ``limits apply``."""
+        try:
+            result = self.limits_calculator.apply_period_transition(account)
+            print(f"✅ Applied periodic settings to {account}")
+            print(f"📊 Settings: {result['settings_applied']}")
+        except ValueError as e:
+            print(f"❌ {e}")
 
     def _handle_qos_commands(self, args: list[str]) -> None:
         """Handle QoS management commands."""
@@ -922,69 +1178,73 @@ class EmulatorCLI:
             print("QoS commands: show, set, check")
             return
 
-        subcommand = args[0].lower()
-
-        if subcommand == "show":
-            account = args[1] if len(args) > 1 else "default_account"
-            qos = self.qos_manager.get_account_qos(account)
-            qos_info = self.qos_manager.get_qos_info(qos)
-
-            print(f"🎛️  QoS for {account}: {qos}")
-            if qos_info:
-                print(f"   Description: {qos_info.get('description', 'N/A')}")
-                print(f"   Priority Weight: {qos_info.get('priority_weight', 'N/A')}")
-
-        elif subcommand == "set":
-            if len(args) < 3:
-                print("Usage: qos set <account> <qos>")
-                return
+        handler = self._qos_ops.get(args[0].lower())
+        if handler is None:
+            print("❌ Unknown QoS subcommand")
+            print("Available: show, set, check")
+            return
+        handler(args)
 
-            account = args[1]
-            qos = args[2]
+    def _qos_show(self, args: list[str]) -> None:
+        """Handle ``qos show``."""
+        account = args[1] if len(args) > 1 else "default_account"
+        qos = self.qos_manager.get_account_qos(account)
+        qos_info = self.qos_manager.get_qos_info(qos)
+
+        print(f"🎛️  QoS for {account}: {qos}")
+        if qos_info:
+            print(f"   Description: {qos_info.get('description', 'N/A')}")
+            print(f"   Priority Weight: {qos_info.get('priority_weight', 'N/A')}")
+
+    def _qos_set(self, args: list[str]) -> None:
+        """Handle ``qos set``."""
+        if len(args) < 3:
+            print("Usage: qos set <account> <qos>")
+            return
 
-            success = self.qos_manager.set_account_qos(account, qos)
-            if success:
-                print(f"✅ QoS set to {qos} for {account}")
-            else:
-                print("❌ Failed to set QoS")
+        account = args[1]
+        qos = args[2]
 
-        elif subcommand == "check":
-            account = args[1] if len(args) > 1 else "default_account"
+        success = self.qos_manager.set_account_qos(account, qos)
+        if success:
+            print(f"✅ QoS set to {qos} for {account}")
+        else:
+            print("❌ Failed to set QoS")
 
-            try:
-                # Get current settings for threshold calculations
-                settings = self.limits_calculator.calculate_periodic_settings(account)
-                current_usage = self.database.get_total_usage(
-                    account, self.time_engine.get_current_quarter()
-                )
+    def _qos_check(self, args: list[str]) -> None:
+        """Handle ``qos check``."""
+        account = args[1] if len(args) > 1 else "default_account"
 
-                # Check and automatically update QoS
-                qos_result = self.qos_manager.check_and_update_qos(
-                    account, current_usage, settings["qos_threshold"], settings["grace_limit"]
-                )
+        try:
+            # Get current settings for threshold calculations
+            settings = self.limits_calculator.calculate_periodic_settings(account)
+            current_usage = self.database.get_total_usage(
+                account, self.time_engine.get_current_quarter()
+            )
 
-                print(f"🔍 Threshold Check for {account}:")
-                print(f"   Current usage: {current_usage}Nh")
-                print(f"   QoS threshold: {settings['qos_threshold']:.1f}Nh")
-                print(f"   Grace limit: {settings['grace_limit']:.1f}Nh")
-                print(f"   Current QoS: {qos_result['current_qos']}")
-                print(f"   New QoS: {qos_result['new_qos']}")
-                print(f"   Status: {qos_result['threshold_status']}")
-                print(
-                    f"   Percentage used: {(current_usage / settings['total_allocation']) * 100:.1f}%"
-                )
+            # Check and automatically update QoS
+            qos_result = self.qos_manager.check_and_update_qos(
+                account, current_usage, settings["qos_threshold"], settings["grace_limit"]
+            )
 
-                if qos_result["action_taken"]:
-                    print(f"   ✅ Action taken: {qos_result['action_taken']}")
-                else:
-                    print("   ℹ️  No QoS change needed")
+            print(f"🔍 Threshold Check for {account}:")
+            print(f"   Current usage: {current_usage}Nh")
+            print(f"   QoS threshold: {settings['qos_threshold']:.1f}Nh")
+            print(f"   Grace limit: {settings['grace_limit']:.1f}Nh")
+            print(f"   Current QoS: {qos_result['current_qos']}")
+            print(f"   New QoS: {qos_result['new_qos']}")
+            print(f"   Status: {qos_result['threshold_status']}")
+            print(
+                f"   Percentage used: {(current_usage / settings['total_allocation']) * 100:.1f}%"
+            )
 
-            except ValueError as e:
-                print(f"❌ {e}")
+            if qos_result["action_taken"]:
+                print(f"   ✅ Action taken: {qos_result['action_taken']}")
+            else:
+                print("   ℹ️  No QoS change needed")
 
-        else:
-            print("❌ Unknown QoS subcommand")
-            print("Available: show, set, check")
+        except ValueError as e:
+            print(f"❌ {e}")
 
     def _handle_account_commands(self, args: list[str]) -> None:
         """Handle account management commands."""
@@ -992,188 +1252,194 @@ class EmulatorCLI:
             print("Account commands: create, list, show, delete")
             return
 
-        subcommand = args[0].lower()
+        handler = self._account_ops.get(args[0].lower())
+        if handler is None:
+            print("❌ Unknown account subcommand")
+            print("Available: create, list, show, delete")
+            return
+        handler(args)
 
-        if subcommand == "create":
-            if len(args) < 2:
-                print("Usage: account create <name> [description] [allocation]")
-                return
+    def _account_create(self, args: list[str]) -> None:
+        """Handle ``account create``."""
+        if len(args) < 2:
+            print("Usage: account create <name> [description] [allocation]")
+            return
 
-            name = args[1]
-            description = f"Account {name}"
-            allocation = 1000
-
-            # Parse optional parameters
-            for _i, arg in enumerate(args[2:], 2):
-                if arg.isdigit():
-                    # This is the allocation number
-                    allocation = int(arg)
-                else:
-                    # This is the description
-                    description = arg.strip('"')
+        name = args[1]
+        description = f"Account {name}"
+        allocation = 1000
 
-            self.database.add_account(name, description, "emulator")
-            self.database.set_account_allocation(name, allocation)
+        # Parse optional parameters
+        for arg in itertools.islice(args, 2, None):
+            if arg.isdigit():
+                # This is the allocation number
+                allocation = int(arg)
+            else:
+                # This is the description
+                description = arg.strip('"')
 
-            print(f"✅ Created account {name} with {allocation}Nh allocation")
+        self.database.add_account(name, description, "emulator")
+        self.database.set_account_allocation(name, allocation)
 
-        elif subcommand == "list":
-            accounts = self.database.list_accounts()
-            print("📋 Accounts:")
-            for account in accounts:
-                print(f"  - {account.name}: {account.description} ({account.allocation}Nh)")
+        print(f"✅ Created account {name} with {allocation}Nh allocation")
 
-        elif subcommand == "show":
-            if len(args) < 2:
-                print("Usage: account show <name>")
-                return
+    def _account_list(self, args: list[str]) -> None:
+        """Handle ``account list``."""
+        accounts = self.database.list_accounts()
+        print("📋 Accounts:")
+        for account in accounts:
+            print(f"  - {account.name}: {account.description} ({account.allocation}Nh)")
 
-            name = args[1]
-            account_opt = self.database.get_account(name)
+    def _account_show(self, args: list[str]) -> None:
+        """Handle ``account show``."""
+        if len(args) < 2:
+            print("Usage: account show <name>")
+            return
 
-            if account_opt is None:
-                print(f"❌ Account {name} not found")
-                return
+        name = args[1]
+        account_opt = self.database.get_account(name)
 
-            account = account_opt  # Now we know it's not None
-            print(f"📊 Account: {account.name}")
-            print(f"   Description: {account.description}")
-            print(f"   Organization: {account.organization}")
-            print(f"   Allocation: {account.allocation}Nh")
-            print(f"   Fairshare: {account.fairshare}")
-            print(f"   QoS: {account.qos}")
-            print(f"   Last period: {account.last_period}")
-
-            # Show usage summary
-            summary = self.usage_simulator.get_current_usage_summary(name)
-            print("\n📊 Usage Summary:")
-            print(f"   Current period: {summary['current_period']}")
-            print(f"   Period usage: {summary['period_usage']}Nh")
-            print(f"   Remaining: {summary['remaining']}Nh")
-            print(f"   Percentage used: {summary['percentage_used']:.1f}%")
-
-        elif subcommand == "delete":
-            if len(args) < 2:
-                print("Usage: account delete <name>")
-                return
+        if account_opt is None:
+            print(f"❌ Account {name} not found")
+            return
 
-            name = args[1]
-            self.database.delete_account(name)
-            print(f"✅ Deleted account {name}")
+        account = account_opt  # Now we know it's not None
+        lines = [
+            f"📊 Account: {account.name}",
+            f"   Description: {account.description}",
+            f"   Organization: {account.organization}",
+            f"   Allocation: {account.allocation}Nh",
+            f"   Fairshare: {account.fairshare}",
+            f"   QoS: {account.qos}",
+            f"   Last period: {account.last_period}",
+        ]
 
-        else:
-            print("❌ Unknown account subcommand")
-            print("Available: create, list, show, delete")
+        # Show usage summary
+        summary = self.usage_simulator.get_current_usage_summary(name)
+        lines.extend(
+            [
+                "\n📊 Usage Summary:",
+                f"   Current period: {summary['current_period']}",
+                f"   Period usage: {summary['period_usage']}Nh",
+                f"   Remaining: {summary['remaining']}Nh",
+                f"   Percentage used: {summary['percentage_used']:.1f}%",
+            ]
+        )
+        print("\n".join(lines))
+
+    def _account_delete(self, args: list[str]) -> None:
+        """Handle ``account delete``."""
+        if len(args) < 2:
+            print("Usage: account delete <name>")
+            return
+
+        name = args[1]
+        self.database.delete_account(name)
+        print(f"✅ Deleted account {name}")
 
     def _handle_config_commands(self, args: list[str]) -> None:
         """Handle configuration commands."""
         if not args:
             args = ["show"]
 
-        subcommand = args[0].lower()
+        handler = self._config_ops.get(args[0].lower())
+        if handler is None:
+            print("❌ Unknown config subcommand")
+            print("Available: show, validate, reload")
+            return
+        handler(args)
 
-        if subcommand == "show":
-            if self.slurm_config:
-                self.slurm_config.print_config_summary()
+    def _config_show(self, args: list[str]) -> None:
+        """Handle ``config show``."""
+        if self.slurm_config:
+            self.slurm_config.print_config_summary()
+
+            # Show emulator-specific config
+            emulator_config = self.slurm_config.get_emulator_config()
+            print("\n🤖 Emulator Configuration:")
+            print(f"   Manual Usage Reset: {emulator_config['manual_usage_reset']}")
+            print(f"   TRES Billing Support: {emulator_config['supports_tres_billing']}")
+            print(f"   Priority Flags: {', '.join(emulator_config['priority_flags'])}")
+        else:
+            print(_DEFAULT_CONFIG_SUMMARY)
 
-                # Show emulator-specific config
-                emulator_config = self.slurm_config.get_emulator_config()
-                print("\n🤖 Emulator Configuration:")
-                print(f"   Manual Usage Reset: {emulator_config['manual_usage_reset']}")
-                print(f"   TRES Billing Support: {emulator_config['supports_tres_billing']}")
-                print(f"   Priority Flags: {', '.join(emulator_config['priority_flags'])}")
-            else:
-                print("📊 Using Default Configuration:")
-                print("   No slurm.conf file loaded")
-                print("   Decay Half-Life: 15.0 days")
-                print("   Usage Reset: Manual")
-                print("   QoS Weight: 500000")
-                print("   Fairshare Weight: 259200")
-                print("   TRES Billing Weights:")
-                print("      CPU: 0.015625")
-                print("      Mem: 0.001953125")
-                print("      GRES/gpu: 0.25")
-
-        elif subcommand == "validate":
-            if self.slurm_config:
-                warnings = self.slurm_config.validate_configuration()
-                if warnings:
-                    print("⚠️  Configuration Warnings:")
-                    for warning in warnings:
-                        print(f"   - {warning}")
-                else:
-                    print("✅ Configuration is valid!")
+    def _config_validate(self, args: list[str]) -> None:
+        """Handle ``config validate``."""
+        if self.slurm_config:
+            warnings = self.slurm_config.validate_configuration()
+            if warnings:
+                print("⚠️  Configuration Warnings:")
+                for warning in warnings:
+                    print(f"   - {warning}")
             else:
-                print("❌ No configuration loaded to validate")
+                print("✅ Configuration is valid!")
+        else:
+            print("❌ No configuration loaded to validate")
 
-        elif subcommand == "reload":
-            if len(args) < 2:
-                print("Usage: config reload <path-to-slurm.conf>")
-                return
+    def _config_reload(self, args: list[str]) -> None:
+        """Handle ``config reload``."""
+        if len(args) < 2:
+            print("Usage: config reload <path-to-slurm.conf>")
+            return
 
-            config_path = args[1]
-            try:
-                new_config = SlurmConfigParser(config_path)
-                self.slurm_config = new_config
+        config_path = args[1]
+        try:
+            from emulator.core.slurm_config import SlurmConfigParser  # noqa: PLC0415
 
-                # Update components with new config
-                self.usage_simulator.billing_weights = new_config.get_tres_billing_weights()
-                self.limits_calculator = PeriodicLimitsCalculator(
-                    self.database, self.time_engine, new_config
-                )
+            new_config = SlurmConfigParser(config_path)
+            self.slurm_config = new_config
 
-                print(f"✅ Reloaded configuration from {config_path}")
-                new_config.print_config_summary()
+            # Update components with new config
+            self.usage_simulator.billing_weights = new_config.get_tres_billing_weights()
+            self.limits_calculator = PeriodicLimitsCalculator(
+                self.database, self.time_engine, new_config
+            )
 
-            except Exception as e:
-                print(f"❌ Failed to reload configuration: {e}")
+            print(f"✅ Reloaded configuration from {config_path}")
+            new_config.print_config_summary()
 
-        else:
-            print("❌ Unknown config subcommand")
-            print("Available: show, validate, reload")
+        except Exception as e:
+            print(f"❌ Failed to reload configuration: {e}")
 
     def _show_status(self, args: list[str]) -> None:
         """Show overall emulator status."""
-        print("📊 SLURM Emulator Status")
-        print("=" * 40)
-        print(f"⏰ Current time: {self.time_engine.get_current_time()}")
-        print(f"📅 Current period: {self.time_engine.get_current_quarter()}")
+        current_quarter = self.time_engine.get_current_quarter()
+        shown = self.database.list_non_root_accounts()
+        lines = [
+            "📊 SLURM Emulator Status",
+            "=" * 40,
+            f"⏰ Current time: {self.time_engine.get_current_time()}",
+            f"📅 Current period: {current_quarter}",
+        ]
 
         # Show accounts summary
-        accounts = self.database.list_accounts()
-        print(f"\n📋 Accounts: {len(accounts)}")
-        for account in accounts:
-            if account.name == "root":
-                continue
-            usage = self.database.get_total_usage(
-                account.name, self.time_engine.get_current_quarter()
-            )
-            print(f"   - {account.name}: {usage}/{account.allocation}Nh ({account.qos})")
+        lines.append(f"\n📋 Accounts: {len(self.database.accounts)}")
+        usages = self.database.get_total_usage_bulk(
+            [account.name for account in shown], current_quarter
+        )
+        for account in shown:
+            usage = usages[account.name]
+            lines.append(f"   - {account.name}: {usage}/{account.allocation}Nh ({account.qos})")
 
         # Show users summary
-        users = list(self.database.users.values())
-        print(f"\n👥 Users: {len(users)}")
+        lines.append(f"\n👥 Users: {len(self.database.users)}")
 
         # Show checkpoints
-        print(f"\n💾 Checkpoints: {len(self.checkpoints)}")
+        lines.append(f"\n💾 Checkpoints: {len(self.checkpoints)}")
         for name in list(self.checkpoints.keys())[-3:]:  # Show last 3
-            print(f"   - {name}: {self.checkpoints[name]['time']}")
+            lines.append(f"   - {name}: {self.checkpoints[name]['time']}")
+        print("\n".join(lines))
 
-    def _list_scenarios(self, args: list[str]) -> None:
+    def _list_scenarios(self, scenario_type: Optional[str] = None) -> None:
         """List available scenarios."""
-        scenario_type = args[0] if args else None
-
         if scenario_type:
-            try:
-                type_filter = ScenarioType(scenario_type)
-                scenarios = self.scenario_registry.list_by_type(type_filter)
-                print(f"📋 {scenario_type.title().replace('_', ' ')} Scenarios:")
-            except ValueError:
+            type_filter = _SCENARIO_TYPES.get(scenario_type)
+            if type_filter is None:
                 print(f"❌ Unknown scenario type: {scenario_type}")
-                print(
-                    "Available types: periodic_limits, decay_testing, qos_management, usage_patterns, configuration"
-                )
+                print(f"Available types: {_SCENARIO_TYPES_HELP}")
                 return
+            scenarios = self.scenario_registry.list_by_type(type_filter)
+            print(f"📋 {scenario_type.title().replace('_', ' ')} Scenarios:")
         else:
             scenarios = self.scenario_registry.list_scenarios()
             print("📋 Available Scenarios:")
@@ -1182,16 +1448,29 @@ class EmulatorCLI:
             print("   No scenarios found")
             return
 
+        lines = []
         for scenario in scenarios:
-            complexity_emoji = {"basic": "🟢", "intermediate": "🟡", "advanced": "🔴"}.get(
-                scenario.complexity, "⚪"
-            )
-            print(f"\n  {complexity_emoji} {scenario.name}: {scenario.title}")
-            print(f"     {scenario.description}")
-            print(
-                f"     Duration: {scenario.duration_estimate} | Complexity: {scenario.complexity}"
-            )
-            print(f"     Steps: {len(scenario.steps)} | Type: {scenario.scenario_type.value}")
+            header, details = self._scenario_summary(scenario)
+            lines.append(header)
+            lines.append(details)
+        print("\n".join(lines))
+
+    def _scenario_summary(self, scenario) -> tuple[str, str]:
+        """Return the formatted header and detail lines used in scenario listings."""
+        cached = self._scenario_summaries.get(scenario.name)
+        if cached is not None and cached[0] is scenario and cached[1] == len(scenario.steps):
+            return cached[2], cached[3]
+
+        complexity_emoji = _COMPLEXITY_EMOJI.get(scenario.complexity, "⚪")
+        header = (
+            f"\n  {complexity_emoji} {scenario.name}: {scenario.title}\n     {scenario.description}"
+        )
+        details = (
+            f"     Duration: {scenario.duration_estimate} | Complexity: {scenario.complexity}\n"
+            f"     Steps: {len(scenario.steps)} | Type: {scenario.scenario_type.value}"
+        )
+        self._scenario_summaries[scenario.name] = (scenario, len(scenario.steps), header, details)
+        return header, details
 
     def _describe_scenario(self, scenario_name: str) -> None:
         """Show detailed description of a scenario."""
@@ -1200,47 +1479,56 @@ class EmulatorCLI:
             print(f"❌ Scenario '{scenario_name}' not found")
             return
 
-        complexity_emoji = {"basic": "🟢", "intermediate": "🟡", "advanced": "🔴"}.get(
-            scenario.complexity, "⚪"
-        )
+        complexity_emoji = _COMPLEXITY_EMOJI.get(scenario.complexity, "⚪")
 
-        print(f"\n📖 Scenario: {scenario.title}")
-        print("=" * (len(scenario.title) + 12))
-        print(f"🏷️  Name: {scenario.name}")
-        print(f"{complexity_emoji} Complexity: {scenario.complexity}")
-        print(f"⏱️  Duration: {scenario.duration_estimate}")
-        print(f"🔧 Type: {scenario.scenario_type.value}")
+        lines = [
+            f"\n📖 Scenario: {scenario.title}",
+            "=" * (len(scenario.title) + 12),
+            f"🏷️  Name: {scenario.name}",
+            f"{complexity_emoji} Complexity: {scenario.complexity}",
+            f"⏱️  Duration: {scenario.duration_estimate}",
+            f"🔧 Type: {scenario.scenario_type.value}",
+        ]
 
         if scenario.recommended_config:
-            print(f"⚙️  Recommended Config: {scenario.recommended_config}")
+            lines.append(f"⚙️  Recommended Config: {scenario.recommended_config}")
 
-        print("\n📝 Description:")
-        print(f"   {scenario.description}")
+        lines.append("\n📝 Description:")
+        lines.append(f"   {scenario.description}")
 
         if scenario.learning_objectives:
-            print("\n🎯 Learning Objectives:")
+            lines.append("\n🎯 Learning Objectives:")
             for obj in scenario.learning_objectives:
-                print(f"   • {obj}")
+                lines.append(f"   • {obj}")
 
         if scenario.key_concepts:
-            print("\n🔑 Key Concepts:")
+            lines.append("\n🔑 Key Concepts:")
             for concept in scenario.key_concepts:
-                print(f"   • {concept}")
+                lines.append(f"   • {concept}")
 
         if scenario.prerequisites:
-            print("\n⚠️  Prerequisites:")
+            lines.append("\n⚠️  Prerequisites:")
             for prereq in scenario.prerequisites:
-                print(f"   • {prereq}")
+                lines.append(f"   • {prereq}")
 
-        print("\n📊 Structure:")
-        print(f"   Steps: {len(scenario.steps)}")
-        print(f"   Total Actions: {scenario.get_total_actions()}")
+        lines.extend(
+            [
+                "\n📊 Structure:",
+                f"   Steps: {len(scenario.steps)}",
+                f"   Total Actions: {scenario.get_total_actions()}",
+            ]
+        )
 
-        print("\n💡 Usage:")
-        print(f"   scenario run {scenario.name}                    # Run automatically")
-        print(f"   scenario run {scenario.name} --interactive      # Run with prompts")
-        print(f"   scenario run {scenario.name} --step-by-step     # Run with detailed steps")
-        print(f"   scenario steps {scenario.name}                 # Show step breakdown")
+        lines.extend(
+            [
+                "\n💡 Usage:",
+                f"   scenario run {scenario.name}                    # Run automatically",
+                f"   scenario run {scenario.name} --interactive      # Run with prompts",
+                f"   scenario run {scenario.name} --step-by-step     # Run with detailed steps",
+                f"   scenario steps {scenario.name}                 # Show step breakdown",
+            ]
+        )
+        print("\n".join(lines))
 
     def _show_scenario_steps(self, scenario_name: str) -> None:
         """Show detailed step breakdown of a scenario."""
@@ -1249,28 +1537,28 @@ class EmulatorCLI:
             print(f"❌ Scenario '{scenario_name}' not found")
             return
 
-        print(f"\n📋 Steps for '{scenario.title}':")
-        print("=" * 50)
+        lines = [f"\n📋 Steps for '{scenario.title}':", "=" * 50]
 
         for i, step in enumerate(scenario.steps, 1):
-            print(f"\n📍 Step {i}: {step.name}")
-            print(f"   📝 {step.description}")
+            lines.append(f"\n📍 Step {i}: {step.name}")
+            lines.append(f"   📝 {step.description}")
             if step.time_point:
-                print(f"   ⏰ Time: {step.time_point}")
+                lines.append(f"   ⏰ Time: {step.time_point}")
 
             if step.actions:
-                print(f"   🔧 Actions ({len(step.actions)}):")
+                lines.append(f"   🔧 Actions ({len(step.actions)}):")
                 for j, action in enumerate(step.actions, 1):
                     cli_cmd = action.get_cli_command()
-                    print(f"      {j}. {action.description}")
-                    print(f"         Command: {cli_cmd}")
+                    lines.append(f"      {j}. {action.description}")
+                    lines.append(f"         Command: {cli_cmd}")
                     if action.expected_outcome:
-                        print(f"         Expected: {action.expected_outcome}")
+                        lines.append(f"         Expected: {action.expected_outcome}")
 
             if step.expected_state:
-                print("   ✅ Expected State:")
+                lines.append("   ✅ Expected State:")
                 for key, value in step.expected_state.items():
-                    print(f"      {key}: {value}")
+                    lines.append(f"      {key}: {value}")
+        print("\n".join(lines))
 
     def _validate_scenario(self, scenario_name: str) -> None:
         """Validate scenario definition."""
@@ -1319,12 +1607,7 @@ class EmulatorCLI:
 
         print(f"🔍 Search results for '{query}' ({len(results)} found):")
 
-        for scenario in results:
-            complexity_emoji = {"basic": "🟢", "intermediate": "🟡", "advanced": "🔴"}.get(
-                scenario.complexity, "⚪"
-            )
-            print(f"\n  {complexity_emoji} {scenario.name}: {scenario.title}")
-            print(f"     {scenario.description}")
+        print("\n".join(self._scenario_summary(scenario)[0] for scenario in results))
 
     def _run_registry_scenario(
         self, scenario_name: str, interactive: bool, step_by_step: bool
@@ -1364,17 +1647,20 @@ class EmulatorCLI:
                     if step_by_step:
                         print(f"   ⏰ Time set to: {step.time_point}")
 
-                # Execute actions
-                for j, action in enumerate(step.actions, 1):
-                    if step_by_step:
-                        print(f"   🔧 Action {j}: {action.description}")
-                        cli_cmd = action.get_cli_command()
-                        print(f"      Command: {cli_cmd}")
+                # Execute actions, persisting the database once per step. The
+                # step also gets its own settings cache: a CONFIG_RELOAD in an
+                # earlier step replaced the calculator the command started with.
+                with self.database.batch_writes(), self.limits_calculator.request_cache():
+                    for j, action in enumerate(step.actions, 1):
+                        if step_by_step:
+                            print(f"   🔧 Action {j}: {action.description}")
+                            cli_cmd = action.get_cli_command()
+                            print(f"      Command: {cli_cmd}")
 
-                    self._execute_scenario_action(action)
+                        self._execute_scenario_action(action)
 
-                    if step_by_step and action.expected_outcome:
-                        print(f"      Expected: {action.expected_outcome}")
+                        if step_by_step and action.expected_outcome:
+                            print(f"      Expected: {action.expected_outcome}")
 
                 if step_by_step:
                     print(f"   ✅ Step {i} completed")
@@ -1386,153 +1672,191 @@ class EmulatorCLI:
 
     def _execute_scenario_action(self, action) -> None:
         """Execute a scenario action."""
-        if action.type == ActionType.TIME_SET:
-            time_str = action.parameters["time"]
-            target_time = datetime.fromisoformat(time_str)
-            self.time_engine.set_time(target_time)
-
-        elif action.type == ActionType.TIME_ADVANCE:
-            amount = action.parameters["amount"]
-            unit = action.parameters["unit"]
-            if unit == "days":
-                self.time_engine.advance_time(days=amount)
-            elif unit == "months":
-                self.time_engine.advance_time(months=amount)
-            elif unit == "quarters":
-                self.time_engine.advance_time(quarters=amount)
-
-        elif action.type == ActionType.USAGE_INJECT:
-            user = action.parameters["user"]
-            amount = action.parameters["amount"]
-            account = action.parameters.get("account", "default_account")
-            self.usage_simulator.inject_usage(account, user, amount)
-
-        elif action.type == ActionType.ACCOUNT_CREATE:
-            name = action.parameters["name"]
-            desc = action.parameters.get("description", "Test Account")
-            allocation = action.parameters.get("allocation", 1000)
-
-            # Clean up existing account first to ensure clean state
-            if self.database.get_account(name):
-                self.database.delete_account(name)
-
-            self.database.add_account(name, desc, "emulator")
-            self.database.set_account_allocation(name, allocation)
-
-        elif action.type == ActionType.ACCOUNT_DELETE:
-            name = action.parameters["account"]
-            if self.database.get_account(name):
-                self.database.delete_account(name)
-
-        elif action.type == ActionType.CLEANUP:
-            # Handle cleanup actions
-            account = action.parameters.get("account")
-            if account and self.database.get_account(account):
-                self.database.delete_account(account)
-
-        elif action.type == ActionType.LIMITS_CALCULATE:
-            account = action.parameters.get("account", "default_account")
-            try:
-                # For decay scenarios, force carryover calculation
-                config_override = {}
-                if "decay" in action.description.lower():
-                    # Set the account to have a previous period to trigger carryover
-                    account_obj = self.database.get_account(account)
-                    if account_obj:
-                        # Set last period to previous quarter to trigger carryover calculation
-                        current_period = self.time_engine.get_current_quarter()
-                        from_period = self.limits_calculator._get_previous_quarter(current_period)
-                        account_obj.last_period = from_period
-
-                    config_override = {
-                        "force_carryover_calculation": True,
-                        "carryover_enabled": True,
-                        "grace_ratio": 0.2,
-                        "half_life_days": self.limits_calculator.half_life_days,
-                    }
-
-                settings = self.limits_calculator.calculate_periodic_settings(
-                    account, config_override
-                )
+        handler = self._ACTION_HANDLERS.get(action.type)
+        if handler is not None:
+            handler(self, action)
+
+    def _act_time_set(self, action) -> None:
+        """Jump to the time given by a TIME_SET action."""
+        time_str = action.parameters["time"]
+        target_time = _parse_iso(time_str)
+        self.time_engine.set_time(target_time)
+
+    def _act_time_advance(self, action) -> None:
+        """Advance time by the amount given by a TIME_ADVANCE action."""
+        unit = action.parameters["unit"]
+        if unit in self._ADVANCE_UNITS:
+            self.time_engine.advance_time(**{unit: action.parameters["amount"]})
+
+    def _act_usage_inject(self, action) -> None:
+        """Inject usage for a USAGE_INJECT action."""
+        user = action.parameters["user"]
+        amount = action.parameters["amount"]
+        account = action.parameters.get("account", "default_account")
+        self.usage_simulator.inject_usage(account, user, amount)
+
+    def _act_account_create(self, action) -> None:
+        """Create (or recreate) the account of an ACCOUNT_CREATE action."""
+        name = action.parameters["name"]
+        desc = action.parameters.get("description", "Test Account")
+        allocation = action.parameters.get("allocation", 1000)
+
+        # Replace any existing account to ensure clean state
+        self.database.upsert_account(name, desc, "emulator", allocation)
+
+    def _act_account_delete(self, action) -> None:
+        """Delete the account of an ACCOUNT_DELETE action."""
+        self.database.delete_account(action.parameters["account"])
+
+    def _act_cleanup(self, action) -> None:
+        """Handle cleanup actions."""
+        account = action.parameters.get("account")
+        if account:
+            self.database.delete_account(account)
+
+    def _act_limits_calculate(self, action) -> None:
+        """Calculate and report periodic limits for a LIMITS_CALCULATE action.
+
+        ``accounts`` may list several accounts to report in one pass; otherwise
+        the single ``account`` parameter is used.
+        """
+        accounts = action.parameters.get("accounts")
+        if not isinstance(accounts, list):
+            accounts = [action.parameters.get("account", "default_account")]
+
+        # For decay scenarios, force carryover calculation
+        config_override = {}
+        from_period = None
+        is_decay = "decay" in action.description.lower()
+        if is_decay:
+            current_period = self.time_engine.get_current_quarter()
+            from_period = self.limits_calculator._get_previous_quarter(current_period)
+            config_override = {
+                "force_carryover_calculation": True,
+                "carryover_enabled": True,
+                "grace_ratio": 0.2,
+                "half_life_days": self.limits_calculator.half_life_days,
+            }
 
-                # Show detailed results for decay scenarios
-                if "decay" in action.description.lower():
-                    carryover = settings["carryover_details"]
-                    half_life = self.limits_calculator.half_life_days
-                    print(f"      📊 Decay Analysis (Half-life: {half_life} days):")
-                    print(f"         Previous usage: {carryover['previous_usage']}Nh")
-                    print(f"         Days elapsed: {carryover['days_elapsed']}")
-                    print(f"         Decay factor: {carryover['decay_factor']:.6f}")
-                    print(
-                        f"         Effective previous: {carryover['effective_previous_usage']:.1f}Nh"
-                    )
-                    print(f"         Unused (after decay): {carryover['unused_allocation']:.1f}Nh")
-                    print(
-                        f"         New total allocation: {carryover['new_total_allocation']:.1f}Nh"
-                    )
+        for account in accounts:
+            if len(accounts) > 1:
+                print(f"      Account: {account}")
+            self._report_limits(account, config_override, from_period)
 
-                    # Calculate what the expected values should be for comparison
-                    expected_decay = 2 ** (-90 / half_life)
-                    expected_effective = carryover["previous_usage"] * expected_decay
-                    expected_carryover = max(0, carryover["base_allocation"] - expected_effective)
+    def _report_limits(
+        self, account: str, config_override: dict, from_period: Optional[str]
+    ) -> None:
+        """Print the periodic limits of one account; decay reports when ``from_period`` is set."""
+        try:
+            if from_period is not None:
+                # Set the account to have a previous period to trigger carryover
+                account_obj = self.database.get_account(account)
+                if account_obj:
+                    account_obj.last_period = from_period
 
-                    print("      🎯 Expected vs Actual:")
-                    print(f"         Expected decay factor: {expected_decay:.6f}")
-                    print(f"         Expected effective usage: {expected_effective:.1f}Nh")
-                    print(f"         Expected carryover: {expected_carryover:.1f}Nh")
-                else:
+            settings = self.limits_calculator.calculate_periodic_settings(account, config_override)
+
+            # Show detailed results for decay scenarios
+            if from_period is not None:
+                carryover = settings["carryover_details"]
+                half_life = self.limits_calculator.half_life_days
+                print(f"      📊 Decay Analysis (Half-life: {half_life} days):")
+                print(f"         Previous usage: {carryover['previous_usage']}Nh")
+                print(f"         Days elapsed: {carryover['days_elapsed']}")
+                print(f"         Decay factor: {carryover['decay_factor']:.6f}")
+                print(f"         Effective previous: {carryover['effective_previous_usage']:.1f}Nh")
+                print(f"         Unused (after decay): {carryover['unused_allocation']:.1f}Nh")
+                print(f"         New total allocation: {carryover['new_total_allocation']:.1f}Nh")
+
+                # Calculate what the expected values should be for comparison
+                expected_decay = 2 ** (-90 / half_life)
+                expected_effective = carryover["previous_usage"] * expected_decay
+                expected_carryover = max(0, carryover["base_allocation"] - expected_effective)
+
+                print("      🎯 Expected vs Actual:")
+                print(f"         Expected decay factor: {expected_decay:.6f}")
+                print(f"         Expected effective usage: {expected_effective:.1f}Nh")
+                print(f"         Expected carryover: {expected_carryover:.1f}Nh")
+            else:
+                print(
+                    f"      Result: Fairshare: {settings['fairshare']}, Allocation: {settings['total_allocation']:.1f}Nh"
+                )
+
+                # Show carryover details if available
+                if settings["carryover_details"]["unused_allocation"] > 0:
+                    carryover = settings["carryover_details"]
                     print(
-                        f"      Result: Fairshare: {settings['fairshare']}, Allocation: {settings['total_allocation']:.1f}Nh"
+                        f"      Carryover: {carryover['unused_allocation']:.1f}Nh (from {carryover['previous_usage']}Nh previous)"
                     )
 
-                    # Show carryover details if available
-                    if settings["carryover_details"]["unused_allocation"] > 0:
-                        carryover = settings["carryover_details"]
-                        print(
-                            f"      Carryover: {carryover['unused_allocation']:.1f}Nh (from {carryover['previous_usage']}Nh previous)"
-                        )
+        except ValueError:
+            pass
 
-            except ValueError:
-                pass
-
-        elif action.type == ActionType.QOS_CHECK:
-            account = action.parameters.get("account", "default_account")
-            try:
-                # Get current settings for threshold values
-                settings = self.limits_calculator.calculate_periodic_settings(account)
-                current_usage = self.database.get_total_usage(
-                    account, self.time_engine.get_current_quarter()
-                )
+    def _act_qos_check(self, action) -> None:
+        """Check and update QoS thresholds for a QOS_CHECK action."""
+        account = action.parameters.get("account", "default_account")
+        try:
+            # Get current settings for threshold values
+            settings = self.limits_calculator.calculate_periodic_settings(account)
+            current_usage = self.database.get_total_usage(
+                account, self.time_engine.get_current_quarter()
+            )
 
-                # Check and update QoS based on thresholds
-                qos_result = self.qos_manager.check_and_update_qos(
-                    account, current_usage, settings["qos_threshold"], settings["grace_limit"]
-                )
+            # Check and update QoS based on thresholds
+            qos_result = self.qos_manager.check_and_update_qos(
+                account, current_usage, settings["qos_threshold"], settings["grace_limit"]
+            )
 
-                final_qos = self.qos_manager.get_account_qos(account)
-                print(f"      Result: QoS: {final_qos}, Status: {qos_result['threshold_status']}")
+            final_qos = self.qos_manager.get_account_qos(account)
+            out = _Out()
+            out.append(f"      Result: QoS: {final_qos}, Status: {qos_result['threshold_status']}")
+            if qos_result["action_taken"]:
+                out.append(f"      Action: {qos_result['action_taken']}")
+            out.flush()
 
-                if qos_result["action_taken"]:
-                    print(f"      Action: {qos_result['action_taken']}")
+        except ValueError:
+            pass
 
-            except ValueError:
-                pass
+    def _act_config_reload(self, action) -> None:
+        """Reload slurm.conf for a CONFIG_RELOAD action."""
+        config_path = action.parameters["config_path"]
+        try:
+            from emulator.core.slurm_config import SlurmConfigParser  # noqa: PLC0415
 
-        elif action.type == ActionType.CONFIG_RELOAD:
-            config_path = action.parameters["config_path"]
-            try:
-                new_config = SlurmConfigParser(config_path)
-                self.slurm_config = new_config
-                self.usage_simulator.billing_weights = new_config.get_tres_billing_weights()
-                self.limits_calculator = PeriodicLimitsCalculator(
-                    self.database, self.time_engine, new_config
-                )
-            except Exception as e:
-                print(f"      Error: Failed to reload config: {e}")
+            new_config = SlurmConfigParser(config_path)
+            self.slurm_config = new_config
+            self.usage_simulator.billing_weights = new_config.get_tres_billing_weights()
+            self.limits_calculator = PeriodicLimitsCalculator(
+                self.database, self.time_engine, new_config
+            )
+        except Exception as e:
+            print(f"      Error: Failed to reload config: {e}")
+
+    # TIME_ADVANCE units, named after the matching advance_time() keyword
+    _ADVANCE_UNITS: ClassVar[frozenset[str]] = frozenset({"days", "months", "quarters"})
+
+    # Action types without an entry (QOS_SET, CHECKPOINT, VALIDATE) are no-ops
+    _ACTION_HANDLERS: ClassVar[dict[ActionType, Callable[["EmulatorCLI", Any], None]]] = {
+        ActionType.TIME_SET: _act_time_set,
+        ActionType.TIME_ADVANCE: _act_time_advance,
+        ActionType.USAGE_INJECT: _act_usage_inject,
+        ActionType.ACCOUNT_CREATE: _act_account_create,
+        ActionType.ACCOUNT_DELETE: _act_account_delete,
+        ActionType.CLEANUP: _act_cleanup,
+        ActionType.LIMITS_CALCULATE: _act_limits_calculate,
+        ActionType.QOS_CHECK: _act_qos_check,
+        ActionType.CONFIG_RELOAD: _act_config_reload,
+    }
 
     def _clean_scenario_state(self, scenario_name: str) -> None:
         """Clean state for scenario to ensure consistent results."""
-        print("🧹 Cleaning scenario state for consistent results...")
+        if self._last_cleaned.get(scenario_name) == self._cleanup_token():
+            # Nothing has touched the database since this scenario was cleaned
+            print("✅ Scenario state already clean")
+            return
+
+        out = _Out()
+        out.append("🧹 Cleaning scenario state for consistent results...")
 
         # Get scenario-specific accounts to clean
         scenario_accounts = self._get_scenario_accounts(scenario_name)
@@ -1546,91 +1870,65 @@ class EmulatorCLI:
 
         # Save cleaned state
         self.database.save_state()
-        print(f"✅ Cleaned {len(scenario_accounts)} scenario accounts")
-
-    def _get_scenario_accounts(self, scenario_name: str) -> list[str]:
-        """Get list of accounts used by a specific scenario."""
-        scenario_accounts = {
-            "qos_thresholds": ["qos_test"],
-            "carryover_test": ["carryover_light", "carryover_heavy"],
-            "decay_comparison": ["decay_test_15", "decay_test_7"],
-            "config_comparison": ["config_standard", "config_custom"],
-            "sequence": ["slurm_account_123"],
-        }
+        self._last_cleaned[scenario_name] = self._cleanup_token()
+        out.append(f"✅ Cleaned {len(scenario_accounts)} scenario accounts")
+        out.flush()
+
+    def _cleanup_token(self) -> tuple:
+        """Identify the database state a scenario cleanup ran against."""
+        return (self.database.current_cluster, self.database.state_token())
 
-        # Return accounts for this scenario, or empty list for unknown scenarios
-        return scenario_accounts.get(scenario_name, [])
+    def _get_scenario_accounts(self, scenario_name: str) -> tuple[str, ...]:
+        """Get the accounts used by a specific scenario (empty if unknown)."""
+        return _SCENARIO_ACCOUNTS.get(scenario_name, ())
 
     def _clean_account_completely(self, account_name: str) -> None:
         """Completely clean an account and all its cluster-scoped data."""
         cl = self.database.current_cluster
 
         # Remove global account
-        if self.database.get_account(account_name):
-            self.database.delete_account(account_name)
+        self.database.delete_account(account_name)
 
         # Remove usage records for this account in current cluster
-        self.database.usage_records = [
-            record
-            for record in self.database.usage_records
-            if not (record.account == account_name and record.cluster == cl)
-        ]
+        self.database.delete_account_usage(account_name, cl)
 
         # Remove associations for this account in current cluster
-        keys_to_remove = [
-            key
-            for key, assoc in self.database.associations.items()
-            if assoc.account == account_name and assoc.cluster == cl
-        ]
-        for key in keys_to_remove:
-            del self.database.associations[key]
+        self.database.delete_account_associations(account_name, cl)
 
         # Remove jobs for this account in current cluster
-        job_ids_to_remove = [
-            job_id
-            for job_id, job in self.database.jobs.items()
-            if job.account == account_name and job.cluster == cl
-        ]
-        for job_id in job_ids_to_remove:
-            del self.database.jobs[job_id]
+        self.database.delete_account_jobs(account_name, cl)
 
     def _clean_orphaned_data(self) -> None:
         """Clean up any orphaned data from deleted accounts."""
-        # Build set of account names that exist (accounts are global)
-        existing = {acc.name for acc in self.database.accounts.values()}
-
         # Clean usage records for non-existent accounts
-        self.database.usage_records = [
-            record for record in self.database.usage_records if record.account in existing
-        ]
+        self.database.delete_orphaned_usage()
 
         # Clean associations for non-existent accounts
-        keys_to_remove = [
-            key
-            for key, assoc in self.database.associations.items()
-            if assoc.account not in existing
-        ]
-        for key in keys_to_remove:
-            del self.database.associations[key]
+        self.database.delete_orphaned_associations()
 
         # Clean jobs for non-existent accounts
-        job_ids_to_remove = [
-            job_id for job_id, job in self.database.jobs.items() if job.account not in existing
-        ]
-        for job_id in job_ids_to_remove:
-            del self.database.jobs[job_id]
+        self.database.delete_orphaned_jobs()
 
     def _handle_cleanup_commands(self, args: list[str]) -> None:
         """Handle cleanup commands."""
+        out = _Out()
+        try:
+            self._run_cleanup_command(args, out)
+        finally:
+            # Still show what was reported before an error
+            out.flush()
+
+    def _run_cleanup_command(self, args: list[str], out: _Out) -> None:
+        """Run a cleanup subcommand, reporting through ``out``."""
         if not args:
-            print("Cleanup commands: all, scenario <name>, account <name>")
+            out.append("Cleanup commands: all, scenario <name>, account <name>")
             return
 
         subcommand = args[0].lower()
 
         if subcommand == "all":
             # Clean everything except root account
-            print("🧹 Cleaning all accounts and data except 'root'...")
+            out.append("🧹 Cleaning all accounts and data except 'root'...")
 
             accounts_to_keep = ["root"]
             accounts_to_remove = [
@@ -1646,11 +1944,13 @@ class EmulatorCLI:
             self.time_engine.set_time(datetime(2024, 1, 1))
 
             self.database.save_state()
-            print(f"✅ Cleaned {len(accounts_to_remove)} accounts and reset time to 2024-01-01")
+            out.append(
+                f"✅ Cleaned {len(accounts_to_remove)} accounts and reset time to 2024-01-01"
+            )
 
         elif subcommand == "scenario":
             if len(args) < 2:
-                print("Usage: cleanup scenario <scenario_name>")
+                out.append("Usage: cleanup scenario <scenario_name>")
                 return
 
             scenario_name = args[1]
@@ -1660,28 +1960,28 @@ class EmulatorCLI:
                 for account in scenario_accounts:
                     self._clean_account_completely(account)
                 self.database.save_state()
-                print(
+                out.append(
                     f"✅ Cleaned scenario '{scenario_name}' accounts: {', '.join(scenario_accounts)}"
                 )
             else:
-                print(f"❌ Unknown scenario: {scenario_name}")
+                out.append(f"❌ Unknown scenario: {scenario_name}")
 
         elif subcommand == "account":
             if len(args) < 2:
-                print("Usage: cleanup account <account_name>")
+                out.append("Usage: cleanup account <account_name>")
                 return
 
             account_name = args[1]
             if self.database.get_account(account_name):
                 self._clean_account_completely(account_name)
                 self.database.save_state()
-                print(f"✅ Cleaned account '{account_name}' completely")
+                out.append(f"✅ Cleaned account '{account_name}' completely")
             else:
-                print(f"❌ Account '{account_name}' not found")
+                out.append(f"❌ Account '{account_name}' not found")
 
         else:
-            print("❌ Unknown cleanup subcommand")
-            print("Available: all, scenario <name>, account <name>")
+            out.append("❌ Unknown cleanup subcommand")
+            out.append("Available: all, scenario <name>, account <name>")
 
     def _handle_manual_completion(self, args: list[str]) -> None:
         """Handle manual completion command for terminals without TAB support."""
@@ -1699,8 +1999,7 @@ class EmulatorCLI:
             matches = self._get_main_commands()
         elif len(parts) == 1:
             # Complete main command or show subcommands
-            main_commands = self._get_main_commands()
-            main_matches = [cmd for cmd in main_commands if cmd.startswith(parts[0])]
+            main_matches = _prefix_matches(self._MAIN_COMMANDS_SORTED, parts[0])
 
             if len(main_matches) == 1:
                 # Show subcommands for this main command
@@ -1713,7 +2012,7 @@ class EmulatorCLI:
         else:
             # Complete parameters
             main_cmd = parts[0]
-            if main_cmd in self._get_main_commands():
+            if main_cmd in self._MAIN_COMMANDS:
                 # For manual completion, complete with empty text to show all options
                 matches = self._get_parameters(main_cmd, parts[1:], "")
                 print(f"📋 Completions for '{command_line}':")
@@ -1742,95 +2041,7 @@ class EmulatorCLI:
 
     def _show_help(self) -> None:
         """Show help message."""
-        print("""
-📖 SLURM Emulator Commands:
-
-⏰ Time Management:
-  time                          - Show current time and period
-  time advance <N> days/months/quarters - Advance time by amount
-  time set YYYY-MM-DD [HH:MM:SS]       - Set specific date/time
-
-💾 Usage Simulation:
-  usage inject <user> <amount> [account] - Inject node-hour usage
-  usage show [account] [period]          - Show usage summary
-
-🎬 Scenarios:
-  scenario list [type]                  - List scenarios (optionally by type)
-  scenario describe <name>              - Show detailed scenario description
-  scenario steps <name>                 - Show step-by-step breakdown
-  scenario run <name> [--interactive]   - Run scenario
-  scenario run <name> --step-by-step    - Run with detailed step output
-  scenario validate <name>              - Validate scenario definition
-  scenario search <query>               - Search scenarios by keyword
-
-💾 Checkpoints:
-  checkpoint create <name>              - Save current state
-  checkpoint restore <name>             - Restore saved state
-  checkpoint list                       - List all checkpoints
-
-📊 Limits & QoS:
-  limits calculate [account]            - Calculate periodic limits
-  limits show [account]                 - Show current limits
-  limits apply [account]                - Apply period transition
-  qos show [account]                    - Show QoS status
-  qos set <account> <qos>               - Set QoS level
-  qos check [account]                   - Check usage thresholds
-
-🏢 Account Management:
-  account create <name> [desc] [alloc]  - Create account
-  account list                          - List all accounts
-  account show <name>                   - Show account details
-  account delete <name>                 - Delete account
-
-🌐 Cluster Management:
-  cluster list                          - List all clusters (* = active)
-  cluster add <name>                    - Add a new cluster
-  cluster use <name>                    - Switch active cluster context
-  cluster show                          - Show current cluster details
-
-⚙️  Configuration:
-  config show                           - Show current configuration
-  config validate                       - Validate loaded configuration
-  config reload <path>                  - Reload configuration from file
-
-🔧 SLURM Commands:
-  sacctmgr <args>                       - Run sacctmgr command
-  sacct <args>                          - Run sacct command
-  sinfo <args>                          - Run sinfo command
-
-📊 General:
-  status                                - Show emulator status
-  cleanup all                           - Clean all accounts and reset state
-  cleanup scenario <name>               - Clean specific scenario accounts
-  cleanup account <name>                - Clean specific account completely
-  help                                  - Show this help
-  exit                                  - Quit emulator
-  complete <partial_command>            - Manual completion (if TAB not working)
-
-⌨️  Auto-Completion:
-  [TAB]                                 - Complete commands and parameters
-  [TAB][TAB]                            - Show all available options
-  [↑][↓]                                - Navigate command history
-  [Ctrl+R]                              - Search command history
-  complete <cmd>                        - Manual completion fallback
-
-💡 Example Session:
-  time set 2024-01-01
-  account create test-account "Test" 1000
-  usage inject user1 200 test-account
-  time advance 2 months
-  usage inject user1 400 test-account
-  limits calculate test-account
-  scenario run sequence --interactive
-
-💡 Auto-Completion Examples:
-  scenario [TAB]                        # Shows: run, list, describe, steps
-  scenario describe [TAB]               # Shows scenario names
-  sacctmgr modify account [TAB]         # Shows account names
-  sacctmgr modify account test set [TAB] # Shows: fairshare=, qos=, etc.
-  qos set test [TAB]                    # Shows QoS levels
-  time advance 2 [TAB]                  # Shows: days, months, quarters
-        """)
+        sys.stdout.write(_HELP_TEXT)
 
 
 def main():
@@ -0,0 +1,294 @@
+"""Optional command daemon keeping the emulator state loaded between calls.
+
+Every ``sacctmgr``/``sacct``/``sshare``/``sinfo``/``scancel`` invocation is a
+fresh process that builds a :class:`SlurmEmulator` and parses the whole JSON
+state before running a single command. For scripted batches that load
+dominates. ``slurm-emulator-daemon`` keeps one emulator alive behind a Unix
+socket; when ``SLURM_EMULATOR_SOCKET`` points at it, the entry points forward
+their command there and fall back to running in-process if it is unreachable
+or serves different state files or partitions than the caller would use.
+
+The daemon rebuilds its emulator whenever the state or time file changed on
+disk since its last command, so writes made by the CLI, the REST planes or
+other processes are always seen. It also drops the emulator after a command
+that changed the in-memory state without saving it (``scancel``, for one),
+so such changes are lost exactly as they are when the command runs
+in-process.
+
+Protocol: one request per connection, each message a 4-byte big-endian length
+followed by a JSON object. Requests are ``{"cmd": str, "args": [str],
+"env": {...}}``, ``env`` being the client's :func:`client_env`; replies carry
+``output``, ``exit_code``, ``stdout_error`` and the captured
+``stdout``/``stderr``, plus ``system_exit`` or ``error`` when the command
+raised. A malformed request gets an ``error`` reply, and one whose ``env``
+differs from the daemon's a ``{"not_mine": true}`` reply.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import socket
+import struct
+import sys
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
+
+from emulator.api.slurmrestd.schemas import PARTITION_RANGES
+from emulator.core.database import state_file_path
+from emulator.core.time_engine import time_file_path
+
+if TYPE_CHECKING:
+    from emulator.commands.dispatcher import SlurmEmulator
+
+SOCKET_ENV = "SLURM_EMULATOR_SOCKET"
+
+_HEADER = struct.Struct("!I")
+
+# Key of the reply to a request made for other state files or partitions
+_NOT_MINE = "not_mine"
+
+# Seconds a client waits on the daemon before giving up on a command
+_TIMEOUT: float = 60.0
+# Seconds the daemon waits on a connected client; requests are tiny, and
+# while one client stalls every other one is queued behind it
+_CLIENT_TIMEOUT: float = 5.0
+
+
+def default_socket_path() -> Path:
+    """Socket path used by ``slurm-emulator-daemon`` when none is given."""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return Path(runtime_dir) / "slurm-emu.sock"
+
+
+def client_env() -> dict[str, Any]:
+    """State file, time file and partitions a command would use in this process.
+
+    The daemon only serves requests whose env matches its own, so a client
+    configured for other files never reads or writes the daemon's.
+    """
+    return {
+        "state_file": str(state_file_path().resolve()),
+        "time_file": str(time_file_path().resolve()),
+        "partitions": [[name, *nodes] for name, nodes in PARTITION_RANGES.items()],
+    }
+
+
+def _send(conn: socket.socket, message: dict[str, Any]) -> None:
+    data = json.dumps(message).encode()
+    conn.sendall(_HEADER.pack(len(data)) + data)
+
+
+def _recv_exact(conn: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = conn.recv(size)
+        if not chunk:
+            msg = "connection closed mid-message"
+            raise ConnectionError(msg)
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def _recv(conn: socket.socket) -> dict[str, Any]:
+    (size,) = _HEADER.unpack(_recv_exact(conn, _HEADER.size))
+    return json.loads(_recv_exact(conn, size))
+
+
+def _error_reply(error: str) -> dict[str, Any]:
+    """Reply for a request that could not be run."""
+    return {
+        "output": "",
+        "exit_code": 1,
+        "stdout_error": False,
+        "stdout": "",
+        "stderr": "",
+        "error": error,
+    }
+
+
+def _parse_request(message: object) -> Optional[tuple[str, list[str]]]:
+    """Return ``(cmd, args)`` from a request, or None when it is malformed."""
+    if not isinstance(message, dict):
+        return None
+    command_name = message.get("cmd")
+    args = message.get("args", [])
+    if not isinstance(command_name, str) or not isinstance(args, list):
+        return None
+    if not all(isinstance(arg, str) for arg in args):
+        return None
+    return command_name, args
+
+
+def run_command(emulator: SlurmEmulator, command_name: str, args: list[str]) -> dict[str, Any]:
+    """Run one command in-process and capture everything an entry point reports."""
+    out = io.StringIO()
+    err = io.StringIO()
+    reply: dict[str, Any] = {"output": ""}
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        try:
+            reply["output"] = emulator.execute_command(command_name, args)
+        except SystemExit as exc:
+            reply["system_exit"] = exc.code
+        except Exception as exc:
+            reply["error"] = str(exc)
+    handler = getattr(emulator, command_name, None)
+    reply["exit_code"] = getattr(handler, "exit_code", 0) or 0
+    reply["stdout_error"] = bool(getattr(handler, "stdout_error", False))
+    reply["stdout"] = out.getvalue()
+    reply["stderr"] = err.getvalue()
+    return reply
+
+
+def request(command_name: str, args: list[str]) -> Optional[dict[str, Any]]:
+    """Run a command on the daemon named by ``SLURM_EMULATOR_SOCKET``.
+
+    Returns None when no daemon is configured, it cannot be reached or it
+    serves another :func:`client_env`, so the caller can run the command
+    in-process instead. Once connected the command
+    may already have run, so a failure after that raises ConnectionError
+    rather than inviting a second, in-process run.
+    """
+    path = os.environ.get(SOCKET_ENV)
+    if not path:
+        return None
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.settimeout(_TIMEOUT)
+        try:
+            conn.connect(path)
+        except OSError:
+            return None
+        try:
+            _send(conn, {"cmd": command_name, "args": args, "env": client_env()})
+            reply = _recv(conn)
+        except (OSError, ValueError) as exc:
+            msg = f"command daemon at {path} failed: {exc}"
+            raise ConnectionError(msg) from exc
+    return None if reply.get(_NOT_MINE) else reply
+
+
+class CommandDaemon:
+    """Serves commands from one long-lived :class:`SlurmEmulator`."""
+
+    def __init__(self, socket_path: Path):
+        self.socket_path = socket_path
+        self._emulator: Optional[SlurmEmulator] = None
+        self._stamp: Optional[tuple[Optional[int], ...]] = None
+        # Database snapshot matching the state file as of _stamp
+        self._snapshot: Optional[dict[str, Any]] = None
+        self._server: Optional[socket.socket] = None
+        self._env = client_env()
+
+    def _state_stamp(self, emulator: SlurmEmulator) -> tuple[Optional[int], ...]:
+        stamps = []
+        for path in (emulator.database.state_file, emulator.time_engine.state_file):
+            try:
+                stamps.append(path.stat().st_mtime_ns)
+            except OSError:
+                stamps.append(None)
+        return tuple(stamps)
+
+    def emulator(self) -> SlurmEmulator:
+        """Return the emulator, rebuilt if the state changed on disk since last use."""
+        from emulator.commands.dispatcher import SlurmEmulator  # noqa: PLC0415
+
+        if self._emulator is None or self._state_stamp(self._emulator) != self._stamp:
+            self._emulator = SlurmEmulator()
+            self._stamp = self._state_stamp(self._emulator)
+            self._snapshot = self._emulator.database.state_snapshot()
+        return self._emulator
+
+    def _keep(self, emulator: SlurmEmulator) -> None:
+        """Keep ``emulator`` for the next request only while its state matches disk.
+
+        That holds when the command wrote nothing and changed nothing, or when
+        the only write was this emulator saving its current database state;
+        our own saves must not force a rebuild. Anything else drops it.
+        """
+        stamp = self._state_stamp(emulator)
+        snapshot = emulator.database.state_snapshot()
+        if stamp == self._stamp:
+            in_sync = snapshot == self._snapshot
+        else:
+            in_sync = (
+                self._stamp is not None
+                and stamp[1:] == self._stamp[1:]
+                and emulator.database.is_saved(snapshot)
+            )
+        if in_sync:
+            self._stamp = stamp
+            self._snapshot = snapshot
+        else:
+            self._emulator = None
+
+    def handle(self, conn: socket.socket) -> None:
+        """Answer a single request on an accepted connection."""
+        # A stalled client must not block the daemon for everyone else
+        conn.settimeout(_CLIENT_TIMEOUT)
+        try:
+            message = _recv(conn)
+        except (OSError, ValueError):
+            return
+        parsed = _parse_request(message)
+        if parsed is None:
+            reply = _error_reply("malformed request")
+        elif message.get("env") != self._env:
+            reply = {_NOT_MINE: True}
+        else:
+            emulator = self.emulator()
+            reply = run_command(emulator, *parsed)
+            self._keep(emulator)
+        with contextlib.suppress(OSError):
+            _send(conn, reply)
+
+    def serve_forever(self) -> None:
+        """Accept requests until :meth:`close` is called."""
+        self.socket_path.unlink(missing_ok=True)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Create the socket owner-only; a chmod after bind() would leave a window
+        umask = os.umask(0o177)
+        try:
+            server.bind(str(self.socket_path))
+        finally:
+            os.umask(umask)
+        server.listen()
+        self._server = server
+        try:
+            while True:
+                try:
+                    conn, _ = server.accept()
+                except OSError:
+                    break  # closed
+                with conn:
+                    self.handle(conn)
+        finally:
+            server.close()
+            self.socket_path.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        """Stop :meth:`serve_forever`."""
+        if self._server is not None:
+            with contextlib.suppress(OSError):
+                self._server.shutdown(socket.SHUT_RDWR)
+            self._server.close()
+
+
+def main() -> None:
+    """Console-script entry point for ``slurm-emulator-daemon [socket]``."""
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else default_socket_path()
+    print(f"slurm-emulator daemon listening on {path}")
+    print(f"export {SOCKET_ENV}={path}")
+    try:
+        CommandDaemon(path).serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except OSError as exc:
+        raise SystemExit(str(exc)) from exc
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,45 @@
 """Command dispatcher for SLURM emulator."""
 
+import os
 import sys
+import threading
 from pathlib import Path
-from typing import ClassVar, Optional
+from typing import Callable, ClassVar, Optional
 
 from emulator import __version__
 from emulator.api.slurmrestd.schemas import PARTITION_RANGES
+from emulator.commands import daemon
 from emulator.commands.sacct import SacctEmulator
 from emulator.commands.sacctmgr import SacctmgrEmulator
 from emulator.commands.sshare import SshareEmulator
 from emulator.core.database import SlurmDatabase
 from emulator.core.time_engine import TimeEngine
 
+# Job states scancel moves to CANCELLED
+_CANCELLABLE_STATES = frozenset({"RUNNING", "PENDING"})
+
+_VERSION = f"slurm-emulator {__version__}"
+
+
+def _format_sinfo() -> str:
+    """Render the sinfo partition table.
+
+    Derived from the same topology the REST emulation serves
+    (schemas.PARTITION_RANGES), so both views agree and honour
+    SLURM_EMULATOR_PARTITIONS.
+    """
+    lines = ["PARTITION AVAIL  TIMELIMIT  NODES  STATE NODELIST"]
+    for idx, (name, (first, last)) in enumerate(PARTITION_RANGES.items()):
+        count = last - first + 1
+        nodelist = f"node[{first:03d}-{last:03d}]" if count > 1 else f"node{first:03d}"
+        partition = f"{name}*" if idx == 0 else name
+        lines.append(f"{partition:12} up   infinite  {count:5}   idle {nodelist}")
+    return "\n".join(lines)
+
+
+# PARTITION_RANGES is fixed at import time, and so is the table
+_SINFO_OUTPUT = _format_sinfo()
+
 
 class SlurmEmulator:
     """Main SLURM emulator class."""
@@ -23,30 +51,48 @@ class SlurmEmulator:
         self.sacct = SacctEmulator(self.database, self.time_engine)
         self.sshare = SshareEmulator(self.database, self.time_engine)
 
+        # Command name -> handler taking the argument list
+        self._handlers: dict[str, Callable[[list[str]], str]] = {
+            "sacctmgr": self.sacctmgr.handle_command,
+            "sacct": self.sacct.handle_command,
+            "sshare": self.sshare.handle_command,
+            "sinfo": self._handle_sinfo,
+            "scancel": self._handle_scancel,
+            "id": self._handle_id,
+        }
+
         # Load existing state
         self.database.load_state()
 
     # Flags that are only valid for specific commands
-    _VALID_FLAGS: ClassVar[dict[str, set[str]]] = {
-        "sacctmgr": {"--parsable", "--parsable2", "--noheader", "--immediate"},
-        "sacct": {"--parsable", "--parsable2", "--noheader"},
-        "sshare": {"--parsable", "--parsable2", "--noheader"},
-        "scancel": set(),
-        "id": set(),
-        "sinfo": {"-V"},
+    _VALID_FLAGS: ClassVar[dict[str, frozenset[str]]] = {
+        "sacctmgr": frozenset({"--parsable", "--parsable2", "--noheader", "--immediate"}),
+        "sacct": frozenset({"--parsable", "--parsable2", "--noheader"}),
+        "sshare": frozenset({"--parsable", "--parsable2", "--noheader"}),
+        "scancel": frozenset(),
+        "id": frozenset(),
+        "sinfo": frozenset({"-V"}),
     }
 
     # The set of SLURM formatting/control flags that we validate
     _SLURM_FLAGS = frozenset({"--parsable", "--parsable2", "--noheader", "--immediate"})
 
-    def validate_flags(self, command_name: str, args: list[str]) -> None:
+    # Per command, the SLURM flags it rejects; unknown commands reject them all.
+    # (A comprehension here could not see _SLURM_FLAGS from the class body.)
+    _REJECTED_FLAGS: ClassVar[dict[str, frozenset[str]]] = dict(
+        zip(_VALID_FLAGS, map(_SLURM_FLAGS.difference, _VALID_FLAGS.values()))
+    )
+
+    @classmethod
+    def validate_flags(cls, command_name: str, args: list[str]) -> None:
         """Validate flags for the given command.
 
         Raises SystemExit for flags not supported by the command, matching
-        real SLURM behavior.
+        real SLURM behavior. Needs no instance, so the entry points can
+        validate before loading any state.
         """
-        valid = self._VALID_FLAGS.get(command_name, set())
-        invalid = [a for a in args if a in self._SLURM_FLAGS and a not in valid]
+        rejected = cls._REJECTED_FLAGS.get(command_name, cls._SLURM_FLAGS)
+        invalid = [a for a in args if a in rejected]
         if invalid:
             raise SystemExit(f"{command_name}: error: unrecognized arguments: {' '.join(invalid)}")
 
@@ -88,39 +134,20 @@ class SlurmEmulator:
         pure record filter (a nonexistent cluster just matches nothing,
         exit 0), and sshare validates the list itself.
         """
+        handler = self._handlers.get(command_name)
+        if handler is None:
+            return f"slurm-emulator: Unknown command: {command_name}"
         saved_cluster = self.database.current_cluster
         try:
-            if command_name == "sacctmgr":
-                return self.sacctmgr.handle_command(args)
-            if command_name == "sacct":
-                return self.sacct.handle_command(args)
-            if command_name == "sshare":
-                return self.sshare.handle_command(args)
-            if command_name == "sinfo":
-                return self._handle_sinfo(args)
-            if command_name == "scancel":
-                return self._handle_scancel(args)
-            if command_name == "id":
-                return self._handle_id(args)
-            return f"slurm-emulator: Unknown command: {command_name}"
+            return handler(args)
         finally:
             self.database.current_cluster = saved_cluster
 
     def _handle_sinfo(self, args: list[str]) -> str:
         """Handle sinfo command."""
         if args and args[0] == "-V":
-            return f"slurm-emulator {__version__}"
-
-        # Derive from the same topology the REST emulation serves
-        # (schemas.PARTITION_RANGES), so both views agree and honour
-        # SLURM_EMULATOR_PARTITIONS.
-        lines = ["PARTITION AVAIL  TIMELIMIT  NODES  STATE NODELIST"]
-        for idx, (name, (first, last)) in enumerate(PARTITION_RANGES.items()):
-            count = last - first + 1
-            nodelist = f"node[{first:03d}-{last:03d}]" if count > 1 else f"node{first:03d}"
-            partition = f"{name}*" if idx == 0 else name
-            lines.append(f"{partition:12} up   infinite  {count:5}   idle {nodelist}")
-        return "\n".join(lines)
+            return _VERSION
+        return _SINFO_OUTPUT
 
     def _handle_scancel(self, args: list[str]) -> str:
         """Handle scancel command."""
@@ -130,10 +157,11 @@ class SlurmEmulator:
         force = False
 
         for arg in args:
-            if arg.startswith("-A="):
-                account = arg.split("=", 1)[1]
-            elif arg.startswith("-u="):
-                user = arg.split("=", 1)[1]
+            option, sep, value = arg.partition("=")
+            if sep and option == "-A":
+                account = value
+            elif sep and option == "-u":
+                user = value
             elif arg == "-f":
                 force = True
 
@@ -141,7 +169,7 @@ class SlurmEmulator:
             jobs_cancelled = 0
             jobs = self.database.list_jobs(account=account, user=user)
             for job in jobs:
-                if job.state in ["RUNNING", "PENDING"]:
+                if job.state in _CANCELLABLE_STATES:
                     job.state = "CANCELLED"
                     jobs_cancelled += 1
 
@@ -171,33 +199,74 @@ class SlurmEmulator:
 
 # Global emulator instance
 _emulator = None
+_emulator_lock = threading.Lock()
 
 
 def get_emulator():
     """Get global emulator instance."""
     global _emulator
     if _emulator is None:
-        _emulator = SlurmEmulator()
+        with _emulator_lock:
+            # Re-check: another thread may have built it while we waited
+            if _emulator is None:
+                _emulator = SlurmEmulator()
     return _emulator
 
 
+def _print_version(args: list[str]) -> bool:
+    """Answer a bare ``-V`` without building the emulator.
+
+    Every command prints the same version line, so ``sacctmgr -V`` and
+    friends need neither the daemon nor the state files loaded.
+    """
+    if args != ["-V"]:
+        return False
+    print(_VERSION)
+    return True
+
+
+def _execute(command_name: str, args: list[str]) -> tuple[str, int, bool]:
+    """Run a command on the daemon when one is configured, else in-process.
+
+    Returns ``(output, exit_code, stdout_error)``. Output the daemon captured
+    on stdout/stderr is replayed, and its SystemExit or error re-raised, so
+    callers behave the same either way.
+    """
+    reply = daemon.request(command_name, args)
+    if reply is None:
+        emulator = get_emulator()
+        output = emulator.execute_command(command_name, args)
+        handler = getattr(emulator, command_name, None)
+        exit_code = getattr(handler, "exit_code", 0) or 0
+        return output, exit_code, bool(getattr(handler, "stdout_error", False))
+
+    sys.stdout.write(reply["stdout"])
+    sys.stderr.write(reply["stderr"])
+    if "system_exit" in reply:
+        raise SystemExit(reply["system_exit"])
+    if "error" in reply:
+        raise RuntimeError(reply["error"])
+    return reply["output"], reply["exit_code"], reply["stdout_error"]
+
+
 def sacctmgr_main():
     """Entry point for sacctmgr command."""
-    emulator = get_emulator()
     args = sys.argv[1:]
 
     # sacctmgr honours --parsable/--parsable2/--noheader/--immediate
     # internally (real-sacctmgr parity), so nothing is stripped here.
-    emulator.validate_flags("sacctmgr", args)
+    SlurmEmulator.validate_flags("sacctmgr", args)
+    if _print_version(args):
+        return
 
     try:
-        output = emulator.execute_command("sacctmgr", args)
+        output, exit_code, stdout_error = _execute("sacctmgr", args)
         # Real sacctmgr writes errors to stderr (" error: ..." style)
         # and normal output to stdout; the emulator returns a single
         # message per command, so route by the recorded exit code —
         # except "Nothing modified", which real sacctmgr prints with
         # printf (stdout) while still exiting 1.
-        failing = emulator.sacctmgr.exit_code and not emulator.sacctmgr.stdout_error
+        failing = exit_code and not stdout_error
         stream = sys.stderr if failing else sys.stdout
         if output:
             print(output, file=stream)
@@ -209,42 +278,49 @@ def sacctmgr_main():
     # Propagate the command's exit status (mirrors sacctmgr.c's global
     # exit_code, which _modify_it() sets on any modify error including
     # "Nothing modified").
-    sys.exit(emulator.sacctmgr.exit_code)
+    sys.exit(exit_code)
 
 
 def sacct_main():
     """Entry point for sacct command."""
-    emulator = get_emulator()
     args = sys.argv[1:]
 
     # Validate flags (--immediate is NOT valid for sacct)
     try:
-        emulator.validate_flags("sacct", args)
+        SlurmEmulator.validate_flags("sacct", args)
     except SystemExit as e:
         print(str(e), file=sys.stderr)
         sys.exit(1)
+    if _print_version(args):
+        return
 
     # sacct honours --parsable/--parsable2/--noheader and -M internally
     # (real-sacct parity), so nothing is stripped here.
     try:
-        output = emulator.execute_command("sacct", args)
-        if output:
-            print(output)
+        if os.environ.get(daemon.SOCKET_ENV):
+            output, exit_code, _ = _execute("sacct", args)
+            if output:
+                print(output)
+        else:
+            # In-process: write rows as they render instead of building
+            # the whole table string first.
+            sacct = get_emulator().sacct
+            sacct.handle_command_stream(args, sys.stdout)
+            exit_code = sacct.exit_code
     except SystemExit:
         raise
     except Exception as e:
         print(f"sacct: error: {e}", file=sys.stderr)
         sys.exit(1)
-    sys.exit(emulator.sacct.exit_code)
+    sys.exit(exit_code)
 
 
 def sshare_main():
     """Entry point for sshare command."""
-    emulator = get_emulator()
     args = sys.argv[1:]
 
     try:
-        emulator.validate_flags("sshare", args)
+        SlurmEmulator.validate_flags("sshare", args)
     except SystemExit as e:
         print(str(e), file=sys.stderr)
         sys.exit(1)
@@ -252,7 +328,7 @@ def sshare_main():
     # sshare honours --parsable2/--noheader internally (real-sshare
     # parity), so we do NOT strip them before dispatch.
     try:
-        output = emulator.execute_command("sshare", args)
+        output, exit_code, _ = _execute("sshare", args)
         if output:
             print(output)
     except SystemExit:
@@ -260,16 +336,17 @@ def sshare_main():
     except Exception as e:
         print(f"sshare: error: {e}", file=sys.stderr)
         sys.exit(1)
-    sys.exit(emulator.sshare.exit_code)
+    sys.exit(exit_code)
 
 
 def sinfo_main():
     """Entry point for sinfo command."""
-    emulator = get_emulator()
     args = sys.argv[1:]
+    if _print_version(args):
+        return
 
     try:
-        output = emulator.execute_command("sinfo", args)
+        output, _, _ = _execute("sinfo", args)
         print(output)
     except Exception as e:
         print(f"sinfo: error: {e}", file=sys.stderr)
@@ -278,18 +355,17 @@ def sinfo_main():
 
 def scancel_main():
     """Entry point for scancel command."""
-    emulator = get_emulator()
     args = sys.argv[1:]
 
     # Validate flags (--immediate, --parsable2, --noheader are NOT valid for scancel)
     try:
-        emulator.validate_flags("scancel", args)
+        SlurmEmulator.validate_flags("scancel", args)
     except SystemExit as e:
         print(str(e), file=sys.stderr)
         sys.exit(1)
 
     try:
-        output = emulator.execute_command("scancel", args)
+        output, _, _ = _execute("scancel", args)
         print(output)
     except Exception as e:
         print(f"scancel: error: {e}", file=sys.stderr)
@@ -22,9 +22,9 @@ format tokens override the width (a signed ``W`` also flips alignment).
 
 from __future__ import annotations
 
-from collections.abc import Sequence
+from collections.abc import Iterable, Iterator, Sequence
 from dataclasses import dataclass, replace
-from typing import Optional, Union
+from typing import Callable, Optional, Union
 
 
 @dataclass(frozen=True)
@@ -133,16 +133,38 @@ def render_header(fields: list[FieldSpec], mode: OutputMode) -> list[str]:
 
 
 def render_row(cells: list[str], fields: list[FieldSpec], mode: OutputMode) -> str:
+    return row_formatter(fields, mode)(cells)
+
+
+def row_formatter(fields: list[FieldSpec], mode: OutputMode) -> Callable[[Sequence[str]], str]:
+    """Return a ``cells -> line`` renderer equivalent to :func:`render_row`.
+
+    Mode and per-column width/alignment/truncation are resolved once, so
+    table loops pay only the per-cell work.
+    """
     if mode.parsable is not None:
-        line = "|".join(cells)
-        return line + "|" if mode.parsable == "p" else line
-    return "".join(_pad(_clip(cell, f), f) for cell, f in zip(cells, fields))
+        join = "|".join
+        if mode.parsable == "p":
+            return lambda cells: join(cells) + "|"
+        return join
+    pads = [_cell_padder(f) for f in fields]
+    return lambda cells: "".join([pad(cell) for pad, cell in zip(pads, cells)])
+
 
+def _cell_padder(f: FieldSpec) -> Callable[[str], str]:
+    """Pad one cell to ``f``'s width, clipping long strings to ``value[:w-1]+"+"``."""
+    width = f.abs_width
+    justify = str.rjust if f.right_align else str.ljust
+    if not f.truncate:
+        return lambda value: justify(value, width) + " "
+    keep = width - 1
 
-def _clip(value: str, f: FieldSpec) -> str:
-    if f.truncate and len(value) > f.abs_width:
-        return value[: f.abs_width - 1] + "+"
-    return value
+    def pad(value: str) -> str:
+        if len(value) > width:
+            value = value[:keep] + "+"
+        return justify(value, width) + " "
+
+    return pad
 
 
 def _pad(value: str, f: FieldSpec) -> str:
@@ -153,21 +175,23 @@ def _pad(value: str, f: FieldSpec) -> str:
 Row = Union[dict[str, str], list[str]]
 
 
-def render_table(fields: list[FieldSpec], rows: Sequence[Row], mode: OutputMode) -> str:
+def render_table(fields: list[FieldSpec], rows: Iterable[Row], mode: OutputMode) -> str:
     """Render header + rows.
 
     Dict rows are keyed by the *display* name (so alias specs like
     ``Acct`` share the ``Account`` column); missing keys render blank
     (real Slurm's NO_VAL columns).
     """
-    lines = render_header(fields, mode)
+    return "\n".join(iter_table(fields, rows, mode))
+
+
+def iter_table(fields: list[FieldSpec], rows: Iterable[Row], mode: OutputMode) -> Iterator[str]:
+    """Yield the lines :func:`render_table` joins, rendering rows lazily."""
+    yield from render_header(fields, mode)
+    render = row_formatter(fields, mode)
+    names = [f.display_name for f in fields]
     for row in rows:
-        if isinstance(row, dict):
-            cells = [row.get(f.display_name, "") for f in fields]
-        else:
-            cells = list(row)
-        lines.append(render_row(cells, fields, mode))
-    return "\n".join(lines)
+        yield render([row.get(name, "") for name in names] if isinstance(row, dict) else row)
 
 
 def extract_output_flags(
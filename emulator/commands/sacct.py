@@ -27,19 +27,23 @@ emulator has no job steps, and real ``-X`` only filters step rows);
 (``node001``, partition ``compute``, matching the sinfo emulator).
 """
 
+import functools
+import itertools
 import re
 import sys
+from collections.abc import Iterator
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional, TextIO
 
 from emulator import __version__
 from emulator.commands.print_fields import (
     FieldSpec,
     OutputMode,
     UnknownFieldError,
+    iter_table,
     parse_format_spec,
-    render_table,
+    render_header,
     resolve_format,
 )
 from emulator.core.database import SlurmDatabase, UsageRecord
@@ -84,10 +88,170 @@ _NODE_GPUS = 4
 _FAILED_STATES = ("FAILED", "OUT_OF_MEMORY", "TIMEOUT")
 
 
+@functools.lru_cache(maxsize=256)
+def _secs2time_str(secs: int) -> str:
+    """Port of secs2time_str (src/common/parse_time.c:849-874).
+
+    Memoized: simulated jobs reuse a small set of durations, so most
+    Elapsed cells are a cache hit instead of three divmods and a format.
+    """
+    if secs < 0:
+        return "INVALID"
+    days, rem = divmod(secs, 86400)
+    hours, rem = divmod(rem, 3600)
+    minutes, seconds = divmod(rem, 60)
+    if days:
+        return f"{days}-{hours:02d}:{minutes:02d}:{seconds:02d}"
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+def _rate(record: UsageRecord, key: str, default: int) -> int:
+    """Per-hour TRES rate: raw_tres values are <count>-hours totals."""
+    value = record.raw_tres.get(key)
+    if value is None or record.node_hours <= 0:
+        return default
+    return round(value / record.node_hours)
+
+
+def _cpu_rate(record: UsageRecord) -> int:
+    return _rate(record, "CPU", _NODE_CPUS)
+
+
+def _tres_rates(record: UsageRecord) -> tuple[int, int, int]:
+    """Per-hour ``(cpus, mem_gb, gpus)`` rates of a record, as :func:`_rate`.
+
+    Only the CPU, Mem and GRES/gpu raw_tres keys are read (other keys, such
+    as those on REST-created records, are ignored), so the three lookups are
+    spelled out and the node-hours guard runs once.
+    """
+    hours = record.node_hours
+    if hours <= 0:
+        return _NODE_CPUS, _NODE_MEM_GB, _NODE_GPUS
+    raw_tres = record.raw_tres
+    cpus = raw_tres.get("CPU")
+    mem = raw_tres.get("Mem")
+    gpus = raw_tres.get("GRES/gpu")
+    return (
+        _NODE_CPUS if cpus is None else round(cpus / hours),
+        _NODE_MEM_GB if mem is None else round(mem / hours),
+        _NODE_GPUS if gpus is None else round(gpus / hours),
+    )
+
+
+def _tres_string(record: UsageRecord, noconvert: bool) -> str:
+    """Standard Slurm TRES string in TRES-id order.
+
+    cpu=1, mem=2, node=4, billing=5, gres/* after — matching
+    slurmdb_make_tres_string_from_simple. The emulator-internal
+    ``node-hours`` raw_tres key is intentionally not exposed.
+    """
+    cpus, mem_gb, gpus = _tres_rates(record)
+    mem = f"{mem_gb * 1024}M" if noconvert else f"{mem_gb}G"
+    tres = f"cpu={cpus},mem={mem},node=1,billing={cpus}"
+    return f"{tres},gres/gpu={gpus}" if gpus else tres
+
+
+def _elapsed_secs(record: UsageRecord) -> int:
+    return int(record.node_hours * 3600)
+
+
+def _start_str(record: UsageRecord, _noconvert: bool) -> str:
+    """Start (and Submit: jobs never queue here) = End minus Elapsed."""
+    start = record.timestamp - timedelta(seconds=_elapsed_secs(record))
+    return start.isoformat(timespec="seconds")
+
+
+def _state(record: UsageRecord, _noconvert: bool) -> str:
+    return record.state or "COMPLETED"
+
+
+def _job_id(record: UsageRecord, _noconvert: bool) -> str:
+    return str(record.job_id)
+
+
+# Field name -> cell renderer taking (record, noconvert). One row per usage
+# record; only the renderers of the requested fields run.
+_CELLS: dict[str, Callable[[UsageRecord, bool], str]] = {
+    "Account": lambda r, _nc: r.account,
+    "AllocCPUS": lambda r, _nc: str(_cpu_rate(r)),
+    "AllocNodes": lambda _r, _nc: "1",
+    "AllocTRES": _tres_string,
+    "Cluster": lambda r, _nc: r.cluster,
+    "Elapsed": lambda r, _nc: _secs2time_str(_elapsed_secs(r)),
+    "ElapsedRaw": lambda r, _nc: str(_elapsed_secs(r)),
+    "End": lambda r, _nc: r.timestamp.isoformat(timespec="seconds"),
+    "ExitCode": lambda r, nc: "1:0" if _state(r, nc).startswith(_FAILED_STATES) else "0:0",
+    "JobID": _job_id,
+    "JobIDRaw": _job_id,
+    "JobName": lambda r, _nc: f"job_{r.job_id}",
+    "NNodes": lambda _r, _nc: "1",
+    "NodeList": lambda _r, _nc: "node001",
+    "Partition": lambda _r, _nc: "compute",
+    "ReqTRES": _tres_string,
+    "Start": _start_str,
+    "State": _state,
+    "Submit": _start_str,
+    "Timelimit": lambda _r, _nc: "UNLIMITED",
+    "User": lambda r, _nc: r.user,
+}
+
+
+# The format waldur-site-agent polls with (always with --parsable2); it gets
+# a hand-written row builder instead of the per-cell renderer loop.
+_SITE_AGENT_FORMAT = "Account,ReqTRES,Elapsed,User"
+
+
+def _site_agent_rows(records: list[UsageRecord], noconvert: bool) -> Iterator[str]:
+    """``-P`` rows for :data:`_SITE_AGENT_FORMAT`, same bytes as the general path."""
+    for r in records:
+        elapsed = _secs2time_str(_elapsed_secs(r))
+        yield f"{r.account}|{_tres_string(r, noconvert)}|{elapsed}|{r.user}"
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_format(
+    format_spec: str,
+) -> tuple[tuple[FieldSpec, ...], tuple[Callable[[UsageRecord, bool], str], ...]]:
+    """Resolve a ``--format`` string to its fields and their cell renderers.
+
+    Callers (site agents, scripts) repeat the same handful of format
+    strings, so the parse and prefix resolution run once per string.
+    Raises :class:`UnknownFieldError` (uncached) for an unknown field.
+    """
+    fields = tuple(resolve_format(parse_format_spec(format_spec), _REGISTRY))
+    return fields, tuple(_CELLS[f.name] for f in fields)
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_absolute_time(text: str) -> datetime:
+    """Parse an ISO date/datetime spec; raises ValueError on bad input.
+
+    Independent of the simulated clock, so site agents re-sending the same
+    ``-S``/``-E`` bounds on every poll parse them once. Failures are not
+    cached.
+
+    ``fromisoformat`` covers the common zero-padded forms (``T`` or space
+    separated, or a bare date); ``strptime`` only runs for unpadded dates
+    like ``2024-5-1``. The simulated clock is naive, so an explicit UTC
+    offset is rejected rather than failing later in a comparison.
+    """
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        try:
+            parsed = datetime.strptime(text, "%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            parsed = datetime.strptime(text, "%Y-%m-%d")
+    if parsed.tzinfo is not None:
+        raise ValueError(text)
+    return parsed
+
+
 @dataclass
 class _Config:
-    accounts: list[str] = field(default_factory=list)
-    users: list[str] = field(default_factory=list)
+    # Sets: only ever used for membership tests against every record
+    accounts: set[str] = field(default_factory=set)
+    users: set[str] = field(default_factory=set)
     clusters: list[str] = field(default_factory=list)
     jobs: list[str] = field(default_factory=list)
     start_time: Optional[datetime] = None
@@ -98,6 +262,53 @@ class _Config:
     version: bool = False
 
 
+def _csv(value: str) -> list[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _set_jobs(cfg: _Config, value: str, _parse_time: Callable[[str], datetime]) -> None:
+    # sacct -j accepts "id" or "id.step"; keep the job id part.
+    cfg.jobs.extend(item.split(".", 1)[0] for item in _csv(value))
+
+
+_ValueHandler = Callable[[_Config, str, Callable[[str], datetime]], None]
+
+# Option name -> handler(config, value, parse_time). Built once at import
+# so each argument costs one dict lookup.
+_VALUE_OPTS: dict[str, _ValueHandler] = {
+    **dict.fromkeys(
+        ("-S", "--starttime"), lambda cfg, v, parse: setattr(cfg, "start_time", parse(v))
+    ),
+    **dict.fromkeys(("-E", "--endtime"), lambda cfg, v, parse: setattr(cfg, "end_time", parse(v))),
+    **dict.fromkeys(
+        ("-A", "--accounts", "--account"), lambda cfg, v, _p: cfg.accounts.update(_csv(v))
+    ),
+    **dict.fromkeys(
+        ("-u", "--user", "--users", "--uid"), lambda cfg, v, _p: cfg.users.update(_csv(v))
+    ),
+    **dict.fromkeys(
+        ("-M", "--cluster", "--clusters"), lambda cfg, v, _p: cfg.clusters.extend(_csv(v))
+    ),
+    **dict.fromkeys(("-j", "--jobs", "--job"), _set_jobs),
+    **dict.fromkeys(
+        ("-o", "--format", "--fields"), lambda cfg, v, _p: setattr(cfg, "format_spec", v)
+    ),
+}
+
+# Flag name -> setter applied to the config.
+_FLAG_OPTS: dict[str, Callable[[_Config], None]] = {
+    **dict.fromkeys(("-V", "--version"), lambda cfg: setattr(cfg, "version", True)),
+    **dict.fromkeys(("-n", "--noheader"), lambda cfg: setattr(cfg.mode, "noheader", True)),
+    **dict.fromkeys(("-p", "--parsable"), lambda cfg: setattr(cfg.mode, "parsable", "p")),
+    **dict.fromkeys(("-P", "--parsable2"), lambda cfg: setattr(cfg.mode, "parsable", "P")),
+    "--noconvert": lambda cfg: setattr(cfg, "noconvert", True),
+    **dict.fromkeys(
+        ("-X", "--allocations", "-a", "--allusers", "--truncate", "-b", "--brief"),
+        lambda _cfg: None,
+    ),
+}
+
+
 class SacctEmulator:
     """Emulates sacct commands for usage reporting."""
 
@@ -109,14 +320,29 @@ class SacctEmulator:
 
     def handle_command(self, args: list[str]) -> str:
         """Process sacct command and return output."""
+        return "\n".join(self._output_lines(args))
+
+    def handle_command_stream(self, args: list[str], out: TextIO) -> None:
+        """Process sacct command, writing each output line to ``out`` as it renders.
+
+        Same output as :meth:`handle_command` followed by a newline (nothing
+        when there are no lines), without holding the whole table in memory.
+        """
+        write = out.write
+        for line in self._output_lines(args):
+            write(line)
+            write("\n")
+
+    def _output_lines(self, args: list[str]) -> Iterator[str]:
+        """Parse and filter eagerly (errors exit here); render rows lazily."""
         self.exit_code = 0
         config = self._parse_args(args)
 
         if config.version:
-            return f"slurm-emulator {__version__}"
+            return iter((f"slurm-emulator {__version__}",))
 
         try:
-            fields = resolve_format(parse_format_spec(config.format_spec), _REGISTRY)
+            fields, cells = _compile_format(config.format_spec)
         except UnknownFieldError as e:
             # options.c:1215-1216 via error(): "sacct: error: ..." on stderr.
             print(f'sacct: error: Invalid field requested: "{e.token}"', file=sys.stderr)
@@ -124,108 +350,45 @@ class SacctEmulator:
             raise SystemExit(1) from None
 
         records = self._get_filtered_records(config)
-        rows = [self._row(record, config) for record in records]
-        return render_table(fields, rows, config.mode)
+        noconvert = config.noconvert
+        if config.format_spec == _SITE_AGENT_FORMAT and config.mode.parsable == "P":
+            return itertools.chain(
+                render_header(list(fields), config.mode), _site_agent_rows(records, noconvert)
+            )
+        rows = ([cell(record, noconvert) for cell in cells] for record in records)
+        return iter_table(list(fields), rows, config.mode)
 
     def _parse_args(self, args: list[str]) -> _Config:
         """Parse sacct command line arguments (short and long forms)."""
         cfg = _Config()
-
-        def _csv(value: str) -> list[str]:
-            return [item.strip() for item in value.split(",") if item.strip()]
-
-        # (short, long names, attribute or handler key)
-        value_opts = {
-            "-S": "start",
-            "--starttime": "start",
-            "-E": "end",
-            "--endtime": "end",
-            "-A": "accounts",
-            "--accounts": "accounts",
-            "--account": "accounts",
-            "-u": "users",
-            "--user": "users",
-            "--users": "users",
-            "--uid": "users",
-            "-M": "clusters",
-            "--cluster": "clusters",
-            "--clusters": "clusters",
-            "-j": "jobs",
-            "--jobs": "jobs",
-            "--job": "jobs",
-            "-o": "format",
-            "--format": "format",
-            "--fields": "format",
-        }
-        flag_opts = {
-            "-V": "version",
-            "--version": "version",
-            "-n": "noheader",
-            "--noheader": "noheader",
-            "-p": "parsable",
-            "--parsable": "parsable",
-            "-P": "parsable2",
-            "--parsable2": "parsable2",
-            "-X": "noop",
-            "--allocations": "noop",
-            "-a": "noop",
-            "--allusers": "noop",
-            "--noconvert": "noconvert",
-            "--truncate": "noop",
-            "-b": "noop",
-            "--brief": "noop",
-        }
-
-        def _apply(key: str, value: str) -> None:
-            if key == "start":
-                cfg.start_time = self._parse_time(value)
-            elif key == "end":
-                cfg.end_time = self._parse_time(value)
-            elif key == "accounts":
-                cfg.accounts.extend(_csv(value))
-            elif key == "users":
-                cfg.users.extend(_csv(value))
-            elif key == "clusters":
-                cfg.clusters.extend(_csv(value))
-            elif key == "jobs":
-                # sacct -j accepts "id" or "id.step"; keep the job id part.
-                cfg.jobs.extend(item.split(".", 1)[0] for item in _csv(value))
-            elif key == "format":
-                cfg.format_spec = value
-
+        parse_time = self._parse_time
         i = 0
         while i < len(args):
             arg = args[i]
-            if arg in flag_opts:
-                action = flag_opts[arg]
-                if action == "version":
-                    cfg.version = True
-                elif action == "noheader":
-                    cfg.mode.noheader = True
-                elif action == "parsable":
-                    cfg.mode.parsable = "p"
-                elif action == "parsable2":
-                    cfg.mode.parsable = "P"
-                elif action == "noconvert":
-                    cfg.noconvert = True
+            flag = _FLAG_OPTS.get(arg)
+            if flag is not None:
+                flag(cfg)
                 i += 1
                 continue
-            if "=" in arg and arg.split("=", 1)[0] in value_opts:
-                name, value = arg.split("=", 1)
-                _apply(value_opts[name], value)
+            option, sep, value = arg.partition("=")
+            handler = _VALUE_OPTS.get(option)
+            if sep and handler is not None:
+                handler(cfg, value, parse_time)
                 i += 1
                 continue
-            if arg in value_opts:
+            handler = _VALUE_OPTS.get(arg)
+            if handler is not None:
                 if i + 1 >= len(args):
                     print(f"sacct: error: missing argument for {arg}", file=sys.stderr)
                     self.exit_code = 1
                     raise SystemExit(1)
-                _apply(value_opts[arg], args[i + 1])
+                handler(cfg, args[i + 1], parse_time)
                 i += 2
                 continue
             # Attached short-option value, e.g. -S2024-01-01.
-            if len(arg) > 2 and arg[:2] in value_opts and arg[1] != "-":
-                _apply(value_opts[arg[:2]], arg[2:])
+            handler = _VALUE_OPTS.get(arg[:2])
+            if len(arg) > 2 and handler is not None and arg[1] != "-":
+                handler(cfg, arg[2:], parse_time)
                 i += 1
                 continue
             print(f"sacct: error: unrecognized arguments: {arg}", file=sys.stderr)
@@ -252,10 +415,13 @@ class SacctEmulator:
 
     def _parse_time_inner(self, time_str: str) -> datetime:
         """Parse one time spec; raises ValueError on anything bogus."""
-        now = self.time_engine.get_current_time()
         text = time_str.strip()
-        lowered = text.lower()
+        # Absolute dates are what scripts and site agents send; try them first.
+        if text[:1].isdigit() and ("T" in text or "-" in text):
+            return _parse_absolute_time(text)
 
+        now = self.time_engine.get_current_time()
+        lowered = text.lower()
         if lowered in {"today", "midnight"}:
             return now.replace(hour=0, minute=0, second=0, microsecond=0)
         if lowered.startswith("now"):
@@ -280,13 +446,6 @@ class SacctEmulator:
                 if name.startswith(unit) and (name or not unit):
                     return now + timedelta(seconds=sign * count * secs)
             raise ValueError(unit)
-        if "T" in text:
-            return datetime.fromisoformat(text)
-        if "-" in text:
-            try:
-                return datetime.strptime(text, "%Y-%m-%d %H:%M:%S")
-            except ValueError:
-                return datetime.strptime(text, "%Y-%m-%d")
         if ":" in text:
             parts = [int(p) for p in text.split(":")]
             hour, minute = parts[0], parts[1]
@@ -297,103 +456,29 @@ class SacctEmulator:
     def _get_filtered_records(self, config: _Config) -> list[UsageRecord]:
         """Get usage records based on filters."""
         self.database.ensure_job_ids()
-        records = list(self.database.usage_records)
 
         # Filter by clusters (use current_cluster if not specified). A
         # nonexistent cluster simply matches no records — real sacct
         # treats -M as a pure filter and exits 0.
-        if config.clusters:
-            records = [r for r in records if r.cluster in config.clusters]
-        else:
-            records = [r for r in records if r.cluster == self.database.current_cluster]
-
-        if config.accounts:
-            records = [r for r in records if r.account in config.accounts]
-        if config.users:
-            records = [r for r in records if r.user in config.users]
-        if config.jobs:
-            records = [r for r in records if str(r.job_id) in config.jobs]
+        clusters = set(config.clusters or (self.database.current_cluster,))
+        accounts = config.accounts or None
+        users = config.users or None
+        # Job ids are numeric; a non-numeric -j value matches nothing
+        job_ids = {int(j) for j in config.jobs if j.isdigit()} if config.jobs else None
 
         # Explicit job ids bypass the default time window — real sacct
         # returns the job regardless of when it ran unless -S/-E are given.
         if config.jobs and not (config.start_time or config.end_time):
-            return records
-
-        # Default window: Midnight -> Now on the simulated clock
-        # (slurmdb_job_cond_def_start_end, slurmdb_defs.c:371-394).
-        now = self.time_engine.get_current_time()
-        start = config.start_time or now.replace(hour=0, minute=0, second=0, microsecond=0)
-        end = config.end_time or now
-        return [r for r in records if start <= r.timestamp <= end]
-
-    def _row(self, record: UsageRecord, config: _Config) -> dict[str, str]:
-        elapsed_secs = int(record.node_hours * 3600)
-        end = record.timestamp
-        start = end - timedelta(seconds=elapsed_secs)
-        state = record.state or "COMPLETED"
-        exit_code = "1:0" if state.startswith(_FAILED_STATES) else "0:0"
-        tres = self._tres_string(record, config.noconvert)
-        job_id = str(record.job_id)
-
-        return {
-            "JobID": job_id,
-            "JobIDRaw": job_id,
-            "JobName": f"job_{record.job_id}",
-            "Partition": "compute",
-            "Account": record.account,
-            "AllocCPUS": str(self._cpu_rate(record)),
-            "AllocNodes": "1",
-            "AllocTRES": tres,
-            "Cluster": record.cluster,
-            "Elapsed": _secs2time_str(elapsed_secs),
-            "ElapsedRaw": str(elapsed_secs),
-            "End": end.strftime("%Y-%m-%dT%H:%M:%S"),
-            "ExitCode": exit_code,
-            "NNodes": "1",
-            "NodeList": "node001",
-            "ReqTRES": tres,
-            "Start": start.strftime("%Y-%m-%dT%H:%M:%S"),
-            "State": state,
-            "Submit": start.strftime("%Y-%m-%dT%H:%M:%S"),
-            "Timelimit": "UNLIMITED",
-            "User": record.user,
-        }
-
-    def _cpu_rate(self, record: UsageRecord) -> int:
-        return self._rate(record, "CPU", _NODE_CPUS)
-
-    @staticmethod
-    def _rate(record: UsageRecord, key: str, default: int) -> int:
-        """Per-hour TRES rate: raw_tres values are <count>-hours totals."""
-        value = record.raw_tres.get(key)
-        if value is None or record.node_hours <= 0:
-            return default
-        return round(value / record.node_hours)
-
-    def _tres_string(self, record: UsageRecord, noconvert: bool) -> str:
-        """Standard Slurm TRES string in TRES-id order.
-
-        cpu=1, mem=2, node=4, billing=5, gres/* after — matching
-        slurmdb_make_tres_string_from_simple. The emulator-internal
-        ``node-hours`` raw_tres key is intentionally not exposed.
-        """
-        cpus = self._cpu_rate(record)
-        mem_gb = self._rate(record, "Mem", _NODE_MEM_GB)
-        gpus = self._rate(record, "GRES/gpu", _NODE_GPUS)
-        mem = f"{mem_gb * 1024}M" if noconvert else f"{mem_gb}G"
-        parts = [f"cpu={cpus}", f"mem={mem}", "node=1", f"billing={cpus}"]
-        if gpus:
-            parts.append(f"gres/gpu={gpus}")
-        return ",".join(parts)
-
-
-def _secs2time_str(secs: int) -> str:
-    """Port of secs2time_str (src/common/parse_time.c:849-874)."""
-    if secs < 0:
-        return "INVALID"
-    days, rem = divmod(secs, 86400)
-    hours, rem = divmod(rem, 3600)
-    minutes, seconds = divmod(rem, 60)
-    if days:
-        return f"{days}-{hours:02d}:{minutes:02d}:{seconds:02d}"
-    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+            start = end = None
+        else:
+            # Default window: Midnight -> Now on the simulated clock
+            # (slurmdb_job_cond_def_start_end, slurmdb_defs.c:371-394).
+            now = self.time_engine.get_current_time()
+            start = config.start_time or now.replace(hour=0, minute=0, second=0, microsecond=0)
+            end = config.end_time or now
+
+        return list(
+            self.database.query_usage_records(
+                clusters, accounts=accounts, users=users, job_ids=job_ids, start=start, end=end
+            )
+        )
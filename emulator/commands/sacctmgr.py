@@ -24,7 +24,10 @@ accepted no-op — the emulator is headless), and a leading ``-M
 compatibility (real sacctmgr has no ``-M``).
 """
 
-from typing import Optional
+import re
+from collections.abc import Iterable, Iterator
+from operator import attrgetter
+from typing import Callable, Optional
 
 from emulator import __version__
 from emulator.commands.print_fields import (
@@ -149,6 +152,83 @@ _QOS_DEFAULT = (  # qos_functions.c:1178-1193
 _TRES_DEFAULT = "Type,Name%15,ID"  # tres_function.c:152
 
 
+# ``set`` keys taking a TRES limit, as (key prefix, limits name). A key
+# matches the first prefix it starts with, so GrpTRESMins precedes GrpTRES.
+_TRES_LIMITS: tuple[tuple[str, str], ...] = (
+    ("grptresmin", "GrpTRESMins"),
+    ("maxtresmin", "MaxTRESMins"),
+    ("grptres", "GrpTRES"),
+)
+
+
+def _set_tres_limit(limits: dict[str, int], name: str, spec: str) -> None:
+    """Store ``name=spec`` in ``limits``.
+
+    ``GrpTRESMins=billing=72000`` / ``GrpTRES=cpu=10,node=5`` give one
+    ``name:tres`` entry per item; a bare number is stored under ``name``.
+    """
+    if "=" not in spec:
+        limits[name] = int(spec)
+        return
+    for item in spec.split(","):
+        tres_type, sep, tres_value = item.partition("=")
+        if sep:
+            limits[f"{name}:{tres_type}"] = int(tres_value)
+
+
+def _blank(_assoc: Association) -> str:
+    return ""
+
+
+# Association column (display name) -> cell getter; the QOS column is
+# added per listing, and untracked columns render blank.
+_ASSOC_COLUMNS: dict[str, Callable[[Association], str]] = {
+    "Cluster": attrgetter("cluster"),
+    "Account": attrgetter("account"),
+    "User": attrgetter("user"),
+    "Partition": lambda a: a.partition or "",
+    # parent_acct lives on the account-level row (empty User);
+    # user rows print blank (as_mysql_assoc.c:2116-2126).
+    "ParentName": lambda a: (a.parent or "") if a.user == "" else "",
+    "MaxTRESMins": lambda a: ",".join(f"{k}={v}" for k, v in a.limits.items()),
+}
+
+
+def _clause_positions(args: list[str]) -> tuple[int, int]:
+    """Positions of the first ``where`` and ``set`` keywords (-1 when absent).
+
+    One case-insensitive pass, shared by the modify/remove handlers.
+    """
+    where = set_ = -1
+    for i, arg in enumerate(args):
+        low = arg.lower()
+        if low == "where":
+            if where < 0:
+                where = i
+        elif low == "set" and set_ < 0:
+            set_ = i
+    return where, set_
+
+
+# Slurm's strip_quotes() (sacctmgr/common.c): skip one leading quote, then
+# keep everything up to the next quote of either kind.
+_QUOTED_VALUE = re.compile(r"""["']?([^"']*)""")
+
+
+def _strip_quotes(value: str) -> str:
+    match = _QUOTED_VALUE.match(value)
+    return match.group(1) if match else value
+
+
+def _parse_kv(args: list[str]) -> dict[str, str]:
+    """Collect ``key=value`` arguments in one pass; keys are lower-cased.
+
+    Later occurrences win, matching the old per-argument ``startswith``
+    loops; arguments without ``=`` are skipped and values are left as given.
+    """
+    return {key.lower(): value for key, sep, value in (a.partition("=") for a in args) if sep}
+
+
 class SacctmgrEmulator:
     """Emulates sacctmgr commands for account management."""
 
@@ -166,6 +246,44 @@ class SacctmgrEmulator:
         self.stdout_error = False
         self._mode = OutputMode()
 
+        # Verb -> entity (lowercased) -> handler taking the remaining
+        # arguments. Real sacctmgr's show is an alias for list; accounts
+        # and associations have their own show variants here.
+        accounts = ("account", "accounts", "acct")
+        assocs = ("association", "associations", "assoc")
+        listing: dict[str, Callable[[list[str]], str]] = {
+            **dict.fromkeys(accounts, self._list_accounts),
+            **dict.fromkeys(("user", "users"), self._list_users),
+            **dict.fromkeys(assocs, self._list_associations),
+            "tres": self._list_tres,
+            **dict.fromkeys(("cluster", "clusters"), self._list_clusters),
+            **dict.fromkeys(("qos", "qoss"), self._list_qos),
+        }
+        self._entity_handlers: dict[str, dict[str, Callable[[list[str]], str]]] = {
+            "add": {
+                "account": self._add_account,
+                "user": self._add_user,
+                "cluster": self._add_cluster,
+                "qos": self._add_qos,
+            },
+            "modify": {
+                "account": self._modify_account,
+                "user": self._modify_user,
+                "qos": self._modify_qos,
+            },
+            "remove": {
+                "account": self._remove_account,
+                "user": self._remove_user,
+                "cluster": self._remove_cluster,
+            },
+            "list": listing,
+            "show": {
+                **listing,
+                **dict.fromkeys(accounts, self._show_account),
+                **dict.fromkeys(assocs, self._show_association),
+            },
+        }
+
     def _fail(self, message: str) -> str:
         """Record a non-zero exit (matching real sacctmgr) and return ``message``."""
         self.exit_code = 1
@@ -201,22 +319,23 @@ class SacctmgrEmulator:
     def _dispatch(self, args: list[str]) -> str:
         if not args:
             return self._show_help()
-
-        command = args[0].lower()
-
-        if command == "add":
-            return self._handle_add(args[1:])
-        if command == "modify":
-            return self._handle_modify(args[1:])
-        if command in {"remove", "delete"}:
-            return self._handle_remove(args[1:])
-        if command == "list":
-            return self._handle_list(args[1:])
-        if command == "show":
-            return self._handle_show(args[1:])
-        if command == "-V":
+        if args[0] == "-V":
             return f"slurm-emulator {__version__}"
-        return self._fail(f" error: Unknown command: {command}")
+
+        # Callers almost always pass lower-case keywords already, so look
+        # the token up as given and only lower-case it on a miss.
+        command = args[0] if args[0] in self._entity_handlers else args[0].lower()
+        verb = "remove" if command == "delete" else command
+        handlers = self._entity_handlers.get(verb)
+        if handlers is None:
+            return self._fail(f" error: Unknown command: {command}")
+        if len(args) < 2:
+            return self._fail(f" error: No entity specified for {verb}")
+        entity = args[1] if args[1] in handlers else args[1].lower()
+        handler = handlers.get(entity)
+        if handler is None:
+            return self._fail(f" error: Unknown entity for {verb}: {entity}")
+        return handler(args[2:])
 
     @staticmethod
     def _strip_cluster_flag(args: list[str]) -> list[str]:
@@ -252,97 +371,6 @@ class SacctmgrEmulator:
                 spec = arg.split("=", 1)[1]
         return resolve_format(parse_format_spec(spec), _REGISTRY)
 
-    def _handle_add(self, args: list[str]) -> str:
-        """Handle add commands."""
-        if not args:
-            return self._fail(" error: No entity specified for add")
-
-        entity = args[0].lower()
-
-        if entity == "account":
-            return self._add_account(args[1:])
-        if entity == "user":
-            return self._add_user(args[1:])
-        if entity == "cluster":
-            return self._add_cluster(args[1:])
-        if entity == "qos":
-            return self._add_qos(args[1:])
-        return self._fail(f" error: Unknown entity for add: {entity}")
-
-    def _handle_modify(self, args: list[str]) -> str:
-        """Handle modify commands."""
-        if not args:
-            return self._fail(" error: No entity specified for modify")
-
-        entity = args[0].lower()
-
-        if entity == "account":
-            return self._modify_account(args[1:])
-        if entity == "user":
-            return self._modify_user(args[1:])
-        if entity == "qos":
-            return self._modify_qos(args[1:])
-        return self._fail(f" error: Unknown entity for modify: {entity}")
-
-    def _handle_remove(self, args: list[str]) -> str:
-        """Handle remove/delete commands."""
-        if not args:
-            return self._fail(" error: No entity specified for remove")
-
-        entity = args[0].lower()
-
-        if entity == "account":
-            return self._remove_account(args[1:])
-        if entity == "user":
-            return self._remove_user(args[1:])
-        if entity == "cluster":
-            return self._remove_cluster(args[1:])
-        return self._fail(f" error: Unknown entity for remove: {entity}")
-
-    def _handle_list(self, args: list[str]) -> str:
-        """Handle list commands (real ``show`` is an alias for ``list``)."""
-        if not args:
-            return self._fail(" error: No entity specified for list")
-
-        entity = args[0].lower()
-
-        if entity in {"account", "accounts", "acct"}:
-            return self._list_accounts(args[1:])
-        if entity in {"user", "users"}:
-            return self._list_users(args[1:])
-        if entity in {"association", "associations", "assoc"}:
-            return self._list_associations(args[1:])
-        if entity == "tres":
-            return self._list_tres(args[1:])
-        if entity in {"cluster", "clusters"}:
-            return self._list_clusters(args[1:])
-        if entity in {"qos", "qoss"}:
-            return self._list_qos(args[1:])
-        return self._fail(f" error: Unknown entity for list: {entity}")
-
-    def _handle_show(self, args: list[str]) -> str:
-        """Handle show commands."""
-        if not args:
-            return self._fail(" error: No entity specified for show")
-
-        entity = args[0].lower()
-
-        if entity in {"account", "accounts", "acct"}:
-            return self._show_account(args[1:])
-        # Real sacctmgr prefix-matches the entity: "assoc" is accepted for
-        # "association" (xstrncasecmp, common.c).
-        if entity in {"association", "associations", "assoc"}:
-            return self._show_association(args[1:])
-        if entity in {"qos", "qoss"}:
-            return self._list_qos(args[1:])
-        if entity in {"cluster", "clusters"}:
-            return self._list_clusters(args[1:])
-        if entity in {"user", "users"}:
-            return self._list_users(args[1:])
-        if entity == "tres":
-            return self._list_tres(args[1:])
-        return self._fail(f" error: Unknown entity for show: {entity}")
-
     def _add_account(self, args: list[str]) -> str:
         """Add account command."""
         if not args:
@@ -351,22 +379,13 @@ class SacctmgrEmulator:
         account_name = args[0]
 
         # Parse additional parameters
-        description = ""
-        organization = "emulator"
-        parent = None
-        target_cluster = None
-
-        for arg in args[1:]:
-            if arg.startswith("description="):
-                description = arg.split("=", 1)[1].strip('"')
-            elif arg.startswith("organization="):
-                organization = arg.split("=", 1)[1].strip('"')
-            elif arg.startswith("parent="):
-                # Real sacctmgr runs the value through strip_quotes()
-                # (association_functions.c:512), same as description/organization.
-                parent = arg.split("=", 1)[1].strip("\"'")
-            elif arg.startswith("cluster="):
-                target_cluster = arg.split("=", 1)[1]
+        options = _parse_kv(args[1:])
+        # Real sacctmgr runs these values through strip_quotes(); for the
+        # parent see association_functions.c:512.
+        description = _strip_quotes(options.get("description", ""))
+        organization = _strip_quotes(options.get("organization", "emulator"))
+        parent = _strip_quotes(options["parent"]) if "parent" in options else None
+        target_cluster = options.get("cluster") or None
 
         # Check if account already exists
         existing = self.database.get_account(account_name)
@@ -383,7 +402,7 @@ class SacctmgrEmulator:
                         cluster=target_cluster,
                         parent=existing.parent,
                     )
-                self.database.save_state()
+                self.database.save_state(skip_unchanged=True)
                 return f" Adding Account(s)\n  {account_name}\n Settings\n  Cluster    = {target_cluster}"
             # Re-adding an existing account is NOT an error in real sacctmgr:
             # SLURM_NO_CHANGE_IN_DATA prints slurm_strerror(rc) to stdout and
@@ -403,7 +422,7 @@ class SacctmgrEmulator:
                 account=account_name, user="", cluster=target_cluster, parent=parent
             )
 
-        self.database.save_state()
+        self.database.save_state(skip_unchanged=True)
 
         return f" Adding Account(s)\n  {account_name}\n Settings\n  Parent     = {parent or 'root'}\n  Description = {description}"
 
@@ -475,7 +494,7 @@ class SacctmgrEmulator:
                     cluster=target_cluster,
                 )
 
-        self.database.save_state()
+        self.database.save_state(skip_unchanged=True)
         return f" Adding User(s)\n  {username}\n Settings\n  Account     = {account}\n  DefaultAccount = {default_account}"
 
     @staticmethod
@@ -501,12 +520,7 @@ class SacctmgrEmulator:
         if not args:
             return self._fail(" error: No account name specified")
 
-        # Look for 'set' keyword
-        set_index = -1
-        for i, arg in enumerate(args):
-            if arg.lower() == "set":
-                set_index = i
-                break
+        _, set_index = _clause_positions(args)
 
         if set_index == -1:
             return self._fail(" error: No 'set' clause found")
@@ -532,7 +546,7 @@ class SacctmgrEmulator:
         if parent_value is not None:
             # Real sacctmgr strips quotes from the parent value (strip_quotes,
             # association_functions.c:512) before resolving the account.
-            parent_value = parent_value.strip("\"'")
+            parent_value = _strip_quotes(parent_value)
             # Parent is an account name — fold so a case-only "change" is
             # correctly seen as a no-op against the stored lower-cased parent.
             parent_value = fold_account(parent_value)
@@ -543,7 +557,7 @@ class SacctmgrEmulator:
             if account.parent == parent_value:
                 return self._nothing_modified()
             self.database.set_account_parent(account.name, parent_value)
-            self.database.save_state()
+            self.database.save_state(skip_unchanged=True)
             return f" Modified account associations...\n  {account.name}"
 
         if not account:
@@ -551,82 +565,42 @@ class SacctmgrEmulator:
 
         # Process set parameters
         modifications = []
-        for arg in args[set_index + 1 :]:
-            if "=" in arg:
-                key, value = arg.split("=", 1)
-                key = key.lower()
-
-                if key == "fairshare":
-                    account.fairshare = int(value)
-                    modifications.append(f"fairshare={value}")
-                elif key == "qos":
-                    account.qos = value
-                    modifications.append(f"qos={value}")
-                elif key.startswith("grptresmin"):
-                    # Handle GrpTRESMins=billing=72000 or GrpTRESMins=cpu=600000,ram=614400
-                    tres_spec = value
-                    if "=" in tres_spec:
-                        for tres_item in tres_spec.split(","):
-                            if "=" in tres_item:
-                                tres_type, tres_value = tres_item.split("=", 1)
-                                account.limits[f"GrpTRESMins:{tres_type}"] = int(tres_value)
-                    else:
-                        account.limits["GrpTRESMins"] = int(tres_spec)
-                    modifications.append(f"GrpTRESMins={value}")
-                elif key.startswith("maxtresmin"):
-                    # Handle MaxTRESMins=billing=72000 or MaxTRESMins=cpu=600000,ram=614400
-                    tres_spec = value
-                    if "=" in tres_spec:
-                        for tres_item in tres_spec.split(","):
-                            if "=" in tres_item:
-                                tres_type, tres_value = tres_item.split("=", 1)
-                                account.limits[f"MaxTRESMins:{tres_type}"] = int(tres_value)
-                    else:
-                        account.limits["MaxTRESMins"] = int(tres_spec)
-                    modifications.append(f"MaxTRESMins={value}")
-                elif key.startswith("grptres") and not key.startswith("grptresmin"):
-                    # Handle GrpTRES=CPU=10 or GrpTRES=cpu=10,node=5 (concurrent limits)
-                    tres_spec = value
-                    if "=" in tres_spec:
-                        for tres_item in tres_spec.split(","):
-                            if "=" in tres_item:
-                                tres_type, tres_value = tres_item.split("=", 1)
-                                account.limits[f"GrpTRES:{tres_type}"] = int(tres_value)
-                    else:
-                        account.limits["GrpTRES"] = int(tres_spec)
-                    modifications.append(f"GrpTRES={value}")
-                elif key == "rawusage":
-                    # Handle raw usage reset
-                    if value == "0":
-                        self.database.reset_raw_usage(account.name)
-                        modifications.append("RawUsage=0")
-
-        self.database.save_state()
+        for key, value in set_pairs:
+            if key == "fairshare":
+                account.fairshare = int(value)
+                modifications.append(f"fairshare={value}")
+            elif key == "qos":
+                account.qos = value
+                modifications.append(f"qos={value}")
+            elif key == "rawusage":
+                # Handle raw usage reset
+                if value == "0":
+                    self.database.reset_raw_usage(account.name)
+                    modifications.append("RawUsage=0")
+            else:
+                limit = next(
+                    (name for prefix, name in _TRES_LIMITS if key.startswith(prefix)), None
+                )
+                if limit is not None:
+                    _set_tres_limit(account.limits, limit, value)
+                    modifications.append(f"{limit}={value}")
+
+        self.database.save_state(skip_unchanged=True)
 
         return f" Modified account...\n  {account.name}\n Settings\n  " + "\n  ".join(modifications)
 
     def _modify_user(self, args: list[str]) -> str:
         """Modify user command."""
         # Parse user modification - typically for per-user limits
-        if "where" not in args:
+        where_index, set_index = _clause_positions(args)
+        if where_index == -1:
             return self._fail(" error: No where clause found")
 
-        where_index = args.index("where")
-        set_index = -1
-
-        for i, arg in enumerate(args):
-            if arg.lower() == "set":
-                set_index = i
-                break
-
         if set_index == -1:
             return self._fail(" error: No 'set' clause found")
 
         # Parse where clause for account
-        account = ""
-        for arg in args[where_index + 1 : set_index]:
-            if arg.startswith("account="):
-                account = arg.split("=", 1)[1]
+        account = _parse_kv(args[where_index + 1 : set_index]).get("account", "")
 
         if not account:
             return self._fail(" error: No account specified in where clause")
@@ -635,16 +609,12 @@ class SacctmgrEmulator:
 
     def _remove_account(self, args: list[str]) -> str:
         """Remove account command."""
-        if "where" not in args:
+        where_index, _ = _clause_positions(args)
+        if where_index == -1:
             return self._fail(" error: No where clause found")
 
-        where_index = args.index("where")
-
         # Parse where clause
-        account_name = ""
-        for arg in args[where_index + 1 :]:
-            if arg.startswith("name="):
-                account_name = arg.split("=", 1)[1]
+        account_name = _parse_kv(args[where_index + 1 :]).get("name", "")
 
         if not account_name:
             return self._fail(" error: No account name specified in where clause")
@@ -653,26 +623,20 @@ class SacctmgrEmulator:
             return self._fail(f" error: Account {account_name} does not exist")
 
         self.database.delete_account(account_name)
-        self.database.save_state()
+        self.database.save_state(skip_unchanged=True)
 
         return f" Deleting account(s)...\n  {account_name}"
 
     def _remove_user(self, args: list[str]) -> str:
         """Remove user command."""
-        if "where" not in args:
+        where_index, _ = _clause_positions(args)
+        if where_index == -1:
             return self._fail(" error: No where clause found")
 
-        where_index = args.index("where")
-
         # Parse where clause
-        account = ""
-        username = ""
-
-        for arg in args[where_index + 1 :]:
-            if arg.startswith("account="):
-                account = arg.split("=", 1)[1]
-            elif arg.startswith("name="):
-                username = arg.split("=", 1)[1]
+        where = _parse_kv(args[where_index + 1 :])
+        account = where.get("account", "")
+        username = where.get("name", "")
 
         if account and username:
             # Remove every association row for this (user, account),
@@ -682,14 +646,12 @@ class SacctmgrEmulator:
             result = f" Deleting user association...\n  User: {username}\n  Account: {account}"
         elif account:
             # Remove all users from account
-            users = self.database.list_account_users(account)
-            for user in users:
-                self.database.delete_user_associations(user, account)
-            result = f" Deleting {len(users)} user association(s) from account {account}"
+            count = self.database.delete_account_user_associations(account)
+            result = f" Deleting {count} user association(s) from account {account}"
         else:
             return self._fail(" error: Insufficient parameters in where clause")
 
-        self.database.save_state()
+        self.database.save_state(skip_unchanged=True)
         return result
 
     def _add_cluster(self, args: list[str]) -> str:
@@ -700,17 +662,10 @@ class SacctmgrEmulator:
         cluster_name = args[0]
 
         # Parse optional parameters
-        control_host = "localhost"
-        control_port = 6817
-        classification = ""
-
-        for arg in args[1:]:
-            if arg.startswith("control_host="):
-                control_host = arg.split("=", 1)[1]
-            elif arg.startswith("control_port="):
-                control_port = int(arg.split("=", 1)[1])
-            elif arg.startswith("classification="):
-                classification = arg.split("=", 1)[1]
+        options = _parse_kv(args[1:])
+        control_host = options.get("control_host", "localhost")
+        control_port = int(options.get("control_port", 6817))
+        classification = options.get("classification", "")
 
         # Validate classification value
         valid_values = [e.value for e in ClusterClassification]
@@ -724,7 +679,7 @@ class SacctmgrEmulator:
             return self._fail(f" error: Cluster {cluster_name} already exists")
 
         self.database.add_cluster(cluster_name, control_host, control_port, classification)
-        self.database.save_state()
+        self.database.save_state(skip_unchanged=True)
 
         return f" Adding Cluster(s)\n  Name          = {cluster_name}\n  Control Host  = {control_host}\n  Control Port  = {control_port}"
 
@@ -792,11 +747,7 @@ class SacctmgrEmulator:
             # Same SLURM_NO_CHANGE_IN_DATA shape as accounts: stdout, exit 1.
             return self._nothing_modified()
 
-        set_index = -1
-        for i, arg in enumerate(args):
-            if arg.lower() == "set":
-                set_index = i
-                break
+        _, set_index = _clause_positions(args)
 
         if set_index == -1:
             return self._fail(" error: No 'set' clause found")
@@ -823,14 +774,11 @@ class SacctmgrEmulator:
 
     def _remove_cluster(self, args: list[str]) -> str:
         """Remove cluster command."""
-        if "where" not in args:
+        where_index, _ = _clause_positions(args)
+        if where_index == -1:
             return self._fail(" error: No where clause found")
 
-        where_index = args.index("where")
-        cluster_name = ""
-        for arg in args[where_index + 1 :]:
-            if arg.startswith("name="):
-                cluster_name = arg.split("=", 1)[1]
+        cluster_name = _parse_kv(args[where_index + 1 :]).get("name", "")
 
         if not cluster_name:
             return self._fail(" error: No cluster name specified in where clause")
@@ -846,7 +794,7 @@ class SacctmgrEmulator:
         except ValueError as e:
             return self._fail(f" error: {e}")
 
-        self.database.save_state()
+        self.database.save_state(skip_unchanged=True)
 
         return f" Deleting cluster(s)...\n  {cluster_name}"
 
@@ -877,7 +825,7 @@ class SacctmgrEmulator:
                 "MinTRES": q.min_tres_per_job,
             }
 
-        return render_table(fields, [_row(q) for q in qos_items], self._mode)
+        return render_table(fields, map(_row, qos_items), self._mode)
 
     def _list_clusters(self, args: list[str]) -> str:
         """List clusters (real default format from cluster_functions.c:482-489)."""
@@ -900,21 +848,21 @@ class SacctmgrEmulator:
         """List accounts (real default ``Acc,Des,O``)."""
         fields = self._resolve(_ACCOUNT_DEFAULT, args)
 
-        rows = [
+        rows = (
             {
                 "Account": a.name,
                 "Descr": a.description,
                 "Org": a.organization,
             }
             for a in self.database.list_accounts()
-        ]
+        )
         return render_table(fields, rows, self._mode)
 
     def _list_users(self, args: list[str]) -> str:
         """List users (real default ``U,DefaultA,Ad``)."""
         fields = self._resolve(_USER_DEFAULT, args)
 
-        rows = [
+        rows = (
             {
                 "User": u.name,
                 "Def Acct": u.default_account,
@@ -922,44 +870,48 @@ class SacctmgrEmulator:
                 "Admin": "None",
             }
             for u in self.database.users.values()
-        ]
+        )
         return render_table(fields, rows, self._mode)
 
     def _list_associations(self, args: list[str]) -> str:
         """List associations (real default from association_functions.c:793-801)."""
         fields = self._resolve(_ASSOC_DEFAULT, args)
 
-        account_filter = None
-        user_filter = None
-        for arg in args:
-            if arg.startswith("account="):
-                # Case-insensitive account filter (see _show_association).
-                account_filter = fold_account(arg.split("=", 1)[1])
-            elif arg.startswith("user="):
-                user_filter = arg.split("=", 1)[1]
+        conditions = _parse_kv(args)
+        # Case-insensitive account filter (see _show_association).
+        account_filter = fold_account(conditions.get("account", ""))
+        user_filter = conditions.get("user")
 
-        associations = list(self.database.associations.values())
         if account_filter:
-            associations = [a for a in associations if a.account == account_filter]
+            associations = self.database.list_account_associations(account_filter)
+        else:
+            associations = list(self.database.associations.values())
         if user_filter:
             associations = [a for a in associations if a.user == user_filter]
 
-        return render_table(fields, [self._assoc_row(a) for a in associations], self._mode)
-
-    def _assoc_row(self, assoc: Association) -> dict[str, str]:
-        account_obj = self.database.get_account(assoc.account)
-        limits = ",".join(f"{k}={v}" for k, v in assoc.limits.items()) if assoc.limits else ""
-        return {
-            "Cluster": assoc.cluster,
-            "Account": assoc.account,
-            "User": assoc.user,
-            "Partition": assoc.partition or "",
-            # parent_acct lives on the account-level row (empty User);
-            # user rows print blank (as_mysql_assoc.c:2116-2126).
-            "ParentName": (assoc.parent or "") if assoc.user == "" else "",
-            "QOS": account_obj.qos if account_obj else "",
-            "MaxTRESMins": limits,
-        }
+        return render_table(fields, self._assoc_rows(fields, associations), self._mode)
+
+    def _assoc_rows(
+        self, fields: list[FieldSpec], associations: Iterable[Association]
+    ) -> Iterator[list[str]]:
+        """Yield the ``fields`` cells of each association.
+
+        Each column's getter is resolved once per listing, and the account
+        QOS is looked up once per account rather than once per row.
+        """
+        qos_by_account: dict[str, str] = {}
+
+        def account_qos(assoc: Association) -> str:
+            qos = qos_by_account.get(assoc.account)
+            if qos is None:
+                account_obj = self.database.get_account(assoc.account)
+                qos = qos_by_account[assoc.account] = account_obj.qos if account_obj else ""
+            return qos
+
+        columns = {**_ASSOC_COLUMNS, "QOS": account_qos}
+        getters = [columns.get(f.display_name, _blank) for f in fields]
+        for assoc in associations:
+            yield [get(assoc) for get in getters]
 
     def _list_tres(self, args: list[str]) -> str:
         """List TRES types (real default ``Type,Name%15,ID``)."""
@@ -1047,29 +999,23 @@ class SacctmgrEmulator:
         # Parse where clause and optional format=. The ``where`` keyword is
         # optional in real sacctmgr — ``user=``/``account=`` conditions are
         # accepted whether or not it is present.
-        user = ""
-        account = ""
-        for arg in args:
-            if arg.startswith("user="):
-                user = arg.split("=", 1)[1]
-            elif arg.startswith("account="):
-                # Account filters are case-insensitive (folded to match the
-                # stored lower-cased rows), so ``account=2026_00A`` finds
-                # ``2026_00a`` — the mismatch real Slurm papers over.
-                account = fold_account(arg.split("=", 1)[1])
+        conditions = _parse_kv(args)
+        user = conditions.get("user", "")
+        # Account filters are case-insensitive (folded to match the
+        # stored lower-cased rows), so ``account=2026_00A`` finds
+        # ``2026_00a`` — the mismatch real Slurm papers over.
+        account = fold_account(conditions.get("account", ""))
 
         fields = self._resolve(_ASSOC_DEFAULT, args)
 
         if user and account:
             associations = self.database.list_user_associations(user, account)
+        elif account:
+            associations = self.database.list_account_associations(account)
         else:
-            associations = [
-                a
-                for a in self.database.associations.values()
-                if not account or a.account == account
-            ]
+            associations = list(self.database.associations.values())
 
-        return render_table(fields, [self._assoc_row(a) for a in associations], self._mode)
+        return render_table(fields, self._assoc_rows(fields, associations), self._mode)
 
     def _show_help(self) -> str:
         """Show help message."""
@@ -23,6 +23,7 @@ rows; ``NormShares`` evenly split between siblings; ``FairShare`` and
 
 from __future__ import annotations
 
+import functools
 import sys
 from dataclasses import dataclass, field
 from typing import Optional
@@ -33,8 +34,8 @@ from emulator.commands.print_fields import (
     UnknownFieldError,
     parse_format_spec,
     render_header,
-    render_row,
     resolve_format,
+    row_formatter,
 )
 from emulator.core.database import SlurmDatabase, UsageRecord
 from emulator.core.time_engine import TimeEngine
@@ -103,6 +104,11 @@ class _Row:
     siblings: int = 1
     records: list[UsageRecord] = field(default_factory=list)
 
+    @functools.cached_property
+    def raw_seconds(self) -> int:
+        """The row's usage in seconds, summed once for every usage column."""
+        return int(sum(r.node_hours for r in self.records) * 3600)
+
 
 class SshareEmulator:
     """Emulates ``sshare``."""
@@ -357,18 +363,21 @@ def _aggregate_raw_tres_minutes(records: list[UsageRecord]) -> dict[str, int]:
     /60.
     """
     totals: dict[str, int] = dict.fromkeys(_CANONICAL_TRES, 0)
+    node = billing = 0
     for record in records:
-        totals["node"] += int(record.node_hours)
-        totals["billing"] += int(record.billing_units)
+        node += int(record.node_hours)
+        billing += int(record.billing_units)
         for raw_name, value in record.raw_tres.items():
             key = _normalize_tres_name(raw_name)
-            if key not in totals:
-                totals[key] = 0
-            totals[key] += int(value)
+            totals[key] = totals.get(key, 0) + int(value)
+    totals["node"] += node
+    totals["billing"] += billing
     return {k: v * 60 for k, v in totals.items()}
 
 
+@functools.lru_cache(maxsize=64)
 def _normalize_tres_name(name: str) -> str:
+    """Canonical lowercase TRES name; cached, as records repeat a few keys."""
     lower = name.lower()
     if lower in {"mem", "ram"}:
         return "mem"
@@ -406,9 +415,11 @@ def _render(
 
     mode = cfg.mode
     lines = render_header(fields, mode)
-    for row in rows:
-        cells = [_cell_for(row, fld, database, cluster_total_raw_seconds) for fld in fields]
-        lines.append(render_row(cells, fields, mode))
+    render = row_formatter(fields, mode)
+    lines += [
+        render([_cell_for(row, fld, database, cluster_total_raw_seconds) for fld in fields])
+        for row in rows
+    ]
     return "\n".join(lines)
 
 
@@ -438,18 +449,16 @@ def _cell_for(
     if name == "NormShares":
         return _fmt_float(1.0 if is_parent else 1.0 / max(1, row.siblings))
     if name == "RawUsage":
-        return str(int(sum(r.node_hours for r in row.records) * 3600))
+        return str(row.raw_seconds)
     if name == "NormUsage":
-        row_seconds = int(sum(r.node_hours for r in row.records) * 3600)
         if cluster_total_raw_seconds <= 0:
             return _fmt_float(0.0)
-        return _fmt_float(row_seconds / cluster_total_raw_seconds)
+        return _fmt_float(row.raw_seconds / cluster_total_raw_seconds)
     if name == "EffectvUsage":
         # Simplified — real Slurm augments by sibling effective usage.
-        row_seconds = int(sum(r.node_hours for r in row.records) * 3600)
         if cluster_total_raw_seconds <= 0:
             return _fmt_float(0.0)
-        return _fmt_float(row_seconds / cluster_total_raw_seconds)
+        return _fmt_float(row.raw_seconds / cluster_total_raw_seconds)
     if name == "FairShare":
         return "" if is_parent else _fmt_float(0.5)
     if name == "LevelFS":
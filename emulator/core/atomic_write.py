@@ -0,0 +1,32 @@
+"""Atomic replacement of the emulator's JSON state files."""
+
+import os
+import threading
+from pathlib import Path
+
+
+def write_atomic(path: Path, data: str) -> os.stat_result:
+    """Replace ``path`` with ``data`` so readers only ever see a complete file.
+
+    The data goes to a sibling temp file that is fsynced and renamed over
+    ``path``, so a process or machine crash mid-write leaves the previous
+    file intact. The temp name is unique per process and thread; whole-file
+    last-writer-wins is unchanged. Returns the stat of the written file
+    (renaming keeps its inode and mtime). On failure the temp file is
+    removed and the error re-raised.
+    """
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        # os.open() rather than tempfile so the file gets the usual
+        # umask-derived mode instead of 0600.
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        with os.fdopen(fd, "w") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+            written = os.fstat(f.fileno())
+        tmp.replace(path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return written
@@ -1,13 +1,19 @@
 """In-memory database for SLURM emulator state."""
 
-import fcntl
+import functools
+import heapq
 import json
 import os
-from dataclasses import asdict, dataclass, field
+import sys
+from collections.abc import Collection, Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Any, Optional, overload
+from typing import Any, Callable, Optional, overload
+
+from emulator.core.atomic_write import write_atomic
 
 
 @overload
@@ -34,6 +40,55 @@ def fold_account(name: Optional[str]) -> Optional[str]:
     return name.lower() if name else name
 
 
+# The per-account/per-job records can number in the thousands; on Pythons
+# that support it, give every stored dataclass __slots__ so each instance
+# carries no __dict__ and the hot ``.account``/``.state`` loads in filter
+# loops stay cheap.
+_SLOTS: dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# UsageRecord fields shared by many records; see _deserialize_usage_record
+_INTERNED_RECORD_FIELDS: tuple[str, ...] = ("account", "user", "cluster", "period", "state")
+
+# (user, folded account, cluster, partition or ""); see SlurmDatabase._association_key
+AssociationKey = tuple[str, str, str, str]
+
+
+@functools.cache
+def _field_names(cls: type) -> tuple[str, ...]:
+    return tuple(f.name for f in fields(cls))
+
+
+def _record_dict(obj: object) -> dict[str, Any]:
+    """``dataclasses.asdict()`` for the flat records stored here.
+
+    Their only containers are ``dict`` fields of scalars (limits, raw TRES,
+    job environment), so copying those one level deep is a full copy and
+    nothing needs ``asdict()``'s recursive walk and ``deepcopy``. The copy
+    is still needed: save_state compares against its last snapshot.
+    """
+    data = {name: getattr(obj, name) for name in _field_names(type(obj))}
+    for name, value in data.items():
+        if isinstance(value, dict):
+            data[name] = dict(value)
+    return data
+
+
+def _filter_inplace(items: list[Any], keep: Callable[[Any], bool]) -> int:
+    """Drop the items failing ``keep`` from ``items`` in place, preserving order.
+
+    Kept items are compacted to the front and the tail truncated, so no
+    second copy of the list is built. Returns the number of items removed.
+    """
+    i = 0
+    for item in items:
+        if keep(item):
+            items[i] = item
+            i += 1
+    removed = len(items) - i
+    del items[i:]
+    return removed
+
+
 class ClusterClassification(str, Enum):
     """SLURM cluster classification types."""
 
@@ -43,7 +98,7 @@ class ClusterClassification(str, Enum):
     CAPAPACITY = "capapacity"
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Cluster:
     """SLURM cluster representation."""
 
@@ -59,7 +114,7 @@ class Cluster:
     tres_str: str = ""
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Account:
     """SLURM account representation."""
 
@@ -85,7 +140,7 @@ class Account:
         self.parent = fold_account(self.parent)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class User:
     """SLURM user representation."""
 
@@ -93,7 +148,7 @@ class User:
     default_account: str = ""
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class QOS:
     """SLURM Quality of Service."""
 
@@ -106,7 +161,7 @@ class QOS:
     min_tres_per_job: str = ""
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Association:
     """SLURM association between user and account.
 
@@ -139,7 +194,7 @@ class Association:
         self.parent = fold_account(self.parent)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class UsageRecord:
     """Usage record for a user in an account."""
 
@@ -157,7 +212,7 @@ class UsageRecord:
     state: str = "COMPLETED"
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Job:
     """SLURM job representation.
 
@@ -192,6 +247,11 @@ class Job:
     constraints: str = ""
 
 
+def state_file_path() -> Path:
+    """State file named by ``SLURM_EMULATOR_STATE_FILE``, else the shared default."""
+    return Path(os.environ.get("SLURM_EMULATOR_STATE_FILE", "/tmp/slurm_emulator_db.json"))
+
+
 class SlurmDatabase:
     """In-memory database for SLURM emulator."""
 
@@ -204,20 +264,56 @@ class SlurmDatabase:
         self.current_cluster: str = "default"
         self.accounts: dict[str, Account] = {}
         self.users: dict[str, User] = {}
-        self.associations: dict[str, Association] = {}  # key: "user:account:cluster"
+        # key: (user, account, cluster, partition); see _association_key()
+        self.associations: dict[AssociationKey, Association] = {}
         self.usage_records: list[UsageRecord] = []
         self.jobs: dict[str, Job] = {}
         self.qos_list: dict[str, QOS] = {}
         self.tres_types = ["CPU", "Mem", "GRES/gpu", "billing"]
-        self.state_file = Path(
-            os.environ.get("SLURM_EMULATOR_STATE_FILE", "/tmp/slurm_emulator_db.json")
-        )
+        self.state_file = state_file_path()
+        # Bumped by every mutating method; see state_token()
+        self._mutations: int = 0
+        # Serialized state as of the last successful save_state(), and the
+        # (inode, mtime) of the file that save wrote
+        self._last_saved_state: Optional[dict[str, Any]] = None
+        self._last_saved_file: Optional[tuple[int, int]] = None
+        # Cached list_non_root_accounts() result; reset when accounts change
+        self._non_root_view: Optional[list[Account]] = None
+        # collection name -> ((id, size) fingerprint, account -> entries); see _account_index()
+        self._account_indexes: dict[str, tuple[tuple[int, int], dict[str, list[Any]]]] = {}
+        # batch_writes() nesting depth, and whether a save was deferred meanwhile
+        self._batch_depth: int = 0
+        self._save_deferred: bool = False
+        # (period, cluster) -> account -> node-hours, valid while the usage
+        # records and mutation counter match the stamp; see _usage_totals_for()
+        self._usage_totals: dict[tuple[Optional[str], str], dict[str, float]] = {}
+        self._usage_totals_stamp: tuple[int, int, int] = (0, 0, -1)
 
         # Create global root account and root association for default cluster
         self.add_account("root", "Root account", "system")
         root_key = self._association_key("", "root", "default")
         self.associations[root_key] = Association(account="root", user="", cluster="default")
 
+    def _bump(self) -> None:
+        """Record that the database contents changed."""
+        self._mutations += 1
+
+    def state_token(self) -> tuple[int, ...]:
+        """Return a cheap fingerprint that changes whenever the data changes.
+
+        Combines the mutation counter with the collection sizes, so callers
+        that append to or delete from the collections directly are noticed
+        as well.
+        """
+        return (
+            self._mutations,
+            len(self.accounts),
+            len(self.users),
+            len(self.associations),
+            len(self.usage_records),
+            len(self.jobs),
+        )
+
     def _allocate_cluster_id(self) -> int:
         """Allocate the next cluster ID."""
         cid = self._next_cluster_id
@@ -254,6 +350,7 @@ class SlurmDatabase:
         # Create root association for the new cluster
         root_key = self._association_key("", "root", name)
         self.associations[root_key] = Association(account="root", user="", cluster=name)
+        self._bump()
 
     def get_cluster(self, name: str) -> Optional[Cluster]:
         """Get cluster by name (excludes soft-deleted)."""
@@ -287,10 +384,12 @@ class SlurmDatabase:
         cluster.deleted = True
         # Clean up per-cluster data (but NOT accounts — they are global)
         self.associations = {k: v for k, v in self.associations.items() if v.cluster != name}
-        self.usage_records = [r for r in self.usage_records if r.cluster != name]
+        _filter_inplace(self.usage_records, lambda r: r.cluster != name)
         self.jobs = {k: v for k, v in self.jobs.items() if v.cluster != name}
+        self._account_indexes.clear()
         if self.current_cluster == name:
             self.current_cluster = "default"
+        self._bump()
 
     def set_current_cluster(self, name: str) -> bool:
         """Set the current cluster context. Returns True if successful."""
@@ -327,6 +426,8 @@ class SlurmDatabase:
         self.associations[key] = Association(
             account=name, user="", cluster=self.current_cluster, parent=parent
         )
+        self._non_root_view = None
+        self._bump()
 
     def set_account_parent(
         self, name: str, parent: Optional[str], cluster: Optional[str] = None
@@ -342,6 +443,7 @@ class SlurmDatabase:
         assoc = self.associations.get(key)
         if assoc is not None:
             assoc.parent = parent
+        self._bump()
 
     def get_account(self, name: str) -> Optional[Account]:
         """Get account by name (global, case-insensitive)."""
@@ -351,17 +453,49 @@ class SlurmDatabase:
         """List all accounts (global)."""
         return list(self.accounts.values())
 
-    def delete_account(self, name: str) -> None:
-        """Delete account (global, case-insensitive)."""
-        name = fold_account(name)
-        if name in self.accounts:
-            del self.accounts[name]
+    def list_non_root_accounts(self) -> list[Account]:
+        """List all accounts except ``root``, in ``list_accounts`` order."""
+        if self._non_root_view is None:
+            self._non_root_view = [a for a in self.accounts.values() if a.name != "root"]
+        return list(self._non_root_view)
+
+    def upsert_account(
+        self,
+        name: str,
+        description: str,
+        organization: str,
+        allocation: int,
+        parent: Optional[str] = None,
+    ) -> Account:
+        """Create an account, replacing any existing one with fresh settings.
+
+        Equivalent to ``delete_account`` + ``add_account`` +
+        ``set_account_allocation``; the account moves to the end of the
+        listing order just as a delete and re-add would.
+        """
+        self.accounts.pop(fold_account(name), None)
+        self.add_account(name, description, organization, parent)
+        account = self.accounts[fold_account(name)]
+        account.allocation = allocation
+        return account
+
+    def delete_account(self, name: str) -> bool:
+        """Delete account (global, case-insensitive).
+
+        Returns True if the account existed.
+        """
+        if self.accounts.pop(fold_account(name), None) is None:
+            return False
+        self._non_root_view = None
+        self._bump()
+        return True
 
     # --- User methods (global, unchanged) ---
 
     def add_user(self, name: str, default_account: str = "") -> None:
         """Add user to database."""
         self.users[name] = User(name=name, default_account=default_account)
+        self._bump()
 
     def get_user(self, name: str) -> Optional[User]:
         """Get user by name."""
@@ -375,14 +509,15 @@ class SlurmDatabase:
         account: str,
         cluster: Optional[str] = None,
         partition: Optional[str] = None,
-    ) -> str:
+    ) -> AssociationKey:
         """Generate unique key for association.
 
         The account component is folded to lower case so account-name case
         never splits a row across two keys — the user name is left as-is.
+        Keys are tuples in memory and ``user:account:cluster:partition``
+        strings in the state file.
         """
-        cl = cluster or self.current_cluster
-        return f"{user}:{fold_account(account)}:{cl}:{partition or ''}"
+        return (user, fold_account(account), cluster or self.current_cluster, partition or "")
 
     def add_association(
         self,
@@ -409,6 +544,7 @@ class SlurmDatabase:
             cluster=cl,
             partition=partition,
         )
+        self._bump()
 
     def get_association(
         self,
@@ -436,26 +572,26 @@ class SlurmDatabase:
         With multiple ``Partitions=`` this returns one entry per partition.
         """
         cl = cluster or self.current_cluster
-        account = fold_account(account)
         return [
-            a
-            for a in self.associations.values()
-            if a.user == user and a.account == account and a.cluster == cl
+            a for a in self.list_account_associations(account) if a.user == user and a.cluster == cl
         ]
 
+    def list_account_associations(self, account: str) -> list[Association]:
+        """Return every Association row of ``account`` (all clusters), in insertion order.
+
+        Served from the per-account index rather than a scan of all rows.
+        """
+        associations = self.associations
+        keys = self._account_index("associations").get(fold_account(account), ())
+        return [associations[key] for key in keys]
+
     def list_account_users(self, account: str, cluster: Optional[str] = None) -> list[str]:
         """List users associated with account (deduplicated across partitions)."""
         cl = cluster or self.current_cluster
-        account = fold_account(account)
         users: list[str] = []
         seen: set[str] = set()
-        for assoc in self.associations.values():
-            if (
-                assoc.account == account
-                and assoc.user
-                and assoc.cluster == cl
-                and assoc.user not in seen
-            ):
+        for assoc in self.list_account_associations(account):
+            if assoc.user and assoc.cluster == cl and assoc.user not in seen:
                 seen.add(assoc.user)
                 users.append(assoc.user)
         return users
@@ -472,6 +608,8 @@ class SlurmDatabase:
         key = self._association_key(user, account, cl, partition)
         if key in self.associations:
             del self.associations[key]
+            self._account_indexes.pop("associations", None)
+            self._bump()
 
     def delete_user_associations(
         self, user: str, account: str, cluster: Optional[str] = None
@@ -489,10 +627,127 @@ class SlurmDatabase:
             for k, a in self.associations.items()
             if a.user == user and a.account == account and a.cluster == cl
         ]
+        pop = self.associations.pop
         for k in keys:
-            del self.associations[k]
+            pop(k, None)
+        if keys:
+            self._account_indexes.pop("associations", None)
+            self._bump()
         return len(keys)
 
+    def delete_account_associations(self, account: str, cluster: Optional[str] = None) -> int:
+        """Delete every association row of ``account`` on a cluster.
+
+        Returns the number of rows removed.
+        """
+        cl = cluster or self.current_cluster
+        return self._delete_by_account("associations", [fold_account(account)], cl)
+
+    def delete_account_user_associations(self, account: str, cluster: Optional[str] = None) -> int:
+        """Delete every user row of ``account`` on a cluster, all partitions.
+
+        The account's own (empty-user) row is kept. Returns the number of
+        rows removed. Mirrors ``sacctmgr remove user where account=Y``;
+        the rows come from the per-account index, which is updated in place.
+        """
+        cl = cluster or self.current_cluster
+        associations = self.associations
+        index = self._account_index("associations")
+        bucket = index.get(fold_account(account), [])
+        kept: list[AssociationKey] = []
+        doomed: list[AssociationKey] = []
+        for key in bucket:
+            assoc = associations[key]
+            (doomed if assoc.user and assoc.cluster == cl else kept).append(key)
+        if doomed:
+            for key in doomed:
+                del associations[key]
+            bucket[:] = kept
+            self._account_indexes["associations"] = ((id(associations), len(associations)), index)
+            self._bump()
+        return len(doomed)
+
+    def delete_orphaned_associations(self) -> int:
+        """Delete association rows, on every cluster, whose account no longer exists.
+
+        Returns the number of rows removed.
+        """
+        return self._delete_orphans("associations")
+
+    # --- Per-account indexes for bulk deletion ---
+
+    def _account_index(self, attr: str) -> dict[str, list[Any]]:
+        """Group the entries of collection ``attr`` by account.
+
+        Dict collections (``associations``, ``jobs``) are grouped by key and
+        ``usage_records`` by list position, each bucket in collection order.
+        An entry never changes account, so the grouping only goes stale when
+        entries are added or removed: the index is rebuilt whenever the
+        collection object or its size changed, which also covers entries
+        written straight into the collections by the command emulators and
+        the scheduler. Removals made here drop or update the index themselves.
+        """
+        collection = getattr(self, attr)
+        token = (id(collection), len(collection))
+        cached = self._account_indexes.get(attr)
+        if cached is not None and cached[0] == token:
+            return cached[1]
+        index: dict[str, list[Any]] = {}
+        if isinstance(collection, dict):
+            for key, item in collection.items():
+                index.setdefault(item.account, []).append(key)
+        else:
+            for pos, item in enumerate(collection):
+                index.setdefault(item.account, []).append(pos)
+        self._account_indexes[attr] = (token, index)
+        return index
+
+    def _delete_by_account(self, attr: str, accounts: list[str], cluster: Optional[str]) -> int:
+        """Delete the entries of ``accounts`` from collection ``attr``.
+
+        Only entries on ``cluster`` are removed, or on every cluster when it is
+        None. Returns the number of entries removed.
+        """
+        collection = getattr(self, attr)
+        is_dict = isinstance(collection, dict)
+        index = self._account_index(attr)
+        doomed: list[Any] = []
+        for account in accounts:
+            bucket = index.pop(account, None)
+            if not bucket:
+                continue
+            if cluster is None:
+                doomed.extend(bucket)
+                continue
+            kept = []
+            for entry in bucket:
+                (doomed if collection[entry].cluster == cluster else kept).append(entry)
+            if kept:
+                index[account] = kept
+
+        if doomed:
+            if is_dict:
+                pop = collection.pop
+                for key in doomed:
+                    pop(key, None)
+            else:
+                drop = {id(collection[pos]) for pos in doomed}
+                _filter_inplace(collection, lambda record: id(record) not in drop)
+            self._bump()
+        if is_dict or not doomed:
+            # The index was updated alongside the collection, keep it valid
+            self._account_indexes[attr] = ((id(collection), len(collection)), index)
+        else:
+            # Compaction shifted the list positions
+            del self._account_indexes[attr]
+        return len(doomed)
+
+    def _delete_orphans(self, attr: str) -> int:
+        """Delete entries of collection ``attr`` whose account no longer exists."""
+        index = self._account_index(attr)
+        orphaned = [account for account in index if account not in self.accounts]
+        return self._delete_by_account(attr, orphaned, None)
+
     # --- Usage record methods (cluster-aware) ---
 
     def add_usage_record(self, record: UsageRecord) -> None:
@@ -500,7 +755,32 @@ class SlurmDatabase:
         if record.job_id is None:
             record.job_id = self._next_job_id
             self._next_job_id += 1
-        self.usage_records.append(record)
+        records = self.usage_records
+        cached = self._account_indexes.get("usage_records")
+        totals_valid = self._usage_totals_stamp == (id(records), len(records), self._mutations)
+        records.append(record)
+        if cached is not None and cached[0] == (id(records), len(records) - 1):
+            # Extend the current index rather than letting the next query rebuild it
+            cached[1].setdefault(record.account, []).append(len(records) - 1)
+            self._account_indexes["usage_records"] = ((id(records), len(records)), cached[1])
+        self._bump()
+        if totals_valid:
+            # Likewise fold the record into the cached usage totals
+            for (period, cluster), totals in self._usage_totals.items():
+                if record.cluster == cluster and (not period or record.period == period):
+                    totals[record.account] = totals.get(record.account, 0) + record.node_hours
+            self._usage_totals_stamp = (id(records), len(records), self._mutations)
+
+    def delete_account_usage(self, account: str, cluster: Optional[str] = None) -> int:
+        """Delete the usage records of ``account`` on a cluster.
+
+        Returns the number of records removed.
+        """
+        return self._delete_by_account("usage_records", [account], cluster or self.current_cluster)
+
+    def delete_orphaned_usage(self) -> int:
+        """Delete usage records, on every cluster, whose account no longer exists."""
+        return self._delete_orphans("usage_records")
 
     def ensure_job_ids(self) -> None:
         """Assign job ids to records appended without one.
@@ -527,24 +807,101 @@ class SlurmDatabase:
         cluster: Optional[str] = None,
     ) -> list[UsageRecord]:
         """Get usage records with optional filtering."""
-        cl = cluster or self.current_cluster
-        records = [r for r in self.usage_records if r.cluster == cl]
-
-        if account:
-            records = [r for r in records if r.account == account]
-        if user:
-            records = [r for r in records if r.user == user]
-        if period:
-            records = [r for r in records if r.period == period]
+        return list(
+            self.query_usage_records(
+                (cluster or self.current_cluster,),
+                accounts=(account,) if account else None,
+                users=(user,) if user else None,
+                periods=(period,) if period else None,
+            )
+        )
 
-        return records
+    def query_usage_records(
+        self,
+        clusters: Collection[str],
+        *,
+        accounts: Optional[Collection[str]] = None,
+        users: Optional[Collection[str]] = None,
+        job_ids: Optional[Collection[int]] = None,
+        periods: Optional[Collection[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Iterator[UsageRecord]:
+        """Yield the usage records matching every given filter, in list order.
+
+        ``None`` leaves a filter out; an empty collection matches nothing.
+        ``start``/``end`` bound the record timestamp inclusively. With an
+        account filter only those accounts' records are visited, through the
+        per-account index; otherwise every record is checked in one pass.
+        """
+        records = self.usage_records
+        if accounts is not None:
+            index = self._account_index("usage_records")
+            positions = heapq.merge(*(index[a] for a in accounts if a in index))
+            candidates: Iterable[UsageRecord] = map(records.__getitem__, positions)
+            accounts = None  # every candidate already matches
+        else:
+            candidates = records
+        for r in candidates:
+            if r.cluster not in clusters:
+                continue
+            if accounts is not None and r.account not in accounts:
+                continue
+            if users is not None and r.user not in users:
+                continue
+            if job_ids is not None and r.job_id not in job_ids:
+                continue
+            if periods is not None and r.period not in periods:
+                continue
+            if start is not None and r.timestamp < start:
+                continue
+            if end is not None and r.timestamp > end:
+                continue
+            yield r
 
     def get_total_usage(
         self, account: str, period: Optional[str] = None, cluster: Optional[str] = None
     ) -> float:
         """Get total usage for account in period."""
-        records = self.get_usage_records(account=account, period=period, cluster=cluster)
-        return sum(r.node_hours for r in records)
+        cl = cluster or self.current_cluster
+        if not account:
+            records = self.query_usage_records((cl,), periods=(period,) if period else None)
+            return sum(r.node_hours for r in records)
+        return self._usage_totals_for(period, cl).get(account, 0)
+
+    def get_total_usage_bulk(
+        self, accounts: list[str], period: Optional[str] = None, cluster: Optional[str] = None
+    ) -> dict[str, float]:
+        """Get total usage for several accounts in one pass over the records.
+
+        Equivalent to calling ``get_total_usage`` per account; accounts
+        without usage map to 0.
+        """
+        totals = self._usage_totals_for(period, cluster or self.current_cluster)
+        return {account: totals.get(account, 0) for account in accounts}
+
+    def _usage_totals_for(self, period: Optional[str], cluster: str) -> dict[str, float]:
+        """Node-hours per account on ``cluster`` (in ``period`` when given).
+
+        Built in one pass over the records and reused until the records or
+        the database change; add_usage_record() folds new records in instead
+        of discarding the totals. Sums accumulate in record order, so they
+        equal a fresh ``sum()`` over the same records.
+        """
+        records = self.usage_records
+        stamp = (id(records), len(records), self._mutations)
+        if stamp != self._usage_totals_stamp:
+            self._usage_totals.clear()
+            self._usage_totals_stamp = stamp
+        key = (period or None, cluster)
+        totals = self._usage_totals.get(key)
+        if totals is None:
+            totals = {}
+            for r in records:
+                if r.cluster == cluster and (not period or r.period == period):
+                    totals[r.account] = totals.get(r.account, 0) + r.node_hours
+            self._usage_totals[key] = totals
+        return totals
 
     def get_period_usage(self, account: str, period: str, cluster: Optional[str] = None) -> float:
         """Get usage for specific period."""
@@ -560,12 +917,14 @@ class SlurmDatabase:
         account_obj = self.get_account(account)
         if account_obj:
             account_obj.allocation = allocation
+            self._bump()
 
     def reset_raw_usage(self, account: str) -> None:
         """Reset raw usage for account (simulates sacctmgr RawUsage=0)."""
         account_obj = self.get_account(account)
         if account_obj:
             account_obj.limits["raw_usage_reset"] = 1
+            self._bump()
 
     # --- Job methods (cluster-aware) ---
 
@@ -586,7 +945,22 @@ class SlurmDatabase:
 
     def add_job(self, job: Job) -> None:
         """Add job to database."""
+        if job.job_id in self.jobs:
+            # Replacing a job keeps the size, so the account index can't tell
+            self._account_indexes.pop("jobs", None)
         self.jobs[job.job_id] = job
+        self._bump()
+
+    def delete_account_jobs(self, account: str, cluster: Optional[str] = None) -> int:
+        """Delete the jobs of ``account`` on a cluster.
+
+        Returns the number of jobs removed.
+        """
+        return self._delete_by_account("jobs", [account], cluster or self.current_cluster)
+
+    def delete_orphaned_jobs(self) -> int:
+        """Delete jobs, on every cluster, whose account no longer exists."""
+        return self._delete_orphans("jobs")
 
     def get_job(self, job_id: str) -> Optional[Job]:
         """Get job by ID."""
@@ -598,16 +972,20 @@ class SlurmDatabase:
         user: Optional[str] = None,
         cluster: Optional[str] = None,
     ) -> list[Job]:
-        """List jobs with optional filtering."""
-        cl = cluster or self.current_cluster
-        jobs = [j for j in self.jobs.values() if j.cluster == cl]
+        """List jobs with optional filtering.
 
+        With an account only that account's jobs are visited, through the
+        per-account index; the remaining filters run in the same pass.
+        """
+        cl = cluster or self.current_cluster
         if account:
-            jobs = [j for j in jobs if j.account == account]
-        if user:
-            jobs = [j for j in jobs if j.user == user]
-
-        return jobs
+            jobs = self.jobs
+            candidates: Iterable[Job] = map(
+                jobs.__getitem__, self._account_index("jobs").get(account, ())
+            )
+        else:
+            candidates = self.jobs.values()
+        return [j for j in candidates if j.cluster == cl and (not user or j.user == user)]
 
     def bootstrap_default_qos(self) -> bool:
         """Seed a standard set of usable QoS classes when none are defined.
@@ -631,15 +1009,32 @@ class SlurmDatabase:
         ]
         for qos in defaults:
             self.qos_list[qos.name] = qos
+        self._bump()
         return True
 
     # --- State persistence ---
 
-    def save_state(self) -> None:
-        """Save database state to file."""
+    @contextmanager
+    def batch_writes(self) -> Iterator[None]:
+        """Defer ``save_state()`` calls and write once when the outermost batch exits.
+
+        The pending save also happens when the block raises, so the file ends
+        up as it would have with the individual saves.
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._save_deferred:
+                self._save_deferred = False
+                self.save_state()
+
+    def state_snapshot(self) -> dict[str, Any]:
+        """Return the JSON-ready dict ``save_state()`` writes."""
 
         def _serialize_cluster(cl: Cluster) -> dict:
-            d = asdict(cl)
+            d = _record_dict(cl)
             # Serialize enum to string value
             if isinstance(d.get("classification"), ClusterClassification):
                 d["classification"] = d["classification"].value
@@ -648,46 +1043,75 @@ class SlurmDatabase:
             return d
 
         def _serialize_job(job: Job) -> dict:
-            d = asdict(job)
+            d = _record_dict(job)
             for dt_field in ("submit_time", "start_time", "end_time"):
                 if d.get(dt_field) is not None:
                     d[dt_field] = d[dt_field].isoformat()
             return d
 
-        state = {
+        return {
             "_next_cluster_id": self._next_cluster_id,
             "_next_job_id": self._next_job_id,
             "clusters": {name: _serialize_cluster(cl) for name, cl in self.clusters.items()},
             "current_cluster": self.current_cluster,
-            "accounts": {key: asdict(acc) for key, acc in self.accounts.items()},
-            "users": {name: asdict(user) for name, user in self.users.items()},
-            "associations": {key: asdict(assoc) for key, assoc in self.associations.items()},
+            "accounts": {key: _record_dict(acc) for key, acc in self.accounts.items()},
+            "users": {name: _record_dict(user) for name, user in self.users.items()},
+            "associations": {
+                ":".join(key): _record_dict(assoc) for key, assoc in self.associations.items()
+            },
             "usage_records": [self._serialize_usage_record(r) for r in self.usage_records],
             "jobs": {jid: _serialize_job(job) for jid, job in self.jobs.items()},
-            "qos": {name: asdict(qos) for name, qos in self.qos_list.items()},
+            "qos": {name: _record_dict(qos) for name, qos in self.qos_list.items()},
         }
 
+    def save_state(self, skip_unchanged: bool = False) -> None:
+        """Save database state to file.
+
+        With ``skip_unchanged`` the write is skipped when the serialized
+        state equals what this instance last wrote and the state file is
+        still the one it wrote, so repeated saves of an untouched database
+        cost a comparison instead of a rewrite. A deleted or externally
+        replaced file is written again.
+        Inside ``batch_writes()`` the save is deferred to the end of the batch.
+        """
+        if self._batch_depth:
+            self._save_deferred = True
+            return
+
+        state = self.state_snapshot()
+        if skip_unchanged and self.is_saved(state):
+            return
+
         try:
-            # Lock-then-truncate so concurrent CLI/API processes never
-            # produce torn JSON: open("w") would truncate before the
-            # lock is held, letting a LOCK_SH reader observe an empty
-            # file (or a second writer leave trailing bytes). Whole-file
-            # last-writer-wins semantics are unchanged.
-            with self.state_file.open("a+") as f:
-                fcntl.flock(f, fcntl.LOCK_EX)
-                f.seek(0)
-                f.truncate()
-                json.dump(state, f, indent=2)
+            # One-shot compact encode: json.dump() with indent runs the
+            # pure-Python encoder chunk by chunk; dumps() without it
+            # uses the C encoder and writes about half the bytes.
+            payload = json.dumps(state, separators=(",", ":"))
+            written = write_atomic(self.state_file, payload)
+            self._last_saved_state = state
+            self._last_saved_file = (written.st_ino, written.st_mtime_ns)
         except Exception as e:
             print(f"Warning: Failed to save database state: {e}")
 
+    def is_saved(self, state: dict[str, Any]) -> bool:
+        """Whether ``state`` is what this instance last wrote and the file still holds it."""
+        if self._last_saved_file is None or state != self._last_saved_state:
+            return False
+        try:
+            current = self.state_file.stat()
+        except OSError:
+            return False
+        return (current.st_ino, current.st_mtime_ns) == self._last_saved_file
+
     def load_state(self) -> None:
         """Load database state from file with backward-compatible migration."""
         try:
             if self.state_file.exists():
-                with self.state_file.open() as f:
-                    fcntl.flock(f, fcntl.LOCK_SH)
-                    state = json.load(f)
+                # One binary read handed to json.loads, which decodes the
+                # UTF-8 in a single step: no text-layer chunked decoding or
+                # newline translation over the whole snapshot.
+                with self.state_file.open("rb") as f:
+                    state = json.loads(f.read())
 
                 self._next_cluster_id = state.get("_next_cluster_id", 1)
                 self._next_job_id = state.get("_next_job_id", 1)
@@ -735,6 +1159,9 @@ class SlurmDatabase:
                     # Avoid duplicates — first one wins
                     if name not in self.accounts:
                         self.accounts[name] = Account(**data)
+                self._non_root_view = None
+                # Every collection is replaced below
+                self._account_indexes.clear()
 
                 # Load users
                 self.users = {}
@@ -767,15 +1194,25 @@ class SlurmDatabase:
 
                     assoc = Association(**data)
                     # Migrate older keys ("user:account" or "user:account:cluster")
-                    # to the new "user:account:cluster:partition" form.
-                    parts = key.split(":")
-                    if len(parts) == 2:
-                        key = self._association_key(
-                            parts[0], parts[1], assoc.cluster, assoc.partition
+                    # to the new "user:account:cluster:partition" form. Current
+                    # keys have three colons; split from the right so a colon
+                    # in the user name survives. A key without any colon says
+                    # nothing usable, so the row's own fields rebuild it.
+                    colons = key.count(":")
+                    if not colons:
+                        assoc_key = self._association_key(
+                            assoc.user, assoc.account, assoc.cluster, assoc.partition
+                        )
+                    elif colons in (1, 2):
+                        parts = key.split(":")
+                        key_cluster = parts[2] if colons == 2 else assoc.cluster
+                        assoc_key = self._association_key(
+                            parts[0], parts[1], key_cluster, assoc.partition
                         )
-                    elif len(parts) == 3:
-                        key = self._association_key(parts[0], parts[1], parts[2], assoc.partition)
-                    self.associations[key] = assoc
+                    else:
+                        user, account, key_cluster, partition = key.rsplit(":", 3)
+                        assoc_key = (user, account, key_cluster, partition)
+                    self.associations[assoc_key] = assoc
 
                 # Load usage records
                 self.usage_records = []
@@ -800,17 +1237,29 @@ class SlurmDatabase:
                 for name, data in state.get("qos", {}).items():
                     self.qos_list[name] = QOS(**data)
 
+                self._bump()
+
         except Exception as e:
             print(f"Warning: Failed to load database state: {e}")
 
     def _serialize_usage_record(self, record: UsageRecord) -> dict[str, Any]:
         """Serialize usage record for JSON storage."""
-        data = asdict(record)
+        data = _record_dict(record)
         data["timestamp"] = record.timestamp.isoformat()
         return data
 
     def _deserialize_usage_record(self, data: dict[str, Any]) -> UsageRecord:
-        """Deserialize usage record from JSON storage."""
+        """Deserialize usage record from JSON storage.
+
+        The string fields repeat across thousands of records but json.load
+        returns a fresh copy for every value, so they are interned: one
+        shared object per distinct name, and equal names compare by identity
+        in the filter loops.
+        """
+        for key in _INTERNED_RECORD_FIELDS:
+            value = data.get(key)
+            if isinstance(value, str):
+                data[key] = sys.intern(value)
         data["timestamp"] = datetime.fromisoformat(data["timestamp"])
         data.setdefault("job_id", None)
         data.setdefault("state", "COMPLETED")
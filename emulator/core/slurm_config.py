@@ -1,9 +1,12 @@
 """SLURM configuration parser and behavior adapter."""
 
-import re
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Any, Callable, Optional
 
+# A timespec holds only digits, colons, and dashes
+_TIMESPEC_CHARS = frozenset("0123456789:-")
+
 
 class SlurmConfigParser:
     """Parse and interpret SLURM configuration files."""
@@ -11,6 +14,8 @@ class SlurmConfigParser:
     def __init__(self, config_path: Optional[str] = None):
         self.config: dict[str, Any] = {}
         self.raw_config: dict[str, str] = {}
+        # get_emulator_config() result; reset whenever the config is rebuilt
+        self._emulator_config: Optional[dict[str, Any]] = None
 
         if config_path:
             self.load_config(config_path)
@@ -28,44 +33,33 @@ class SlurmConfigParser:
         print(f"📄 Loading SLURM configuration from {config_path}")
 
         with config_file.open() as f:
-            content = f.read()
-
-        self._parse_config_content(content)
+            self._parse_config_content(f)
         self._process_config_values()
 
         print(f"✅ Loaded {len(self.config)} configuration parameters")
 
-    def _parse_config_content(self, content: str) -> None:
-        """Parse the raw configuration content."""
-        for line_num, line in enumerate(content.split("\n"), 1):
-            line = line.strip()
-
-            # Skip comments and empty lines
-            if not line or line.startswith("#"):
-                continue
-
-            # Handle inline comments
-            if "#" in line:
-                line = line.split("#")[0].strip()
+    def _parse_config_content(self, lines: Iterable[str]) -> None:
+        """Parse raw configuration lines, e.g. straight from the open file."""
+        for raw_line in lines:
+            # Drop comments (whole-line and inline) and surrounding blanks
+            line = raw_line.partition("#")[0].strip()
 
             # Parse key=value pairs
-            if "=" in line:
-                try:
-                    key, value = line.split("=", 1)
-                    key = key.strip()
-                    value = value.strip()
-
-                    # Remove quotes if present
-                    if value.startswith('"') and value.endswith('"'):
-                        value = value[1:-1]
+            key, sep, value = line.partition("=")
+            if not sep:
+                continue
+            key = key.strip()
+            value = value.strip()
 
-                    self.raw_config[key] = value
+            # Remove quotes if present
+            if value.startswith('"') and value.endswith('"'):
+                value = value[1:-1]
 
-                except ValueError:
-                    print(f"Warning: Could not parse line {line_num}: {line}")
+            self.raw_config[key] = value
 
     def _process_config_values(self) -> None:
         """Process and validate configuration values."""
+        self._emulator_config = None
         processors: dict[str, Callable[[str], Any]] = {
             "PriorityDecayHalfLife": self._parse_time_duration,
             "PriorityCalcPeriod": self._parse_time_duration,
@@ -120,49 +114,28 @@ class SlurmConfigParser:
         if string.upper() in ["-1", "INFINITE", "UNLIMITED"]:
             return -1  # INFINITE
 
-        if not self._is_valid_timespec(string):
+        if not _TIMESPEC_CHARS.issuperset(string):
             return -2  # NO_VAL
 
-        d = h = m = s = 0
-
-        if "-" in string:
+        # One partition and one split; only the fields used are converted
+        day_part, dashed, time_part = string.partition("-")
+        if dashed:
             # days-[hours[:minutes[:seconds]]] format
-            parts = string.split("-", 1)
-            d = int(parts[0])
-            time_part = parts[1] if len(parts) > 1 else "0:0:0"
-
-            time_components = time_part.split(":")
-            if len(time_components) >= 1:
-                h = int(time_components[0])
-            if len(time_components) >= 2:
-                m = int(time_components[1])
-            if len(time_components) >= 3:
-                s = int(time_components[2])
-
-            d *= 86400  # days to seconds
-            h *= 3600  # hours to seconds
-            m *= 60  # minutes to seconds
-        else:
-            time_components = string.split(":")
-            if len(time_components) == 3:
-                # hours:minutes:seconds
-                h = int(time_components[0]) * 3600
-                m = int(time_components[1]) * 60
-                s = int(time_components[2])
-            elif len(time_components) == 2:
-                m = int(time_components[0]) * 60
-                s = int(time_components[1])
-            elif len(time_components) == 1:
-                # just minutes
-                m = int(time_components[0]) * 60
-
-        return d + h + m + s
-
-    def _is_valid_timespec(self, string: str) -> bool:
-        """Validate time specification format."""
-        # Basic validation - contains only digits, colons, and dashes
-        pattern = r"^[\d:-]+$"
-        return bool(re.match(pattern, string))
+            secs = int(day_part) * 86400
+            for value, scale in zip(time_part.split(":", 3), (3600, 60, 1)):
+                secs += int(value) * scale
+            return secs
+
+        fields = string.split(":")
+        if len(fields) == 3:
+            # hours:minutes:seconds
+            return int(fields[0]) * 3600 + int(fields[1]) * 60 + int(fields[2])
+        if len(fields) == 2:
+            return int(fields[0]) * 60 + int(fields[1])
+        if len(fields) == 1:
+            # just minutes
+            return int(fields[0]) * 60
+        return 0
 
     def _parse_usage_reset_period(self, value: str) -> Optional[int]:
         """Parse usage reset period."""
@@ -201,6 +174,7 @@ class SlurmConfigParser:
 
     def _set_defaults(self) -> None:
         """Set reasonable default values."""
+        self._emulator_config = None
         self.config = {
             "PriorityDecayHalfLife": 15 * 24 * 60,  # 15 days in minutes
             "PriorityCalcPeriod": 5,  # 5 minutes
@@ -309,14 +283,19 @@ class SlurmConfigParser:
         return warnings
 
     def get_emulator_config(self) -> dict[str, Any]:
-        """Get configuration formatted for emulator components."""
-        return {
-            "decay_half_life_days": self.get_decay_half_life_days(),
-            "tres_billing_weights": self.get_tres_billing_weights(),
-            "manual_usage_reset": self.is_manual_usage_reset(),
-            "qos_weight": self.get_qos_weight(),
-            "fairshare_weight": self.get_fairshare_weight(),
-            "dampening_factor": self.get_dampening_factor(),
-            "priority_flags": self.config.get("PriorityFlags", []),
-            "supports_tres_billing": self.supports_tres_billing(),
-        }
+        """Get configuration formatted for emulator components.
+
+        Built once per loaded configuration and shared between callers.
+        """
+        if self._emulator_config is None:
+            self._emulator_config = {
+                "decay_half_life_days": self.get_decay_half_life_days(),
+                "tres_billing_weights": self.get_tres_billing_weights(),
+                "manual_usage_reset": self.is_manual_usage_reset(),
+                "qos_weight": self.get_qos_weight(),
+                "fairshare_weight": self.get_fairshare_weight(),
+                "dampening_factor": self.get_dampening_factor(),
+                "priority_flags": self.config.get("PriorityFlags", []),
+                "supports_tres_billing": self.supports_tres_billing(),
+            }
+        return self._emulator_config
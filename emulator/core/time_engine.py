@@ -1,12 +1,36 @@
 """Time manipulation engine for SLURM emulator."""
 
+import calendar
+import contextlib
+import functools
 import json
 import os
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Callable, Optional
 
-from dateutil.relativedelta import relativedelta
+from emulator.core.atomic_write import write_atomic
+
+
+def _add_months(dt: datetime, months: int) -> datetime:
+    """Shift ``dt`` by whole months, clamping the day to the target month's length."""
+    year, month0 = divmod(dt.year * 12 + dt.month - 1 + months, 12)
+    month = month0 + 1
+    day = min(dt.day, calendar.monthrange(year, month)[1])
+    return dt.replace(year=year, month=month, day=day)
+
+
+@functools.lru_cache(maxsize=4)
+def _month_window(year: int, month: int) -> tuple[str, str]:
+    """First and last second of a month, formatted for SLURM commands."""
+    month_start = datetime(year, month, 1)
+    month_end = _add_months(month_start, 1) - timedelta(seconds=1)
+    return (month_start.strftime("%Y-%m-%dT%H:%M:%S"), month_end.strftime("%Y-%m-%dT%H:%M:%S"))
+
+
+def time_file_path() -> Path:
+    """Time file named by ``SLURM_EMULATOR_TIME_FILE``, else the shared default."""
+    return Path(os.environ.get("SLURM_EMULATOR_TIME_FILE", "/tmp/slurm_emulator_time.json"))
 
 
 class TimeEngine:
@@ -15,9 +39,9 @@ class TimeEngine:
     def __init__(self, start_time: Optional[datetime] = None):
         self.current_time = start_time or datetime(2024, 1, 1)
         self.time_callbacks: list[Callable] = []
-        self.state_file = Path(
-            os.environ.get("SLURM_EMULATOR_TIME_FILE", "/tmp/slurm_emulator_time.json")
-        )
+        # ((year, quarter), quarter string) pair memoizing get_current_quarter()
+        self._quarter_cache: Optional[tuple[tuple[int, int], str]] = None
+        self.state_file = time_file_path()
         self._load_state()
 
     def advance_time(self, days: int = 0, months: int = 0, quarters: int = 0) -> None:
@@ -25,11 +49,12 @@ class TimeEngine:
         if quarters:
             months += quarters * 3
         if months:
-            self.current_time = self.current_time + relativedelta(months=months)
+            self.current_time = _add_months(self.current_time, months)
         if days:
             self.current_time = self.current_time + timedelta(days=days)
 
-        self._save_state()
+        if months or days:
+            self._save_state()
         self._trigger_time_callbacks()
 
     def set_time(self, target_time: datetime) -> None:
@@ -49,10 +74,21 @@ class TimeEngine:
         return self.current_time
 
     def get_current_quarter(self) -> str:
-        """Get current quarter info for period calculations."""
-        year = self.current_time.year
-        quarter = (self.current_time.month - 1) // 3 + 1
-        return f"{year}-Q{quarter}"
+        """Get current quarter info for period calculations.
+
+        The result is memoized against the ``(year, quarter)`` of
+        ``current_time``, so clock moves within a quarter reuse the same
+        string while crossing into another quarter rebuilds it.
+        """
+        current = self.current_time
+        key = (current.year, (current.month - 1) // 3 + 1)
+        cached = self._quarter_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        quarter_str = f"{key[0]}-Q{key[1]}"
+        self._quarter_cache = (key, quarter_str)
+        return quarter_str
 
     def get_quarter_start_end(self, quarter_str: Optional[str] = None) -> tuple[datetime, datetime]:
         """Get start/end dates for quarter."""
@@ -66,7 +102,7 @@ class TimeEngine:
 
         start_month = (quarter - 1) * 3 + 1
         start_date = datetime(year, start_month, 1)
-        end_date = start_date + relativedelta(months=3) - timedelta(days=1)
+        end_date = _add_months(start_date, 3) - timedelta(days=1)
 
         return start_date, end_date
 
@@ -91,13 +127,10 @@ class TimeEngine:
                 print(f"Warning: Time callback failed: {e}")
 
     def _save_state(self) -> None:
-        """Save current time state to file."""
+        """Save current time state to file, replacing it atomically."""
         state = {"current_time": self.current_time.isoformat()}
-        try:
-            with self.state_file.open("w") as f:
-                json.dump(state, f)
-        except Exception:
-            pass  # Ignore save errors
+        with contextlib.suppress(Exception):  # Ignore save errors
+            write_atomic(self.state_file, json.dumps(state))
 
     def _load_state(self) -> None:
         """Load time state from file."""
@@ -110,8 +143,9 @@ class TimeEngine:
             pass  # Ignore load errors
 
     def format_current_month(self) -> tuple[str, str]:
-        """Format current month start/end for SLURM commands."""
-        month_start = self.current_time.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        month_end = month_start + relativedelta(months=1) - timedelta(seconds=1)
+        """Format current month start/end for SLURM commands.
 
-        return (month_start.strftime("%Y-%m-%dT%H:%M:%S"), month_end.strftime("%Y-%m-%dT%H:%M:%S"))
+        Memoized per (year, month): the clock rarely leaves the month
+        between calls.
+        """
+        return _month_window(self.current_time.year, self.current_time.month)
@@ -1,11 +1,16 @@
 """Usage simulation for injecting node-hour consumption."""
 
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional
 
 from emulator.core.database import SlurmDatabase, UsageRecord
 from emulator.core.time_engine import TimeEngine
 
+# Standard node: 64 CPUs, 512GB RAM, 4 GPUs
+_CPUS_PER_NODE: int = 64
+_MEM_GB_PER_NODE: int = 512
+_GPUS_PER_NODE: int = 4
+
 
 class UsageSimulator:
     """Simulates user usage patterns and injection."""
@@ -18,6 +23,12 @@ class UsageSimulator:
             "Mem": 0.001953125,  # 512 GB = 1 billing unit
             "GRES/gpu": 0.25,  # 4 GPUs = 1 billing unit
         }
+        # Pattern type -> bound generator used by inject_usage_pattern()
+        self._patterns: dict[str, Callable[[str, str, dict], None]] = {
+            "steady": self._steady_pattern,
+            "bursty": self._bursty_pattern,
+            "end_of_period": self._end_of_period_pattern,
+        }
 
     def inject_usage(
         self,
@@ -32,49 +43,70 @@ class UsageSimulator:
             at_time = self.time_engine.get_current_time()
 
         cl = cluster or self.database.current_cluster
+        self._ensure_association(account, user, cl)
+        self._record_usage(
+            account,
+            user,
+            node_hours,
+            at_time,
+            period=self.time_engine.get_current_quarter(),
+            raw_tres=self._convert_to_raw_tres(node_hours),
+            cluster=cl,
+        )
 
-        # Ensure user and account exist
-        if not self.database.get_user(user):
-            self.database.add_user(user, account)
-
-        if not self.database.get_account(account):
-            self.database.add_account(account, f"Account {account}", "emulator")
-
-        # Ensure association exists
-        if not self.database.get_association(user, account, cluster=cl):
-            self.database.add_association(user, account, cluster=cl)
+        # Save state after injection
+        self.database.save_state()
 
-        # Create usage record
+    def _record_usage(
+        self,
+        account: str,
+        user: str,
+        node_hours: float,
+        at_time: datetime,
+        *,
+        period: str,
+        raw_tres: dict[str, int],
+        cluster: str,
+    ) -> None:
+        """Add one usage record for an existing association and report it."""
         usage_record = UsageRecord(
             account=account,
             user=user,
             node_hours=node_hours,
             billing_units=node_hours,  # 1:1 for node-hour billing
             timestamp=at_time,
-            period=self.time_engine.get_current_quarter(),
-            raw_tres=self._convert_to_raw_tres(node_hours),
-            cluster=cl,
+            period=period,
+            raw_tres=raw_tres,
+            cluster=cluster,
         )
 
         self.database.add_usage_record(usage_record)
         print(f"💾 Injected {node_hours}Nh usage for {user} in {account} at {at_time}")
 
-        # Save state after injection
-        self.database.save_state()
+    def _ensure_association(self, account: str, user: str, cluster: str) -> None:
+        """Create the user, account and association usage is recorded against."""
+        if not self.database.get_user(user):
+            self.database.add_user(user, account)
+
+        if not self.database.get_account(account):
+            self.database.add_account(account, f"Account {account}", "emulator")
+
+        if not self.database.get_association(user, account, cluster=cluster):
+            self.database.add_association(user, account, cluster=cluster)
 
     def inject_usage_pattern(self, account: str, user: str, pattern_config: dict) -> None:
-        """Inject usage following a pattern over time."""
-        pattern_type = pattern_config.get("type", "steady")
+        """Inject usage following a pattern over time.
 
-        if pattern_type == "steady":
-            self._steady_pattern(account, user, pattern_config)
-        elif pattern_type == "bursty":
-            self._bursty_pattern(account, user, pattern_config)
-        elif pattern_type == "end_of_period":
-            self._end_of_period_pattern(account, user, pattern_config)
-        else:
+        The per-injection saves are batched into one state write.
+        """
+        pattern_type = pattern_config.get("type", "steady")
+        pattern = self._patterns.get(pattern_type)
+        if pattern is None:
             raise ValueError(f"Unknown pattern type: {pattern_type}")
 
+        with self.database.batch_writes():
+            pattern(account, user, pattern_config)
+
     def simulate_sequence_scenario(self) -> None:
         """Run the exact scenario from SLURM_PERIODIC_LIMITS_SEQUENCE.md."""
         account = "slurm_account_123"
@@ -155,26 +187,44 @@ class UsageSimulator:
 
     def _convert_to_raw_tres(self, node_hours: float) -> dict[str, int]:
         """Convert billing units to raw TRES based on standard node config."""
-        # Standard node: 64 CPUs, 512GB RAM, 4 GPUs
         # Include "node" component for site agent compatibility
         return {
             "node-hours": int(node_hours),  # Direct node-hours mapping for site agent
-            "CPU": int(node_hours * 64),
-            "Mem": int(node_hours * 512),  # GB
-            "GRES/gpu": int(node_hours * 4),
+            "CPU": int(node_hours * _CPUS_PER_NODE),
+            "Mem": int(node_hours * _MEM_GB_PER_NODE),  # GB
+            "GRES/gpu": int(node_hours * _GPUS_PER_NODE),
         }
 
     def _steady_pattern(self, account: str, user: str, config: dict) -> None:
-        """Generate steady usage pattern over time period."""
+        """Generate steady usage pattern over time period.
+
+        Every day gets the same amount, so the association checks, period
+        and TRES conversion are done once rather than per injected record.
+        """
         total_usage = config["total_usage"]
         days = config.get("days", 30)
         daily_usage = total_usage / days
 
-        start_time = self.time_engine.get_current_time()
+        usage_time = self.time_engine.get_current_time()
+        cluster = self.database.current_cluster
+        self._ensure_association(account, user, cluster)
+        period = self.time_engine.get_current_quarter()
+        raw_tres = self._convert_to_raw_tres(daily_usage)
+        one_day = timedelta(days=1)
+
+        for _ in range(days):
+            self._record_usage(
+                account,
+                user,
+                daily_usage,
+                usage_time,
+                period=period,
+                raw_tres=dict(raw_tres),
+                cluster=cluster,
+            )
+            usage_time += one_day
 
-        for day in range(days):
-            usage_time = start_time + timedelta(days=day)
-            self.inject_usage(account, user, daily_usage, usage_time)
+        self.database.save_state()
 
     def _bursty_pattern(self, account: str, user: str, config: dict) -> None:
         """Generate bursty usage pattern with irregular spikes."""
@@ -2,6 +2,10 @@
 
 from __future__ import annotations
 
+import functools
+import json
+from collections.abc import Iterator
+from contextlib import contextmanager
 from typing import Any, Optional
 
 from emulator.core.database import SlurmDatabase
@@ -9,6 +13,11 @@ from emulator.core.time_engine import TimeEngine
 from emulator.core.usage_simulator import UsageSimulator
 
 
+@functools.lru_cache(maxsize=256)
+def _decay_factor(days_elapsed: float, half_life: float) -> float:
+    return 2 ** (-days_elapsed / half_life)
+
+
 class PeriodicLimitsCalculator:
     """Calculates periodic limits with decay and carryover logic."""
 
@@ -35,11 +44,29 @@ class PeriodicLimitsCalculator:
             self.qos_weight = 500000
             self.fairshare_weight = 259200
 
+        # Per-command memo for calculate_periodic_settings; None outside request_cache()
+        self._settings_cache: Optional[dict[tuple, dict]] = None
+
+    @contextmanager
+    def request_cache(self) -> Iterator[None]:
+        """Memoize periodic settings for the duration of a single command.
+
+        Nested uses share the outermost cache.
+        """
+        if self._settings_cache is not None:
+            yield
+            return
+        self._settings_cache = {}
+        try:
+            yield
+        finally:
+            self._settings_cache = None
+
     def calculate_decay_factor(self, days_elapsed: int, half_life: Optional[float] = None) -> float:
         """Calculate decay factor using half-life formula."""
         if half_life is None:
             half_life = self.half_life_days
-        return 2 ** (-days_elapsed / half_life)
+        return _decay_factor(days_elapsed, half_life)
 
     def calculate_fairshare(self, allocation: int, num_accounts: int = 3) -> int:
         """Calculate fairshare value based on allocation."""
@@ -108,6 +135,29 @@ class PeriodicLimitsCalculator:
         self, account: str, config: Optional[dict[Any, Any]] = None, cluster: Optional[str] = None
     ) -> dict:
         """Calculate all periodic settings for an account."""
+        cache = self._settings_cache
+        if cache is None:
+            return self._calculate_periodic_settings(account, config, cluster)
+
+        account_obj = self.database.get_account(account)
+        key = (
+            account,
+            json.dumps(config, sort_keys=True, default=str),
+            cluster,
+            self.time_engine.get_current_quarter(),
+            self.database.state_token(),
+            # Scenario actions edit these attributes in place, bypassing the database
+            account_obj and (account_obj.allocation, account_obj.last_period),
+        )
+        settings = cache.get(key)
+        if settings is None:
+            settings = cache[key] = self._calculate_periodic_settings(account, config, cluster)
+        # Copy the nested details too, so callers can't edit the cached entry
+        return {**settings, "carryover_details": dict(settings["carryover_details"])}
+
+    def _calculate_periodic_settings(
+        self, account: str, config: Optional[dict[Any, Any]], cluster: Optional[str]
+    ) -> dict:
         if config is None:
             config = {
                 "grace_ratio": 0.2,
@@ -149,11 +149,14 @@ class ScenarioRegistry:
 
     def __init__(self) -> None:
         self.scenarios: dict[str, ScenarioDefinition] = {}
+        # Scenarios grouped by type, built on first use and reset on register
+        self._by_type: Optional[dict[ScenarioType, list[ScenarioDefinition]]] = None
         self._register_built_in_scenarios()
 
     def register_scenario(self, scenario: ScenarioDefinition) -> None:
         """Register a scenario."""
         self.scenarios[scenario.name] = scenario
+        self._by_type = None
 
     def get_scenario(self, name: str) -> Optional[ScenarioDefinition]:
         """Get scenario by name."""
@@ -165,7 +168,12 @@ class ScenarioRegistry:
 
     def list_by_type(self, scenario_type: ScenarioType) -> list[ScenarioDefinition]:
         """List scenarios by type."""
-        return [s for s in self.scenarios.values() if s.scenario_type == scenario_type]
+        if self._by_type is None:
+            by_type: dict[ScenarioType, list[ScenarioDefinition]] = {}
+            for scenario in self.scenarios.values():
+                by_type.setdefault(scenario.scenario_type, []).append(scenario)
+            self._by_type = by_type
+        return list(self._by_type.get(scenario_type, ()))
 
     def search_scenarios(self, query: str) -> list[ScenarioDefinition]:
         """Search scenarios by name, title, or description."""
@@ -1,11 +1,19 @@
 """Basic functionality tests that should pass."""
 
+import sys
 from datetime import datetime
 
-from emulator.core.database import SlurmDatabase
+import pytest
+
+from emulator.core.atomic_write import write_atomic
+from emulator.core.database import QOS, SlurmDatabase, UsageRecord
 from emulator.core.time_engine import TimeEngine
 from emulator.core.usage_simulator import UsageSimulator
-from emulator.scenarios.scenario_registry import ScenarioRegistry
+from emulator.scenarios.scenario_registry import (
+    ScenarioDefinition,
+    ScenarioRegistry,
+    ScenarioType,
+)
 from emulator.scenarios.sequence_scenario import SequenceScenario
 
 
@@ -31,6 +39,148 @@ class TestBasicDatabase:
         assert account.name == "test_account"
         assert account.description == "Test Description"
 
+    def test_state_token_tracks_changes(self):
+        """Test the state token moves on method calls and direct edits."""
+        token = self.db.state_token()
+        assert self.db.state_token() == token
+
+        self.db.add_account("tok_account", "Token", "Org")
+        assert self.db.state_token() != token
+
+        token = self.db.state_token()
+        self.db.set_account_allocation("tok_account", 5)
+        assert self.db.state_token() != token
+
+        token = self.db.state_token()
+        self.db.associations.pop(next(iter(self.db.associations)))
+        assert self.db.state_token() != token
+
+    def test_save_state_skip_unchanged(self, state_env):
+        """Test skip_unchanged only writes when the state or the file differs."""
+        db = SlurmDatabase()
+        db.save_state()
+        written = db.state_file.stat()
+
+        db.save_state(skip_unchanged=True)
+        assert db.state_file.stat() == written
+
+        # A deleted or replaced file is restored even though nothing changed
+        db.state_file.unlink()
+        db.save_state(skip_unchanged=True)
+        saved = db.state_file.read_text()
+        db.state_file.write_text("{}")
+        db.save_state(skip_unchanged=True)
+        assert db.state_file.read_text() == saved
+
+        db.add_account("saved_account", "Saved", "Org")
+        db.save_state(skip_unchanged=True)
+        assert db.state_file.exists()
+
+        reloaded = SlurmDatabase()
+        reloaded.load_state()
+        assert reloaded.get_account("saved_account") is not None
+        assert (state_env / "db.json") == db.state_file
+
+    @pytest.mark.usefixtures("state_env")
+    def test_save_state_sees_nested_limit_changes(self):
+        """Test in-place edits of a limits dict still count as a change."""
+        db = SlurmDatabase()
+        db.add_account("limited", "Limited", "Org")
+        db.save_state()
+        db.state_file.unlink()
+
+        db.get_account("limited").limits["GrpTRESMins:billing"] = 100
+        db.save_state(skip_unchanged=True)
+        reloaded = SlurmDatabase()
+        reloaded.load_state()
+        assert reloaded.get_account("limited").limits == {"GrpTRESMins:billing": 100}
+
+    def test_save_state_replaces_file_atomically(self, state_env):
+        """Test saves leave no temp files and a failed save keeps the old state."""
+        db = SlurmDatabase()
+        db.add_account("kept", "Kept", "Org")
+        db.save_state()
+        assert [p.name for p in state_env.iterdir()] == ["db.json"]
+
+        before = db.state_file.read_text()
+        db.get_account("kept").limits["bad"] = object()
+        db.save_state()
+        assert db.state_file.read_text() == before
+        assert [p.name for p in state_env.iterdir()] == ["db.json"]
+
+    def test_write_atomic_keeps_old_file_on_failure(self, tmp_path):
+        """Test a failed atomic write leaves the old file and no temp file behind."""
+        target = tmp_path / "state.json"
+        written = write_atomic(target, "{}")
+        assert target.read_text() == "{}"
+        assert (target.stat().st_ino, target.stat().st_mtime_ns) == (
+            written.st_ino,
+            written.st_mtime_ns,
+        )
+
+        with pytest.raises(TypeError):
+            write_atomic(target, None)
+        assert target.read_text() == "{}"
+        assert [p.name for p in tmp_path.iterdir()] == ["state.json"]
+
+    def test_batch_writes_defers_saves(self, state_env):
+        """Test saves inside batch_writes() happen once, when the outer batch exits."""
+        db = SlurmDatabase()
+        with db.batch_writes():
+            db.add_account("batched", "Batched", "Org")
+            db.save_state()
+            with db.batch_writes():
+                db.save_state()
+            assert not db.state_file.exists()
+        assert db.state_file.exists()
+
+        reloaded = SlurmDatabase()
+        reloaded.load_state()
+        assert reloaded.get_account("batched") is not None
+
+        db.state_file.unlink()
+        with db.batch_writes():
+            pass
+        assert not db.state_file.exists()
+
+    def test_list_non_root_accounts(self):
+        """Test the non-root view follows account additions and deletions."""
+        assert self.db.list_non_root_accounts() == []
+
+        self.db.add_account("acct_a", "A", "Org")
+        self.db.add_account("acct_b", "B", "Org")
+        assert [a.name for a in self.db.list_non_root_accounts()] == ["acct_a", "acct_b"]
+
+        self.db.delete_account("acct_a")
+        assert [a.name for a in self.db.list_non_root_accounts()] == ["acct_b"]
+
+    def test_upsert_and_delete_account(self):
+        """Test upsert replaces settings and delete reports existence."""
+        self.db.add_account("upsert_acc", "Old", "Org")
+        self.db.get_account("upsert_acc").fairshare = 42
+
+        account = self.db.upsert_account("Upsert_Acc", "New", "Org", 250)
+        assert account is self.db.get_account("upsert_acc")
+        assert (account.description, account.fairshare, account.allocation) == ("New", 1, 250)
+
+        assert self.db.delete_account("upsert_acc") is True
+        assert self.db.delete_account("upsert_acc") is False
+
+    def test_records_have_no_instance_dict(self):
+        """Test the bulk record types are slotted and still serialise."""
+        if sys.version_info < (3, 10):
+            pytest.skip("dataclass slots need Python 3.10+")
+        self.db.add_account("slot_acc", "Slots", "Org")
+        record = UsageRecord("slot_acc", "alice", 1.0, 1.0, datetime(2024, 1, 5), "2024-Q1")
+        self.db.add_usage_record(record)
+        assert not hasattr(record, "__dict__")
+        assert not hasattr(self.db.get_account("slot_acc"), "__dict__")
+        self.db.add_user("slot_user")
+        for obj in (self.db.get_user("slot_user"), self.db.clusters["default"], QOS("slot_qos")):
+            assert not hasattr(obj, "__dict__")
+        data = self.db._serialize_usage_record(record)
+        assert self.db._deserialize_usage_record(data) == record
+
     def test_user_operations(self):
         """Test basic user operations."""
         self.db.add_user("test_user", "test_account")
@@ -60,6 +210,65 @@ class TestBasicTimeEngine:
         assert "Q" in quarter
         assert len(quarter.split("-")) == 2
 
+    @pytest.mark.usefixtures("state_env")
+    def test_quarter_follows_time_changes(self):
+        """Test the memoized quarter is refreshed when time moves."""
+        time_engine = TimeEngine()
+        time_engine.set_time(datetime(2024, 2, 15))
+        assert time_engine.get_current_quarter() == "2024-Q1"
+        time_engine.advance_time(months=2)
+        assert time_engine.get_current_quarter() == "2024-Q2"
+        time_engine.set_time(datetime(2025, 12, 31))
+        assert time_engine.get_current_quarter() == "2025-Q4"
+
+    @pytest.mark.usefixtures("state_env")
+    def test_quarter_reused_within_quarter(self):
+        """Test moving the clock inside a quarter keeps the memoized string."""
+        time_engine = TimeEngine(datetime(2024, 4, 1))
+        quarter = time_engine.get_current_quarter()
+        time_engine.advance_time(days=45)
+        assert time_engine.get_current_quarter() is quarter
+        time_engine.advance_time(days=46)
+        assert time_engine.get_current_quarter() == "2024-Q3"
+
+    @pytest.mark.usefixtures("state_env")
+    def test_month_window_follows_time_changes(self):
+        """Test the memoized month window is keyed on the current month."""
+        time_engine = TimeEngine()
+        time_engine.set_time(datetime(2024, 2, 15, 13, 30))
+        assert time_engine.format_current_month() == ("2024-02-01T00:00:00", "2024-02-29T23:59:59")
+        time_engine.advance_time(months=10)
+        assert time_engine.format_current_month() == ("2024-12-01T00:00:00", "2024-12-31T23:59:59")
+
+    @pytest.mark.usefixtures("state_env")
+    def test_month_arithmetic_clamps_to_month_end(self):
+        """Test month advances keep the day within the target month."""
+        time_engine = TimeEngine(datetime(2024, 1, 31, 8, 15))
+        time_engine.advance_time(months=1)
+        assert time_engine.get_current_time() == datetime(2024, 2, 29, 8, 15)
+        time_engine.advance_time(months=-14)
+        assert time_engine.get_current_time() == datetime(2022, 12, 29, 8, 15)
+        time_engine.advance_time(quarters=5)
+        assert time_engine.get_current_time() == datetime(2024, 3, 29, 8, 15)
+        assert time_engine.get_quarter_start_end("2023-Q4") == (
+            datetime(2023, 10, 1),
+            datetime(2023, 12, 31),
+        )
+
+    def test_time_state_written_atomically(self, state_env):
+        """Test time saves replace the file and a no-op advance skips the write."""
+        time_engine = TimeEngine()
+        time_engine.set_time(datetime(2024, 5, 1))
+        assert [p.name for p in state_env.iterdir()] == ["time.json"]
+
+        (state_env / "time.json").unlink()
+        time_engine.advance_time()
+        assert not (state_env / "time.json").exists()
+
+        time_engine.advance_time(days=1)
+        assert [p.name for p in state_env.iterdir()] == ["time.json"]
+        assert TimeEngine().get_current_time() == datetime(2024, 5, 2)
+
 
 class TestBasicUsageSimulator:
     """Test basic usage simulator operations."""
@@ -98,6 +307,33 @@ class TestBasicUsageSimulator:
         assert our_record is not None
         assert our_record.node_hours == 100.0
 
+    def test_usage_pattern_saves_once(self, tmp_path, monkeypatch):
+        """Test a pattern's daily injections end in a single state write."""
+        self.database.state_file = tmp_path / "db.json"
+        depths = []
+        save_state = self.database.save_state
+        monkeypatch.setattr(
+            self.database,
+            "save_state",
+            lambda **kw: depths.append(self.database._batch_depth) or save_state(**kw),
+        )
+
+        self.usage_sim.inject_usage_pattern(
+            "pattern_account", "pattern_user", {"type": "steady", "total_usage": 30, "days": 10}
+        )
+        assert len(self.database.get_usage_records(account="pattern_account")) == 10
+        # One deferred save inside the batch, one real write when it closes
+        assert depths == [1, 0]
+        assert self.database.state_file.exists()
+
+    def test_unknown_usage_pattern_rejected(self):
+        """Test an unknown pattern type raises before any usage is injected."""
+        with pytest.raises(ValueError, match="Unknown pattern type: spiky"):
+            self.usage_sim.inject_usage_pattern(
+                "pattern_account", "pattern_user", {"type": "spiky"}
+            )
+        assert self.database.get_usage_records(account="pattern_account") == []
+
 
 class TestBasicScenarios:
     """Test basic scenario operations."""
@@ -136,6 +372,20 @@ class TestBasicScenarios:
         assert isinstance(scenarios, list)
         # Don't require specific scenarios, just that it doesn't crash
 
+    def test_scenario_registry_list_by_type(self):
+        """Test type listing matches the registry and sees new registrations."""
+        for scenario_type in ScenarioType:
+            expected = [
+                s for s in self.registry.list_scenarios() if s.scenario_type == scenario_type
+            ]
+            assert self.registry.list_by_type(scenario_type) == expected
+
+        before = len(self.registry.list_by_type(ScenarioType.USAGE_PATTERNS))
+        self.registry.register_scenario(
+            ScenarioDefinition("extra", "Extra", "Extra scenario", ScenarioType.USAGE_PATTERNS)
+        )
+        assert len(self.registry.list_by_type(ScenarioType.USAGE_PATTERNS)) == before + 1
+
 
 class TestBasicPeriodicLimits:
     """Test basic periodic limits functionality."""
@@ -167,6 +417,49 @@ class TestBasicPeriodicLimits:
         assert isinstance(decay_factor, float)
         assert 0 <= decay_factor <= 1
 
+    def test_periodic_settings_request_cache(self):
+        """Test settings are memoized per request and follow account edits."""
+        from emulator.periodic_limits.calculator import PeriodicLimitsCalculator
+
+        calculator = PeriodicLimitsCalculator(self.database, self.time_engine)
+        self.database.add_account("test_account", "Test", "Org")
+        self.database.set_account_allocation("test_account", 1000)
+
+        calls = []
+        compute = calculator._calculate_periodic_settings
+
+        def counting(*args):
+            calls.append(args)
+            return compute(*args)
+
+        calculator._calculate_periodic_settings = counting
+
+        calculator.calculate_periodic_settings("test_account")
+        calculator.calculate_periodic_settings("test_account")
+        assert len(calls) == 2  # no caching outside a request
+
+        with calculator.request_cache():
+            first = calculator.calculate_periodic_settings("test_account")
+            second = calculator.calculate_periodic_settings("test_account")
+            assert len(calls) == 3
+            assert first == second
+
+            # Editing a result, nested details included, leaves later hits intact
+            expected = second["carryover_details"]["unused_allocation"]
+            first["fairshare"] = -1
+            first["carryover_details"]["unused_allocation"] = -1
+            again = calculator.calculate_periodic_settings("test_account")
+            assert len(calls) == 3
+            assert again == second
+            assert again["carryover_details"]["unused_allocation"] == expected
+
+            self.database.get_account("test_account").allocation = 2000
+            third = calculator.calculate_periodic_settings("test_account")
+            assert len(calls) == 4
+            assert third["base_allocation"] == 2000
+
+        assert calculator._settings_cache is None
+
     def test_qos_basic_operations(self):
         """Test basic QoS operations."""
         from emulator.periodic_limits.qos_manager import QoSManager
@@ -0,0 +1,265 @@
+"""Tests for the interactive EmulatorCLI command handlers."""
+
+import sys
+from datetime import datetime
+
+import pytest
+
+from emulator.cli.main import EmulatorCLI, _parse_args
+from emulator.periodic_limits.calculator import PeriodicLimitsCalculator
+from emulator.scenarios.scenario_registry import (
+    ActionType,
+    ScenarioAction,
+    ScenarioDefinition,
+    ScenarioStep,
+    ScenarioType,
+)
+
+
+@pytest.fixture
+def cli(state_env):  # noqa: ARG001 - fixture sets the state env vars
+    """EmulatorCLI with isolated state files."""
+    return EmulatorCLI()
+
+
+def test_subcommand_dispatch(cli, capsys):
+    cli._execute_command("account create proj1 100")
+    cli._execute_command("account show proj1")
+    out = capsys.readouterr().out
+    assert "Created account proj1 with 100Nh allocation" in out
+    assert "📊 Account: proj1" in out
+
+    cli._execute_command("checkpoint create cp1")
+    cli._execute_command("checkpoint list")
+    assert "1. cp1" in capsys.readouterr().out
+
+
+def test_unknown_subcommand_lists_available(cli, capsys):
+    cli._execute_command("qos frobnicate")
+    out = capsys.readouterr().out
+    assert "❌ Unknown QoS subcommand" in out
+    assert "Available: show, set, check" in out
+
+
+def test_limits_defaults_account(cli, capsys):
+    cli._execute_command("limits show")
+    assert "❌ Account default_account not found" in capsys.readouterr().out
+
+
+def test_scenario_actions_dispatch_on_type(cli):
+    cli._execute_scenario_action(
+        ScenarioAction(ActionType.TIME_SET, "jump", {"time": "2024-02-01T00:00:00"})
+    )
+    cli._execute_scenario_action(
+        ScenarioAction(ActionType.TIME_ADVANCE, "skip", {"amount": 2, "unit": "months"})
+    )
+    assert cli.time_engine.get_current_time() == datetime(2024, 4, 1)
+
+    cli._execute_scenario_action(
+        ScenarioAction(ActionType.ACCOUNT_CREATE, "create", {"name": "proj2", "allocation": 50})
+    )
+    assert cli.database.get_account_allocation("proj2") == 50
+
+    # Types without a handler are ignored
+    cli._execute_scenario_action(ScenarioAction(ActionType.VALIDATE, "noop"))
+
+
+def test_scenario_steps_cache_settings_after_config_reload(cli, tmp_path, monkeypatch):
+    conf = tmp_path / "slurm.conf"
+    conf.write_text("PriorityDecayHalfLife=7-0\n")
+    qos_check = ScenarioAction(ActionType.QOS_CHECK, "check", {"account": "proj"})
+    scenario = ScenarioDefinition(
+        "reload",
+        "Reload",
+        "Reload then check",
+        ScenarioType.CONFIGURATION,
+        steps=[
+            ScenarioStep(
+                "setup",
+                "Create and reload",
+                [
+                    ScenarioAction(ActionType.ACCOUNT_CREATE, "create", {"name": "proj"}),
+                    ScenarioAction(ActionType.CONFIG_RELOAD, "reload", {"config_path": conf}),
+                ],
+            ),
+            ScenarioStep("check", "Check twice", [qos_check, qos_check]),
+        ],
+    )
+    monkeypatch.setattr(cli.scenario_registry, "get_scenario", lambda _name: scenario)
+    calls = []
+    compute = PeriodicLimitsCalculator._calculate_periodic_settings
+
+    def counting(self, *args):
+        calls.append(self)
+        return compute(self, *args)
+
+    monkeypatch.setattr(PeriodicLimitsCalculator, "_calculate_periodic_settings", counting)
+    cli._execute_command("scenario run reload")
+
+    assert cli.limits_calculator.half_life_days == 7
+    assert calls == [cli.limits_calculator]
+
+
+def test_status_reports_current_period_usage(cli, capsys):
+    cli._execute_command("account create proj3 500")
+    cli._execute_command("usage inject alice 25 proj3")
+    capsys.readouterr()
+
+    cli._execute_command("status")
+    out = capsys.readouterr().out
+    assert f"📅 Current period: {cli.time_engine.get_current_quarter()}" in out
+    assert "   - proj3: 25.0/500Nh" in out
+
+
+def test_config_show_without_slurm_conf(cli, capsys):
+    cli._execute_command("config")
+    out = capsys.readouterr().out
+    assert out.startswith("📊 Using Default Configuration:\n   No slurm.conf file loaded\n")
+    assert "      GRES/gpu: 0.25\n" in out
+
+
+def test_scenario_list_marks_complexity(cli, capsys):
+    cli._execute_command("scenario list")
+    out = capsys.readouterr().out
+    for scenario in cli.scenario_registry.list_scenarios():
+        marker = {"basic": "🟢", "intermediate": "🟡", "advanced": "🔴"}[scenario.complexity]
+        assert f"  {marker} {scenario.name}: {scenario.title}" in out
+
+
+def test_scenario_summaries_reused_until_steps_change(cli, capsys):
+    scenario = cli.scenario_registry.get_scenario("qos_thresholds")
+    first = cli._scenario_summary(scenario)
+    assert cli._scenario_summary(scenario) == first
+    assert cli._scenario_summaries["qos_thresholds"][2:] == first
+
+    cli._execute_command("scenario search qos_thresholds")
+    assert first[0] in capsys.readouterr().out
+
+    scenario.add_step(scenario.steps[-1])
+    try:
+        _, details = cli._scenario_summary(scenario)
+        assert f"Steps: {len(scenario.steps)} |" in details
+    finally:
+        scenario.steps.pop()
+
+
+def test_scenario_describe_and_steps(cli, capsys):
+    scenario = cli.scenario_registry.get_scenario("qos_thresholds")
+
+    cli._execute_command("scenario describe qos_thresholds")
+    out = capsys.readouterr().out
+    assert out.startswith(f"\n📖 Scenario: {scenario.title}\n")
+    assert f"   Steps: {len(scenario.steps)}\n" in out
+    assert out.endswith("scenario steps qos_thresholds                 # Show step breakdown\n")
+
+    cli._execute_command("scenario steps qos_thresholds")
+    out = capsys.readouterr().out
+    assert out.count("\n📍 Step ") == len(scenario.steps)
+
+
+def test_scenario_cleanup_skipped_when_unchanged(cli, capsys):
+    cli._clean_scenario_state("qos_thresholds")
+    assert "🧹 Cleaning scenario state" in capsys.readouterr().out
+
+    cli._clean_scenario_state("qos_thresholds")
+    assert "✅ Scenario state already clean" in capsys.readouterr().out
+
+    cli.database.add_account("qos_test", "QoS test", "emulator")
+    cli._clean_scenario_state("qos_thresholds")
+    assert "🧹 Cleaning scenario state" in capsys.readouterr().out
+    assert cli.database.get_account("qos_test") is None
+
+
+def test_cleanup_reports_in_one_write(cli, capsys, monkeypatch):
+    cli.database.add_account("gone", "Gone", "emulator")
+    writes = []
+    monkeypatch.setattr(sys.stdout, "write", writes.append)
+    cli._execute_command("cleanup bogus")
+    cli._execute_command("cleanup account gone")
+    monkeypatch.undo()
+
+    assert writes == [
+        "❌ Unknown cleanup subcommand\nAvailable: all, scenario <name>, account <name>\n",
+        "✅ Cleaned account 'gone' completely\n",
+    ]
+    assert capsys.readouterr().out == ""
+    assert cli.database.get_account("gone") is None
+
+
+def test_checkpoint_restore_resets_time(cli, capsys):
+    cli._execute_command("time set 2024-03-01")
+    cli._execute_command("checkpoint create start")
+    cli._execute_command("time advance 2 months")
+    cli._execute_command("checkpoint restore start")
+    assert cli.time_engine.get_current_time() == datetime(2024, 3, 1)
+
+    cli._execute_command("checkpoint restore start")
+    out = capsys.readouterr().out
+    assert out.count("🔄 Restored to checkpoint 'start'") == 2
+    assert cli.time_engine.get_current_time() == datetime(2024, 3, 1)
+
+
+def test_parse_args_splits_flags_and_options():
+    positional, flags, kwargs = _parse_args(
+        ["qos_thresholds", "--step-by-step", "--config=a.conf", "extra"]
+    )
+    assert positional == ["qos_thresholds", "extra"]
+    assert flags == {"step-by-step"}
+    assert kwargs == {"config": "a.conf"}
+
+
+def test_scenario_run_requires_name(cli, capsys):
+    cli._execute_command("scenario run --interactive")
+    assert "Usage: scenario run <scenario_name>" in capsys.readouterr().out
+
+
+def test_scenario_list_by_type(cli, capsys):
+    cli._execute_command("scenario list bogus")
+    out = capsys.readouterr().out
+    assert "❌ Unknown scenario type: bogus" in out
+    assert (
+        "Available types: periodic_limits, decay_testing, qos_management, usage_patterns, "
+        "configuration"
+    ) in out
+
+    cli._execute_command("scenario list decay_testing")
+    out = capsys.readouterr().out
+    assert out.startswith("📋 Decay Testing Scenarios:")
+    assert "decay_comparison" in out
+
+
+def test_limits_calculate_action_accepts_account_list(cli, capsys):
+    cli._execute_command("account create proj4 400")
+    cli._execute_command("account create proj5 500")
+    capsys.readouterr()
+
+    cli._execute_scenario_action(
+        ScenarioAction(
+            ActionType.LIMITS_CALCULATE,
+            "Decay check",
+            {"accounts": ["proj4", "proj5", "missing"]},
+        )
+    )
+    out = capsys.readouterr().out
+    assert "      Account: proj4\n" in out
+    assert "      Account: proj5\n" in out
+    assert out.count("📊 Decay Analysis") == 2
+    assert out.count("Expected decay factor: 0.015625") == 2
+
+
+def test_manual_completion_uses_static_tables(cli, capsys):
+    cli._execute_command("complete che")
+    out = capsys.readouterr().out
+    assert out.startswith("📋 Subcommands for 'checkpoint':\n  create\n  restore\n  list\n")
+
+    cli._execute_command("complete s")
+    out = capsys.readouterr().out
+    assert "  sacct\n  sacctmgr\n  scenario\n  sinfo\n  status\n" in out
+    assert cli._get_subcommands("nope") == ()
+
+
+def test_help_text(cli, capsys):
+    cli._show_help()
+    out = capsys.readouterr().out
+    assert out.startswith("\n📖 SLURM Emulator Commands:\n")
+    assert out.endswith("# Shows: days, months, quarters\n\n")
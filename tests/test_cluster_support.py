@@ -1,13 +1,18 @@
 """Tests for multi-cluster support."""
 
+import json
+from datetime import datetime
+
 import pytest
 
 from emulator.commands.dispatcher import SlurmEmulator
 from emulator.commands.sacctmgr import SacctmgrEmulator
 from emulator.core.database import (
+    Association,
     ClusterClassification,
     Job,
     SlurmDatabase,
+    UsageRecord,
 )
 from emulator.core.time_engine import TimeEngine
 from emulator.core.usage_simulator import UsageSimulator
@@ -109,6 +114,18 @@ class TestClusterCRUD:
         db.delete_cluster("done")
         assert db.get_cluster("done") is None
 
+    def test_delete_cluster_filters_usage_in_place(self):
+        db = SlurmDatabase()
+        db.add_cluster("temp")
+        ts = datetime(2024, 1, 1)
+        for cluster in ("default", "temp", "default"):
+            db.add_usage_record(UsageRecord("acc", "u1", 1.0, 1.0, ts, "2024-Q1", cluster=cluster))
+        records = db.usage_records
+
+        db.delete_cluster("temp")
+        assert db.usage_records is records
+        assert [r.cluster for r in records] == ["default", "default"]
+
 
 class TestGlobalAccounts:
     """Test that accounts are global entities, not per-cluster."""
@@ -182,6 +199,27 @@ class TestPerClusterUsageIsolation:
         assert default_usage == 100.0
         assert cluster_a_usage == 200.0
 
+    def test_total_usage_bulk_matches_per_account(self):
+        db = SlurmDatabase()
+        db.add_cluster("cluster-a")
+        for account, period, cluster, hours in [
+            ("acc1", "2024-Q1", "default", 10.0),
+            ("acc1", "2024-Q2", "default", 5.0),
+            ("acc2", "2024-Q1", "default", 7.5),
+            ("acc2", "2024-Q1", "cluster-a", 100.0),
+        ]:
+            db.add_usage_record(
+                UsageRecord(
+                    account, "user1", hours, hours, datetime(2024, 1, 1), period, cluster=cluster
+                )
+            )
+
+        names = ["acc1", "acc2", "acc3"]
+        for period in ("2024-Q1", None):
+            totals = db.get_total_usage_bulk(names, period)
+            assert totals == {name: db.get_total_usage(name, period) for name in names}
+        assert db.get_total_usage_bulk(["acc2"], "2024-Q1", cluster="cluster-a") == {"acc2": 100.0}
+
     def test_association_isolation(self):
         db = SlurmDatabase()
         db.add_cluster("cluster-a")
@@ -197,6 +235,172 @@ class TestPerClusterUsageIsolation:
         assert db.get_association("user1", "root", cluster="default") is None
         assert db.get_association("user1", "root", cluster="cluster-a") is not None
 
+    def test_delete_account_associations_per_cluster(self):
+        db = SlurmDatabase()
+        db.add_cluster("cluster-a")
+        db.add_account("acc", "Acc", "Org")
+        db.add_user("user1")
+        db.add_association("user1", "acc", cluster="default")
+        db.add_association("user1", "acc", cluster="cluster-a")
+        db.add_association("user1", "root", cluster="default")
+
+        assert db.delete_account_associations("ACC", cluster="default") == 2
+        assert db.get_association("user1", "acc", cluster="default") is None
+        assert db.get_association("user1", "acc", cluster="cluster-a") is not None
+        assert db.get_association("user1", "root", cluster="default") is not None
+        assert db.delete_account_associations("acc", cluster="default") == 0
+
+        # Rows written directly are picked up by the index
+        key = db._association_key("user1", "acc", "default")
+        db.associations[key] = Association(account="acc", user="user1", cluster="default")
+        assert db.delete_account_associations("acc", cluster="default") == 1
+
+    def test_delete_account_user_associations(self):
+        db = SlurmDatabase()
+        db.add_cluster("cluster-a")
+        db.add_account("acc", "Acc", "Org")
+        db.add_association("user1", "acc", partition="cpu")
+        db.add_association("user1", "acc", partition="gpu")
+        db.add_association("user2", "acc")
+        db.add_association("user1", "acc", cluster="cluster-a")
+
+        assert db.delete_account_user_associations("ACC") == 3
+        assert db.list_account_users("acc") == []
+        assert db.list_account_users("acc", cluster="cluster-a") == ["user1"]
+        # The account row survives and the index still serves lookups
+        assert [a.user for a in db.list_account_associations("acc")] == ["", "user1"]
+        assert db.delete_account_user_associations("acc") == 0
+
+    def test_delete_orphaned_associations(self):
+        db = SlurmDatabase()
+        db.add_cluster("cluster-a")
+        db.add_account("acc", "Acc", "Org")
+        db.add_user("user1")
+        db.add_association("user1", "acc", cluster="cluster-a")
+        db.add_association("user1", "root", cluster="cluster-a")
+
+        assert db.delete_orphaned_associations() == 0
+        db.delete_account("acc")
+        assert db.delete_orphaned_associations() == 2
+        assert [a.account for a in db.associations.values()] == ["root", "root", "root"]
+
+    def test_delete_account_usage_and_jobs_per_cluster(self):
+        db = SlurmDatabase()
+        db.add_cluster("cluster-a")
+        ts = datetime(2024, 1, 15)
+        for cluster in ("default", "cluster-a"):
+            db.add_usage_record(
+                UsageRecord("acc", "u1", 10.0, 10.0, ts, "2024-Q1", cluster=cluster)
+            )
+            db.add_job(
+                Job(
+                    job_id=f"acc-{cluster}",
+                    account="acc",
+                    user="u1",
+                    state="RUNNING",
+                    cluster=cluster,
+                )
+            )
+        # The scheduler appends usage records directly
+        db.usage_records.append(UsageRecord("other", "u1", 1.0, 1.0, ts, "2024-Q1"))
+        records = db.usage_records
+
+        assert db.delete_account_usage("acc", cluster="default") == 1
+        assert db.delete_account_jobs("acc", cluster="default") == 1
+        assert db.usage_records is records
+        assert [(r.account, r.cluster) for r in records] == [
+            ("acc", "cluster-a"),
+            ("other", "default"),
+        ]
+        assert list(db.jobs) == ["acc-cluster-a"]
+
+        assert db.delete_orphaned_usage() == 2
+        assert db.delete_orphaned_jobs() == 1
+        assert db.usage_records == []
+        assert db.jobs == {}
+
+    def test_query_usage_records_by_account_keeps_order(self):
+        db = SlurmDatabase()
+        ts = datetime(2024, 1, 15)
+        for account, user in [("a", "u1"), ("b", "u1"), ("c", "u2"), ("a", "u2")]:
+            db.add_usage_record(UsageRecord(account, user, 1.0, 1.0, ts, "2024-Q1"))
+        # Direct appends and in-place deletions keep the index in step
+        db.usage_records.append(UsageRecord("b", "u2", 1.0, 1.0, ts, "2024-Q1"))
+        db.delete_account_usage("c")
+        db.add_usage_record(UsageRecord("c", "u1", 1.0, 1.0, ts, "2024-Q1"))
+
+        def query(**filters):
+            return [(r.account, r.user) for r in db.query_usage_records(("default",), **filters)]
+
+        assert query(accounts={"c", "a"}) == [("a", "u1"), ("a", "u2"), ("c", "u1")]
+        assert query(accounts=["b", "missing"], users={"u2"}) == [("b", "u2")]
+        assert query(accounts=()) == []
+        assert query() == [(r.account, r.user) for r in db.usage_records]
+        assert [r.user for r in db.get_usage_records(account="a")] == ["u1", "u2"]
+
+    def test_usage_totals_follow_every_kind_of_change(self):
+        db = SlurmDatabase()
+        ts = datetime(2024, 1, 15)
+        db.add_usage_record(UsageRecord("a", "u1", 2.0, 2.0, ts, "2024-Q1"))
+        assert db.get_total_usage("a", "2024-Q1") == 2.0
+        assert db.get_total_usage_bulk(["a", "b"]) == {"a": 2.0, "b": 0}
+
+        db.add_usage_record(UsageRecord("a", "u1", 0.5, 0.5, ts, "2024-Q1"))  # folded in
+        db.add_usage_record(UsageRecord("a", "u1", 9.0, 9.0, ts, "2024-Q2"))
+        assert db.get_total_usage("a", "2024-Q1") == 2.5
+        assert db.get_total_usage("a") == 11.5
+
+        db.usage_records.append(UsageRecord("b", "u1", 1.0, 1.0, ts, "2024-Q1"))
+        assert db.get_total_usage("b", "2024-Q1") == 1.0
+        # Delete then add back to the same length
+        db.delete_account_usage("b")
+        db.add_usage_record(UsageRecord("c", "u1", 4.0, 4.0, ts, "2024-Q1"))
+        assert db.get_total_usage("b", "2024-Q1") == 0
+        assert db.get_total_usage("c", "2024-Q1") == 4.0
+
+    def test_period_filter_runs_in_the_same_pass(self):
+        db = SlurmDatabase()
+        for ts, period in [(datetime(2024, 1, 15), "2024-Q1"), (datetime(2024, 4, 15), "2024-Q2")]:
+            db.add_usage_record(UsageRecord("a", "u1", 2.0, 2.0, ts, period))
+            db.add_usage_record(UsageRecord("b", "u1", 1.0, 1.0, ts, period))
+
+        assert [r.account for r in db.get_usage_records(period="2024-Q2")] == ["a", "b"]
+        assert db.get_total_usage("a", period="2024-Q1") == 2.0
+        assert db.get_total_usage("a") == 4.0
+        assert list(db.query_usage_records(("default",), periods=())) == []
+
+    def test_association_index_follows_single_row_deletes(self):
+        db = SlurmDatabase()
+        db.add_account("acc", "Acc", "Org")
+        db.add_association("user1", "acc")
+        assert db.delete_account_associations("other") == 0  # builds the index
+        db.delete_association("user1", "acc")
+        db.add_association("user2", "acc")  # same size as when indexed
+        # The account row and user2's row
+        assert db.delete_account_associations("acc") == 2
+        assert db.get_association("user2", "acc") is None
+
+    def test_account_association_lookups_use_index(self):
+        db = SlurmDatabase()
+        db.add_cluster("other")
+        db.add_account("acc", "Acc", "Org")
+        db.add_association("user1", "acc", partition="gpu")
+        db.add_association("user1", "acc", partition="cpu")
+        db.add_association("user2", "acc", cluster="other")
+        db.add_association("user3", "elsewhere")
+
+        assert [(a.user, a.cluster) for a in db.list_account_associations("ACC")] == [
+            ("", "default"),
+            ("user1", "default"),
+            ("user1", "default"),
+            ("user2", "other"),
+        ]
+        assert db.list_account_users("acc") == ["user1"]
+        assert db.list_account_users("acc", cluster="other") == ["user2"]
+        assert len(db.list_user_associations("user1", "acc")) == 2
+        db.delete_association("user1", "acc", partition="gpu")
+        assert [a.partition for a in db.list_user_associations("user1", "acc")] == ["cpu"]
+
     def test_jobs_filtered_by_cluster(self):
         db = SlurmDatabase()
         db.add_cluster("cluster-a")
@@ -212,6 +416,20 @@ class TestPerClusterUsageIsolation:
         assert len(cluster_a_jobs) == 1
         assert cluster_a_jobs[0].job_id == "2"
 
+    def test_jobs_filtered_by_account(self):
+        db = SlurmDatabase()
+        for jid, account, user in (("1", "a", "u1"), ("2", "b", "u1"), ("3", "a", "u2")):
+            db.add_job(Job(job_id=jid, account=account, user=user, state="RUNNING"))
+
+        assert [j.job_id for j in db.list_jobs(account="a")] == ["1", "3"]
+        assert [j.job_id for j in db.list_jobs(account="a", user="u2")] == ["3"]
+        assert db.list_jobs(account="missing") == []
+
+        # Replacing a job under the same id moves it to the new account
+        db.add_job(Job(job_id="1", account="b", user="u1", state="RUNNING"))
+        assert [j.job_id for j in db.list_jobs(account="a")] == ["3"]
+        assert [j.job_id for j in db.list_jobs(account="b")] == ["1", "2"]
+
 
 class TestClusterFlagParsing:
     """Test -M flag extraction in dispatcher."""
@@ -554,6 +772,12 @@ class TestBackwardCompatibleStateLoading:
             "users": {"user1": {"name": "user1", "default_account": "test"}},
             "associations": {
                 "user1:test": {"account": "test", "user": "user1", "limits": {}},
+                "user1:test:other": {
+                    "account": "test",
+                    "user": "user1",
+                    "limits": {},
+                    "cluster": "other",
+                },
             },
             "usage_records": [
                 {
@@ -583,12 +807,71 @@ class TestBackwardCompatibleStateLoading:
 
         # Verify associations migrated
         assert db.get_association("user1", "test", cluster="default") is not None
+        assert db.get_association("user1", "test", cluster="other") is not None
 
         # Verify usage records migrated
         records = db.get_usage_records(account="test", cluster="default")
         assert len(records) == 1
         assert records[0].cluster == "default"
 
+    def test_loaded_usage_records_share_names(self, tmp_path):
+        db = SlurmDatabase()
+        db.state_file = tmp_path / "state.json"
+        for day in (1, 2):
+            db.add_usage_record(
+                UsageRecord(
+                    account="acc",
+                    user="user1",
+                    node_hours=1.0,
+                    billing_units=1.0,
+                    timestamp=datetime(2024, 1, day),
+                    period="2024-Q1",
+                )
+            )
+        db.save_state()
+
+        reloaded = SlurmDatabase()
+        reloaded.state_file = db.state_file
+        reloaded.load_state()
+        first, second = reloaded.usage_records
+        assert first.account is second.account
+        assert first.user is second.user
+        assert first.period is second.period
+
+    def test_association_keys_round_trip(self, tmp_path):
+        db = SlurmDatabase()
+        db.state_file = tmp_path / "state.json"
+        db.add_account("acc", "Acc", "Org")
+        db.add_association("a:b", "ACC", cluster="default", partition="gpu")
+        db.save_state()
+
+        stored = json.loads(db.state_file.read_text())["associations"]
+        assert "a:b:acc:default:gpu" in stored
+
+        reloaded = SlurmDatabase()
+        reloaded.state_file = db.state_file
+        reloaded.load_state()
+        assert set(reloaded.associations) == set(db.associations)
+        assert ("a:b", "acc", "default", "gpu") in reloaded.associations
+
+    def test_association_key_without_colons_rebuilt(self, tmp_path):
+        state_file = tmp_path / "state.json"
+        state_file.write_text(
+            json.dumps(
+                {
+                    "associations": {
+                        "alice": {"user": "alice", "account": "Acct", "cluster": "default"}
+                    }
+                }
+            )
+        )
+
+        db = SlurmDatabase()
+        db.state_file = state_file
+        db.load_state()
+        assert list(db.associations) == [("alice", "acct", "default", "")]
+        assert db.get_association("alice", "acct", cluster="default") is not None
+
     def test_load_name_at_cluster_format(self, tmp_path):
         """Test loading state with name@cluster keys (old multi-cluster format)."""
         import json
@@ -0,0 +1,165 @@
+"""Command daemon round-trips and its fallback to in-process execution."""
+
+import socket
+import stat
+import sys
+import threading
+import time
+
+import pytest
+
+from emulator.commands import daemon, dispatcher
+from emulator.core.database import Job, SlurmDatabase
+
+
+@pytest.fixture
+def running_daemon(state_env, monkeypatch):
+    # AF_UNIX paths are length-limited, keep the socket name short
+    path = state_env / "d.sock"
+    server = daemon.CommandDaemon(path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    while server._server is None:  # listening
+        time.sleep(0.01)
+    monkeypatch.setenv(daemon.SOCKET_ENV, str(path))
+    monkeypatch.setattr(dispatcher, "_emulator", None)
+    yield server
+    server.close()
+    thread.join(timeout=5)
+
+
+def _run_main(monkeypatch, main, argv):
+    monkeypatch.setattr(sys, "argv", argv)
+    with pytest.raises(SystemExit) as exc:
+        main()
+    return exc.value.code or 0
+
+
+def test_request_without_daemon_returns_none(monkeypatch):
+    monkeypatch.delenv(daemon.SOCKET_ENV, raising=False)
+    assert daemon.request("sinfo", []) is None
+
+    monkeypatch.setenv(daemon.SOCKET_ENV, "/nonexistent/slurm-emu.sock")
+    assert daemon.request("sinfo", []) is None
+
+
+@pytest.mark.usefixtures("running_daemon")
+def test_daemon_serves_commands():
+    reply = daemon.request("sinfo", ["-V"])
+    assert reply["output"].startswith("slurm-emulator ")
+    assert reply["exit_code"] == 0
+
+    reply = daemon.request("sacct", ["-o", "Bogus"])
+    assert reply["system_exit"] == 1
+    assert "Invalid field requested" in reply["stderr"]
+
+
+@pytest.mark.usefixtures("running_daemon")
+def test_entry_points_use_daemon(monkeypatch, capsys):
+    code = _run_main(
+        monkeypatch,
+        dispatcher.sacctmgr_main,
+        ["sacctmgr", "-i", "add", "account", "viadaemon"],
+    )
+    assert code == 0
+    # Ran in the daemon, not in this process
+    assert dispatcher._emulator is None
+    capsys.readouterr()
+
+    code = _run_main(monkeypatch, dispatcher.sacct_main, ["sacct", "-o", "Bogus"])
+    assert code == 1
+    assert "Invalid field requested" in capsys.readouterr().err
+
+
+def test_daemon_reloads_external_writes(running_daemon):
+    daemon.request("sinfo", [])
+    first = running_daemon.emulator()
+    assert running_daemon.emulator() is first
+
+    db = SlurmDatabase()
+    db.load_state()
+    db.add_account("external", "Written elsewhere", "org")
+    db.save_state()
+
+    reply = daemon.request("sacctmgr", ["list", "account", "-n", "-P", "format=Account"])
+    assert "external" in reply["output"].split()
+    assert running_daemon.emulator() is not first
+
+
+def test_unsaved_changes_are_not_kept(running_daemon):
+    db = SlurmDatabase()
+    db.load_state()
+    db.add_job(Job("1", "acct", "alice", "RUNNING"))
+    db.save_state()
+
+    # scancel changes the job in memory only, as it does in-process
+    for _ in range(2):
+        reply = daemon.request("scancel", ["-A=acct"])
+        assert reply["output"] == "scancel: Cancelled 1 job(s)"
+    assert running_daemon._emulator is None
+
+    # A command whose changes are saved keeps the emulator loaded
+    daemon.request("sacctmgr", ["-i", "add", "account", "kept"])
+    emulator = running_daemon.emulator()
+    daemon.request("sacctmgr", ["list", "account", "-n", "-P", "format=Account"])
+    assert running_daemon.emulator() is emulator
+
+
+def test_malformed_request_gets_error_reply(running_daemon):
+    for message in ({"args": []}, {"cmd": "sinfo", "args": "-V"}, ["sinfo"]):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.connect(str(running_daemon.socket_path))
+            daemon._send(conn, message)
+            assert daemon._recv(conn)["error"] == "malformed request"
+    # Still serving
+    assert daemon.request("sinfo", ["-V"])["exit_code"] == 0
+    assert stat.S_IMODE(running_daemon.socket_path.stat().st_mode) == 0o600
+
+
+def test_lost_connection_does_not_fall_back(state_env, monkeypatch):
+    path = state_env / "x.sock"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(str(path))
+        server.listen()
+        monkeypatch.setenv(daemon.SOCKET_ENV, str(path))
+
+        def close_unanswered():
+            conn, _ = server.accept()
+            conn.close()
+
+        # Accepted, then closed without a reply
+        closer = threading.Thread(target=close_unanswered)
+        closer.start()
+        with pytest.raises(ConnectionError):
+            daemon.request("scancel", ["-A=acct"])
+        closer.join(timeout=5)
+
+
+@pytest.mark.usefixtures("running_daemon")
+def test_other_state_file_runs_in_process(state_env, monkeypatch, capsys):
+    other = state_env / "other.json"
+    monkeypatch.setenv("SLURM_EMULATOR_STATE_FILE", str(other))
+    assert daemon.request("sinfo", []) is None
+
+    code = _run_main(
+        monkeypatch,
+        dispatcher.sacctmgr_main,
+        ["sacctmgr", "-i", "add", "account", "elsewhere"],
+    )
+    assert code == 0
+    capsys.readouterr()
+    # Ran here, against the client's own file, not the daemon's
+    assert dispatcher._emulator is not None
+    db = SlurmDatabase()
+    db.load_state()
+    assert db.state_file == other
+    assert db.get_account("elsewhere") is not None
+    assert not (state_env / "db.json").exists()
+
+
+def test_stalled_client_does_not_block_daemon(running_daemon, monkeypatch):
+    monkeypatch.setattr(daemon, "_CLIENT_TIMEOUT", 0.2)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stalled:
+        stalled.connect(str(running_daemon.socket_path))
+        # Connected but never sends; the next client is still answered
+        assert daemon.request("sinfo", ["-V"])["exit_code"] == 0
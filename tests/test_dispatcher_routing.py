@@ -6,10 +6,13 @@ sacctmgr_main routes by the recorded exit code.
 """
 
 import sys
+import threading
+import time
 
 import pytest
 
 from emulator.commands import dispatcher
+from emulator.core.database import Job
 
 
 @pytest.fixture
@@ -72,3 +75,75 @@ class TestSacctRouting:
     def test_success_exit_zero(self, fresh_emulator, monkeypatch, capsys):
         code = _run_main(monkeypatch, dispatcher.sacct_main, ["sacct", "-n", "-P"])
         assert code == 0
+
+
+class TestVersion:
+    @pytest.mark.parametrize("main", ["sacctmgr_main", "sacct_main", "sinfo_main"])
+    def test_bare_version_skips_emulator(self, main, monkeypatch, capsys):
+        monkeypatch.setattr(dispatcher, "get_emulator", None)
+        monkeypatch.setattr(dispatcher, "_execute", None)
+        monkeypatch.setattr(sys, "argv", ["cmd", "-V"])
+        getattr(dispatcher, main)()
+        assert capsys.readouterr().out == f"{dispatcher._VERSION}\n"
+
+
+class TestExecuteCommand:
+    def test_unknown_command(self, fresh_emulator):
+        assert fresh_emulator.execute_command("srun", []) == "slurm-emulator: Unknown command: srun"
+
+    def test_cluster_context_restored(self, fresh_emulator):
+        fresh_emulator.database.add_cluster("other")
+        out = fresh_emulator.execute_command("sacct", ["-M", "other", "-n", "-P"])
+        assert isinstance(out, str)
+        assert fresh_emulator.database.current_cluster == "default"
+        assert fresh_emulator.execute_command("sinfo", ["-V"]).startswith("slurm-emulator ")
+
+    def test_sinfo_lists_partition_topology(self, fresh_emulator):
+        out = fresh_emulator.execute_command("sinfo", [])
+        assert out.splitlines()[1:] == [
+            "debug*       up   infinite      4   idle node[001-004]",
+            "compute      up   infinite     96   idle node[005-100]",
+        ]
+        assert fresh_emulator.execute_command("sinfo", []) is out
+
+    def test_scancel_only_cancels_active_jobs(self, fresh_emulator):
+        db = fresh_emulator.database
+        for job_id, state in (("1", "RUNNING"), ("2", "PENDING"), ("3", "COMPLETED")):
+            db.add_job(Job(job_id, "acct", "alice", state))
+        out = fresh_emulator.execute_command("scancel", ["-A=acct"])
+        assert out == "scancel: Cancelled 2 job(s)"
+        assert [db.jobs[j].state for j in "123"] == ["CANCELLED", "CANCELLED", "COMPLETED"]
+        assert fresh_emulator.execute_command("scancel", ["-A=acct"]) == (
+            "scancel: No jobs found to cancel"
+        )
+
+    def test_scancel_filters_by_user(self, fresh_emulator):
+        db = fresh_emulator.database
+        db.add_job(Job("1", "acct", "alice", "RUNNING"))
+        db.add_job(Job("2", "acct", "bob", "RUNNING"))
+        out = fresh_emulator.execute_command("scancel", ["-f", "-u=bob", "-A=acct"])
+        assert out == "scancel: Cancelled 1 job(s)"
+        assert (db.jobs["1"].state, db.jobs["2"].state) == ("RUNNING", "CANCELLED")
+        assert fresh_emulator.execute_command("scancel", ["-A", "acct"]) == (
+            "scancel: No account specified"
+        )
+
+
+def test_get_emulator_builds_one_instance_across_threads(monkeypatch):
+    created = []
+
+    def slow_emulator():
+        time.sleep(0.01)
+        created.append(object())
+        return created[-1]
+
+    monkeypatch.setattr(dispatcher, "_emulator", None)
+    monkeypatch.setattr(dispatcher, "SlurmEmulator", slow_emulator)
+    threads = [threading.Thread(target=dispatcher.get_emulator) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1
+    assert dispatcher.get_emulator() is created[0]
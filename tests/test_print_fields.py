@@ -18,6 +18,7 @@ from emulator.commands.print_fields import (
     render_row,
     render_table,
     resolve_format,
+    row_formatter,
 )
 
 ACCOUNT = FieldSpec("Account", 10)
@@ -93,6 +94,14 @@ class TestRenderTable:
         out = render_table([ACCOUNT], [["a"], ["b"]], OutputMode(parsable="P", noheader=True))
         assert out == "a\nb"
 
+    def test_fixed_width_rows_share_one_formatter(self):
+        fields = [JOBID, ACCOUNT, NUM]
+        rows = [["7", "abcdefghijkl", "123456789012"], ["8", "acct", "1"]]
+        out = render_table(fields, rows, OutputMode(noheader=True))
+        render = row_formatter(fields, OutputMode())
+        assert out.splitlines() == [render(r) for r in rows]
+        assert out.splitlines()[0] == "7            abcdefghi+ 123456789012 "
+
 
 class TestResolveFormat:
     def test_prefix_match_case_insensitive(self):
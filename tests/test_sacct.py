@@ -7,11 +7,13 @@ elapsed format (secs2time_str, src/common/parse_time.c:849-874), and
 error handling (src/sacct/options.c:591-593, 1215-1216).
 """
 
+import io
 from datetime import datetime, timedelta
 
 import pytest
 
-from emulator.commands.sacct import SacctEmulator
+from emulator.commands.print_fields import UnknownFieldError
+from emulator.commands.sacct import _CELLS, _REGISTRY, SacctEmulator, _compile_format
 from emulator.core.database import SlurmDatabase, UsageRecord
 from emulator.core.time_engine import TimeEngine
 
@@ -108,6 +110,14 @@ class TestElapsed:
         # secs2time_str: "%ld-%2.2ld:%2.2ld:%2.2ld" when days > 0.
         assert out == "1-06:00:00"
 
+    def test_times_span_elapsed(self, env):
+        db, te, sacct = env
+        db.add_usage_record(
+            _record(te, node_hours=1.5, timestamp=NOW.replace(hour=11, microsecond=5))
+        )
+        out = sacct.handle_command(["-n", "-P", "-o", "Submit,Start,End,JobName"])
+        assert out == "2024-05-20T09:30:00|2024-05-20T09:30:00|2024-05-20T11:00:00|job_1"
+
 
 class TestJobIds:
     def test_sequential_numeric_ids(self, env):
@@ -182,6 +192,43 @@ class TestErrors:
 
 
 class TestFieldResolution:
+    def test_every_field_renders(self, env):
+        db, te, sacct = env
+        assert [f.name for f in _REGISTRY] == sorted(_CELLS, key=str.casefold)
+        db.add_usage_record(_record(te, raw_tres={"CPU": 96, "GRES/gpu": 3}))
+        fields = ",".join(f.name for f in _REGISTRY)
+        cells = sacct.handle_command(["-n", "-P", "-o", fields]).split("|")
+        assert dict(zip((f.name for f in _REGISTRY), cells)) == {
+            "Account": "proj-a",
+            "AllocCPUS": "64",
+            "AllocNodes": "1",
+            "AllocTRES": "cpu=64,mem=512G,node=1,billing=64,gres/gpu=2",
+            "Cluster": "default",
+            "Elapsed": "01:30:00",
+            "ElapsedRaw": "5400",
+            "End": "2024-05-20T12:00:00",
+            "ExitCode": "0:0",
+            "JobID": "1",
+            "JobIDRaw": "1",
+            "JobName": "job_1",
+            "NNodes": "1",
+            "NodeList": "node001",
+            "Partition": "compute",
+            "ReqTRES": "cpu=64,mem=512G,node=1,billing=64,gres/gpu=2",
+            "Start": "2024-05-20T10:30:00",
+            "State": "COMPLETED",
+            "Submit": "2024-05-20T10:30:00",
+            "Timelimit": "UNLIMITED",
+            "User": "alice",
+        }
+
+    def test_format_compiled_once_per_string(self):
+        compiled = _compile_format("JobID,acc%20")
+        assert _compile_format("JobID,acc%20") is compiled
+        assert [(f.name, f.width) for f in compiled[0]] == [("JobID", -12), ("Account", 20)]
+        with pytest.raises(UnknownFieldError):
+            _compile_format("JobID,Bogus")
+
     def test_prefix_match(self, env):
         db, te, sacct = env
         db.add_usage_record(_record(te))
@@ -213,6 +260,21 @@ class TestTimeWindow:
         out = sacct.handle_command(["-n", "-P", "-o", "User", "-S", "2024-05-01"])
         assert out == "alice"
 
+    def test_absolute_time_forms(self, env):
+        _, _, sacct = env
+        parse = sacct._parse_time
+        assert parse("2024-05-01") == datetime(2024, 5, 1)
+        assert parse("2024-05-01T08:30:00") == datetime(2024, 5, 1, 8, 30)
+        assert parse("2024-05-01 08:30:00") == datetime(2024, 5, 1, 8, 30)
+        assert parse("2024-5-1") == datetime(2024, 5, 1)
+        assert parse("08:30") == NOW.replace(hour=8, minute=30)
+
+    def test_time_with_utc_offset_is_invalid(self, env, capsys):
+        _, _, sacct = env
+        with pytest.raises(SystemExit):
+            sacct.handle_command(["-S", "2024-05-01T00:00:00+00:00"])
+        assert capsys.readouterr().err.startswith("Invalid time specification (pos=")
+
     def test_now_keyword(self, env):
         db, te, sacct = env
         db.add_usage_record(_record(te, timestamp=NOW - timedelta(days=1)))
@@ -244,8 +306,56 @@ class TestFilters:
         assert out == ""
         assert sacct.exit_code == 0
 
+    def test_job_filter_ignores_default_window(self, env):
+        db, te, sacct = env
+        db.add_usage_record(_record(te, timestamp=NOW - timedelta(days=30)))
+        db.add_usage_record(_record(te, user="bob"))
+        out = sacct.handle_command(["-n", "-P", "-j", "1.batch,bogus", "-o", "JobID,User"])
+        assert out == "1|alice"
+        out = sacct.handle_command(["-n", "-P", "-j", "bogus", "-o", "JobID"])
+        assert out == ""
+
+    def test_filters_combine(self, env):
+        db, te, sacct = env
+        db.add_usage_record(_record(te))
+        db.add_usage_record(_record(te, user="bob"))
+        db.add_usage_record(_record(te, account="proj-b", user="bob"))
+        out = sacct.handle_command(["-n", "-P", "-A", "proj-a", "-u", "bob", "-o", "JobID"])
+        assert out == "2"
+
+    def test_repeated_account_and_user_lists_dedupe(self, env):
+        _, _, sacct = env
+        cfg = sacct._parse_args(["-A", "proj-a,proj-b", "--accounts=proj-a", "-u", "bob,bob"])
+        assert cfg.accounts == {"proj-a", "proj-b"}
+        assert cfg.users == {"bob"}
+
+
+class TestStreaming:
+    def test_stream_matches_handle_command(self, env):
+        db, te, sacct = env
+        db.add_usage_record(_record(te))
+        db.add_usage_record(_record(te, user="bob"))
+        for args in (["-o", "JobID,User,Elapsed"], ["-n", "-P"], ["-V"]):
+            out = io.StringIO()
+            sacct.handle_command_stream(args, out)
+            assert out.getvalue() == sacct.handle_command(args) + "\n"
+
+        out = io.StringIO()
+        sacct.handle_command_stream(["-n", "-A", "nobody"], out)
+        assert out.getvalue() == ""
+
 
 class TestSiteAgentPath:
+    def test_fast_path_matches_general_renderer(self, env):
+        db, te, sacct = env
+        db.add_usage_record(_record(te, node_hours=2.0))
+        db.add_usage_record(_record(te, user="bob", raw_tres={"CPU": 48, "GRES/gpu": 0}))
+        for extra in ([], ["--noconvert"], ["-n"]):
+            fast = sacct.handle_command(["-P", "-o", "Account,ReqTRES,Elapsed,User", *extra])
+            # Any other spelling resolves to the same fields via the general path
+            general = sacct.handle_command(["-P", "-o", "acc,reqtres,elapsed,user", *extra])
+            assert fast == general
+
     def test_site_agent_invocation_shape(self, env):
         """The site-agent invocation must yield real parsable2 output.
 
@@ -9,7 +9,7 @@ Expected shapes come from real Slurm 26.11:
 
 import pytest
 
-from emulator.commands.sacctmgr import SacctmgrEmulator
+from emulator.commands.sacctmgr import SacctmgrEmulator, _parse_kv, _strip_quotes
 from emulator.core.database import SlurmDatabase
 from emulator.core.time_engine import TimeEngine
 
@@ -140,6 +140,17 @@ class TestExitCodesAndMessages:
         assert out == " Data has not changed since time specified"
         assert em.exit_code == 0
 
+    def test_unchanged_state_is_not_rewritten(self, em):
+        state_file = em.database.state_file
+        em.handle_command(["add", "account", "proj-a"])
+        written = state_file.stat()
+        em.handle_command(["add", "account", "proj-a", "cluster=default"])
+        assert state_file.stat() == written
+        em.handle_command(["add", "account", "proj-c"])
+        written = state_file.stat()
+        em.handle_command(["add", "account", "proj-c", "cluster=default"])
+        assert state_file.stat() == written
+
     def test_add_account_to_missing_cluster_exits_one(self, em):
         out = em.handle_command(["add", "account", "proj-b", "cluster=ghost"])
         assert "Cluster ghost does not exist" in out
@@ -156,6 +167,54 @@ class TestExitCodesAndMessages:
         assert out.startswith(" error: ")
         assert em.exit_code == 1
 
+    def test_command_and_entity_dispatch(self, em):
+        assert em.handle_command(["-V"]).startswith("slurm-emulator ")
+        assert em.handle_command(["SHOW", "Assoc", "-n", "-P"]) == em.handle_command(
+            ["show", "association", "-n", "-P"]
+        )
+        assert em.handle_command(["frob"]) == " error: Unknown command: frob"
+        assert em.exit_code == 1
+        assert em.handle_command(["delete"]) == " error: No entity specified for remove"
+        assert em.handle_command(["modify", "cluster"]) == (
+            " error: Unknown entity for modify: cluster"
+        )
+        out = em.handle_command(["delete", "user", "where", "name=alice", "account=proj-a"])
+        assert out.startswith(" Deleting user association")
+        assert em.exit_code == 0
+
+    def test_key_value_arguments(self, em):
+        assert _parse_kv(["proj", "Name=x", "parent='p'", "name=y"]) == {
+            "name": "y",
+            "parent": "'p'",
+        }
+        em.handle_command(["add", "account", "proj-b", "Description=Beta", "parent='proj-a'"])
+        assert "proj-b|Beta|emulator" in em.handle_command(["list", "account", "-n", "-P"])
+        assert em.database.get_account("proj-b").parent == "proj-a"
+        for raw, value in (('"a b"', "a b"), ("'x'", "x"), ('x"y', "x"), ('""', ""), ("p", "p")):
+            assert _strip_quotes(raw) == value
+
+    def test_association_qos_looked_up_once_per_account(self, em, monkeypatch):
+        em.handle_command(["add", "user", "bob", "account=proj-a"])
+        calls = []
+        get_account = em.database.get_account
+        monkeypatch.setattr(
+            em.database, "get_account", lambda name: calls.append(name) or get_account(name)
+        )
+        out = em.handle_command(
+            ["list", "assoc", "account=proj-a", "format=Account,User,QOS,GrpJ", "-n", "-P"]
+        )
+        assert out.splitlines() == ["proj-a||normal|", "proj-a|alice|normal|", "proj-a|bob|normal|"]
+        assert calls == ["proj-a"]
+
+    def test_where_and_set_keywords_any_case(self, em):
+        out = em.handle_command(["modify", "user", "WHERE", "account=proj-a", "Set", "x=1"])
+        assert out == " Modified user associations for account proj-a"
+        assert em.handle_command(["modify", "user", "set", "x=1"]) == (
+            " error: No where clause found"
+        )
+        out = em.handle_command(["remove", "user", "Where", "name=alice", "account=proj-a"])
+        assert out.startswith(" Deleting user association")
+
     def test_immediate_is_accepted_noop(self, em):
         out = em.handle_command(["--immediate", "add", "account", "proj-i"])
         assert "Adding Account(s)" in out
@@ -0,0 +1,70 @@
+"""Tests for slurm.conf value parsing."""
+
+import pytest
+
+from emulator.core.slurm_config import SlurmConfigParser
+
+
+@pytest.mark.parametrize(
+    ("spec", "seconds"),
+    [
+        ("", -2),
+        ("UNLIMITED", -1),
+        ("-1", -1),
+        ("5", 300),
+        ("1:30", 90),
+        ("1:02:03", 3723),
+        ("1:2:3:4", 0),
+        ("2-3", 2 * 86400 + 3 * 3600),
+        ("2-3:04:05", 2 * 86400 + 3 * 3600 + 4 * 60 + 5),
+        ("2-3:4:5:6-", 2 * 86400 + 3 * 3600 + 4 * 60 + 5),
+        ("7d", -2),
+    ],
+)
+def test_time_str2secs(spec, seconds):
+    assert SlurmConfigParser()._time_str2secs(spec) == seconds
+
+
+@pytest.mark.parametrize("spec", ["2-", "1-2-3", "1:2-3", "1::2", "-5"])
+def test_time_str2secs_rejects_malformed_fields(spec):
+    with pytest.raises(ValueError, match="invalid literal"):
+        SlurmConfigParser()._time_str2secs(spec)
+
+
+def test_time_durations_round_up_to_minutes(tmp_path):
+    conf = tmp_path / "slurm.conf"
+    conf.write_text("PriorityDecayHalfLife=0:0:30\nPriorityMaxAge=1-0\nPriorityCalcPeriod=1-x\n")
+    config = SlurmConfigParser(str(conf)).config
+    assert config["PriorityDecayHalfLife"] == 1
+    assert config["PriorityMaxAge"] == 1440
+    assert config["PriorityCalcPeriod"] == -2
+
+
+def test_emulator_config_rebuilt_on_load(tmp_path):
+    parser = SlurmConfigParser()
+    defaults = parser.get_emulator_config()
+    assert parser.get_emulator_config() is defaults
+    assert defaults["qos_weight"] == 500000
+
+    conf = tmp_path / "slurm.conf"
+    conf.write_text("PriorityWeightQOS=1000\n")
+    parser.load_config(str(conf))
+    assert parser.get_emulator_config()["qos_weight"] == 1000
+
+
+def test_config_lines(tmp_path):
+    conf = tmp_path / "slurm.conf"
+    conf.write_text(
+        "# header\n"
+        "  PriorityType = priority/basic  # inline\n"
+        'ClusterName="alpha"\r\n'
+        "NoValueLine\n"
+        "\n"
+        "SchedulerType=sched/builtin"
+    )
+    parser = SlurmConfigParser(str(conf))
+    assert parser.raw_config == {
+        "PriorityType": "priority/basic",
+        "ClusterName": "alpha",
+        "SchedulerType": "sched/builtin",
+    }
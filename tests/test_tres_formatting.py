@@ -39,6 +39,18 @@ class TestTresFormatting:
         assert raw_tres["Mem"] == 100 * 512  # 512GB per node
         assert raw_tres["GRES/gpu"] == 100 * 4  # 4 GPUs per node
 
+    def test_raw_tres_int_and_fractional_node_hours(self):
+        """Test whole node-hours convert exactly and fractions scale before truncating."""
+        whole = self.usage_sim._convert_to_raw_tres(3)
+        assert whole == {"node-hours": 3, "CPU": 192, "Mem": 1536, "GRES/gpu": 12}
+        assert whole == self.usage_sim._convert_to_raw_tres(3.0)
+        assert self.usage_sim._convert_to_raw_tres(1.5) == {
+            "node-hours": 1,
+            "CPU": 96,
+            "Mem": 768,
+            "GRES/gpu": 6,
+        }
+
     def test_tres_string_format_with_node_hours(self):
         """ReqTRES is a standard per-job TRES string in TRES-id order.
 
@@ -121,6 +133,17 @@ class TestTresFormatting:
         assert "gres/gpu=4" in tres_field
         assert tres_field.startswith("cpu=64,mem=512G,node=1,billing=64")
 
+    def test_tres_string_omits_zero_gpus(self):
+        """CPU-only records end the TRES string at billing."""
+        self.usage_sim.inject_usage("test_account", "test_user", 10.0)
+        record = self.database.get_usage_records(account="test_account")[-1]
+        record.raw_tres["GRES/gpu"] = 0
+
+        result = self.sacct.handle_command(
+            ["--format=ReqTRES", "--accounts=test_account", "-n", "-P", "--noconvert"]
+        )
+        assert result == "cpu=64,mem=524288M,node=1,billing=64"
+
     def test_usage_simulator_tres_consistency(self):
         """Test that usage simulator generates consistent TRES data."""
         # Test multiple node hour values